@@ -0,0 +1,296 @@
+"""asyncio transport: drive one or many boards from a single event loop.
+
+Works directly on a file descriptor (serial device, pty, or connected
+socket) registered with the loop, so there is no thread per board and no
+pyserial dependency. Requests are matched to responses in FIFO order, the
+same ordering guarantee the board gives.
+
+Frames carry no sequence number, so a frame the board drops (a lost UART
+byte, a CRC reject) would shift every later response onto the wrong
+request. Each response is therefore checked against the type and length
+its request implies, and any timeout or mismatch fails every outstanding
+request and marks the client desynchronized. Further requests raise
+DesyncError until ``await resync()`` has drained stale input and completed
+a STATUS round trip. Responses with the expected shape that were delivered
+before the loss was detected cannot be told apart; infer_many fails as a
+whole in that case.
+
+Example:
+    async def main():
+        boards = [await AsyncNNFpgaClient.open_serial(p) for p in ("/dev/ttyUSB0", "/dev/ttyUSB1")]
+        statuses = await asyncio.gather(*(b.status() for b in boards))
+        ys = await asyncio.gather(boards[0].infer_many(x[:500]), boards[1].infer_many(x[500:]))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+from . import fixedpoint, pipeline, proto
+from .client import STATUS_LEN, Status, parse_status
+
+
+class DesyncError(ConnectionError):
+    """Request/response pairing was lost; call ``resync()`` before new requests."""
+
+
+def _configure_tty(fd: int, baud: int) -> None:
+    import termios
+    import tty
+
+    tty.setraw(fd)
+    attrs = termios.tcgetattr(fd)
+    speed = getattr(termios, f"B{baud}", None)
+    if speed is None:
+        raise ValueError(f"unsupported baud rate for termios: {baud}")
+    attrs[4] = attrs[5] = speed
+    termios.tcsetattr(fd, termios.TCSANOW, attrs)
+
+
+class AsyncNNFpgaClient:
+    """Async session with one board: ``await status()``, ``infer()``, ``infer_many()``."""
+
+    def __init__(
+        self,
+        fd: int,
+        crc: bool = False,
+        in_dim: int = 8,
+        data_width: int = 16,
+        frac_width: int = 10,
+        timeout: float = 2.0,
+        window: int = pipeline.DEFAULT_WINDOW,
+        owns_fd: bool = False,
+    ) -> None:
+        self.fd = fd
+        self.crc = crc
+        self.in_dim = in_dim
+        self.data_width = data_width
+        self.frac_width = frac_width
+        self.timeout = timeout
+        self.unsolicited = 0  # responses that arrived with nothing outstanding
+        self.stale = 0  # packets discarded while desynchronized
+        self.decoder = proto.PacketDecoder(crc=crc)
+        self._owns_fd = owns_fd
+        self._loop = asyncio.get_running_loop()
+        self._pending: Deque[Tuple[asyncio.Future, int, Optional[int]]] = deque()
+        self._slots = asyncio.Semaphore(window)
+        self._wbuf = bytearray()
+        self._error: Optional[BaseException] = None
+        self._desync: Optional[BaseException] = None  # set from a lost frame until resync() succeeds
+        self._rx_bytes = 0
+        self._status_req = proto.pack_packet(proto.STATUS_REQ, b"", crc=crc)
+
+        os.set_blocking(fd, False)
+        self._loop.add_reader(fd, self._on_readable)
+
+    # -- constructors ---------------------------------------------------------
+
+    @classmethod
+    async def open_serial(cls, path: str, baud: int = 115200, **kwargs) -> "AsyncNNFpgaClient":
+        fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            _configure_tty(fd, baud)
+        except Exception:
+            os.close(fd)
+            raise
+        return cls(fd, owns_fd=True, **kwargs)
+
+    @classmethod
+    async def open_tcp(cls, host: str, port: int, **kwargs) -> "AsyncNNFpgaClient":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+        return cls(sock.detach(), owns_fd=True, **kwargs)
+
+    async def __aenter__(self) -> "AsyncNNFpgaClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.fd < 0:
+            return
+        self._loop.remove_reader(self.fd)
+        self._loop.remove_writer(self.fd)
+        self._fail(ConnectionError("client closed"))
+        if self._owns_fd:
+            os.close(self.fd)
+        self.fd = -1
+
+    # -- fd plumbing ----------------------------------------------------------
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        while self._pending:
+            fut = self._pending.popleft()[0]
+            if not fut.done():
+                fut.set_exception(exc)
+
+    def _fail(self, exc: BaseException) -> None:
+        self._error = exc
+        self._fail_pending(exc)
+
+    def _desynchronize(self, exc: BaseException) -> None:
+        """Fail everything outstanding and drop queued writes; pairing can no longer be trusted."""
+        if self._desync is None:
+            self._desync = exc
+        self._fail_pending(exc)
+        if self._wbuf:
+            self._wbuf.clear()
+            self._loop.remove_writer(self.fd)
+
+    def _expect(self, frame: bytes) -> Tuple[int, Optional[int]]:
+        """Response type and payload length the board sends for ``frame``."""
+        pkt_type = frame[3]
+        length = int.from_bytes(frame[4:6], "big")
+        if pkt_type == proto.STATUS_REQ:
+            return proto.STATUS_RSP, STATUS_LEN
+        if pkt_type in (proto.INFER_REQ, proto.INFER_BATCH_REQ):
+            rows = length // (self.in_dim * (self.data_width // 8))
+            return pkt_type | 0x80, rows * (self.data_width // 8)
+        return pkt_type | 0x80, None
+
+    def _on_readable(self) -> None:
+        try:
+            chunk = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as exc:
+            self._loop.remove_reader(self.fd)
+            self._fail(exc)
+            return
+        if not chunk:
+            self._loop.remove_reader(self.fd)
+            self._fail(ConnectionError("port closed"))
+            return
+        self._rx_bytes += len(chunk)
+        for pkt in self.decoder.feed(chunk):
+            if self._desync is not None and not self._pending:
+                self.stale += 1
+                continue
+            if not self._pending:
+                self.unsolicited += 1
+                continue
+            fut, rsp_type, rsp_len = self._pending.popleft()
+            if pkt.pkt_type != rsp_type or (rsp_len is not None and len(pkt.payload) != rsp_len):
+                self.stale += 1
+                if not fut.done():
+                    self._pending.appendleft((fut, rsp_type, rsp_len))
+                self._desynchronize(
+                    DesyncError(
+                        f"got 0x{pkt.pkt_type:02X} with {len(pkt.payload)} bytes, expected 0x{rsp_type:02X}"
+                        f"{'' if rsp_len is None else f' with {rsp_len} bytes'}; a frame was lost"
+                    )
+                )
+                continue
+            if not fut.done():
+                fut.set_result(pkt)
+
+    def _on_writable(self) -> None:
+        try:
+            n = os.write(self.fd, self._wbuf)
+        except BlockingIOError:
+            return
+        except OSError as exc:
+            self._loop.remove_writer(self.fd)
+            self._fail(exc)
+            return
+        del self._wbuf[:n]
+        if not self._wbuf:
+            self._loop.remove_writer(self.fd)
+
+    def _write(self, frame: bytes) -> None:
+        if not self._wbuf:
+            try:
+                n = os.write(self.fd, frame)
+            except BlockingIOError:
+                n = 0
+            frame = frame[n:]
+            if not frame:
+                return
+            self._loop.add_writer(self.fd, self._on_writable)
+        self._wbuf += frame
+
+    # -- requests -------------------------------------------------------------
+
+    @property
+    def desynchronized(self) -> bool:
+        return self._desync is not None
+
+    async def _roundtrip(self, frame: bytes) -> proto.Packet:
+        fut = self._loop.create_future()
+        # Mark the outcome retrieved so abandoned (cancelled) requests failing
+        # later at close() or on a desync do not log "never retrieved".
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending.append((fut, *self._expect(frame)))
+        self._write(frame)
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+        except asyncio.TimeoutError:
+            exc = TimeoutError(f"no response within {self.timeout} s")
+            self._desynchronize(exc)
+            raise exc from None
+
+    async def request(self, frame: bytes) -> proto.Packet:
+        """Send one pre-encoded frame and await its response (bounded in-flight window).
+
+        Raises TimeoutError (and desynchronizes the client) when no response
+        arrives in time, and DesyncError while the client is desynchronized.
+        """
+        async with self._slots:
+            if self._error is not None:
+                raise self._error
+            if self._desync is not None:
+                raise DesyncError(f"client desynchronized ({self._desync}); call resync()")
+            return await self._roundtrip(frame)
+
+    async def resync(self, quiet: float = 0.05) -> Status:
+        """Drain stale input, re-establish pairing with a STATUS round trip, return the status.
+
+        Waits until no byte has arrived for ``quiet`` seconds (bounded by the
+        client timeout), resets the decoder and sends STATUS_REQ. On failure
+        the client stays desynchronized.
+        """
+        if self._error is not None:
+            raise self._error
+        self._desynchronize(DesyncError("resync in progress"))
+        deadline = self._loop.time() + self.timeout
+        while True:
+            seen = self._rx_bytes
+            await asyncio.sleep(quiet)
+            if self._rx_bytes == seen or self._loop.time() > deadline:
+                break
+        self.decoder.reset()
+        pkt = await self._roundtrip(self._status_req)
+        self._desync = None
+        return parse_status(pkt.payload)
+
+    async def status(self) -> Status:
+        pkt = await self.request(self._status_req)
+        if pkt.pkt_type != proto.STATUS_RSP:
+            raise ValueError(f"expected STATUS_RSP, got 0x{pkt.pkt_type:02X}")
+        return parse_status(pkt.payload)
+
+    async def infer(self, x) -> float:
+        payload = fixedpoint.pack_array(x, data_width=self.data_width, frac_width=self.frac_width)
+        pkt = await self.request(proto.pack_packet(proto.INFER_REQ, payload, crc=self.crc))
+        return float(proto.unpack_infer_batch(pkt, data_width=self.data_width, frac_width=self.frac_width)[0])
+
+    async def infer_many(self, rows: Iterable):
+        """Run every row of an (N, in_dim) array; requests overlap up to the window size."""
+        import numpy as np
+
+        x = np.asarray(rows if hasattr(rows, "shape") else list(rows), dtype=np.float64).reshape(-1, self.in_dim)
+        if x.shape[0] == 0:
+            return np.zeros(0)
+        buf = fixedpoint.pack_array(x, data_width=self.data_width, frac_width=self.frac_width)
+        n = self.in_dim * (self.data_width // 8)
+        frames = [proto.pack_packet(proto.INFER_REQ, buf[i : i + n], crc=self.crc) for i in range(0, len(buf), n)]
+        pkts = await asyncio.gather(*(self.request(f) for f in frames))
+        return np.concatenate(
+            [proto.unpack_infer_batch(p, data_width=self.data_width, frac_width=self.frac_width) for p in pkts]
+        )
@@ -0,0 +1,344 @@
+"""NumPy model of the hls4ml ap_fixed Dense/ReLU datapath.
+
+Evaluates `nn.models.mlp_regressor.build_mlp` networks the way the
+generated HLS does, on integers, for a whole batch at once:
+
+- weights and biases are cast to ``weight_t``/``bias_t`` the way hls4ml
+  exports them: printed as decimal text with one digit per fractional bit
+  (``precision_fmt``), parsed back as double and cast with the type's
+  rounding, so a weight just below an LSB boundary lands on it;
+- each Dense output starts from ``bias`` cast to ``accum_t``, and every
+  ``x * w`` product (full precision) is cast to ``accum_t`` and added in
+  input order, with ``accum_t`` rounding/overflow applied after each add;
+- the accumulator is cast to ``result_t``; ReLU is ``max(x, 0)`` cast to
+  its own ``result_t``.
+
+Types are ``ap_fixed<W,I[,Q[,O]]>`` / ``ap_ufixed`` strings, with the
+Vitis defaults AP_TRN (floor) and AP_WRAP. With ``bit_exact`` the
+accumulator is lossless. Precision comes from the ``hls4ml`` section of
+nn/hls4ml_config.yaml: ``precision`` for every type, ``layer_precision``
+overrides keyed by hls4ml layer name (the Sequential index, ``"0"`` or
+``"_0"``), each either one type string or a ``{weight, bias, accum,
+result}`` mapping.
+
+Outputs are bit-exact against compiled hls4ml
+(``test_apfixed_matches_hls4ml``).
+
+Example:
+    mlp = ApFixedMLP.from_checkpoint("model.npz", hls_cfg=load_hls_config("nn/hls4ml_config.yaml"))
+    y = mlp(x_test)  # float64, the values the core is expected to return
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_PRECISION = "ap_fixed<16,6>"
+# ap_fixed<W,I>, ap_ufixed<W,I,Q,O[,N]>, fixed<W,I,RND,SAT> (hls4ml spelling)
+_TYPE_RE = re.compile(
+    r"^\s*(ap_)?(u?)fixed\s*<\s*(\d+)\s*,\s*(-?\d+)\s*"
+    r"(?:,\s*(\w+)\s*)?(?:,\s*(\w+)\s*)?(?:,\s*\d+\s*)?>\s*$"
+)
+_ROUNDING = ("AP_TRN", "AP_TRN_ZERO", "AP_RND", "AP_RND_ZERO", "AP_RND_INF", "AP_RND_MIN_INF", "AP_RND_CONV")
+_OVERFLOW = ("AP_WRAP", "AP_SAT", "AP_SAT_ZERO", "AP_SAT_SYM")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for the ap_fixed emulator (pip install numpy)")
+
+
+def _mode(name: Optional[str], allowed: Tuple[str, ...], default: str) -> str:
+    if not name:
+        return default
+    name = name.upper()
+    if not name.startswith("AP_"):
+        name = "AP_" + name  # hls4ml also writes fixed<16,6,RND,SAT>
+    if name not in allowed:
+        raise ValueError(f"unsupported ap_fixed mode: {name}")
+    return name
+
+
+@dataclass(frozen=True)
+class FixedType:
+    width: int
+    integer: int
+    signed: bool = True
+    rounding: str = "AP_TRN"
+    overflow: str = "AP_WRAP"
+
+    @classmethod
+    def parse(cls, text: str) -> "FixedType":
+        m = _TYPE_RE.match(str(text))
+        if not m:
+            raise ValueError(f"cannot parse fixed-point type: {text!r}")
+        _, unsigned, width, integer, rnd, ovf = m.groups()
+        return cls(
+            width=int(width),
+            integer=int(integer),
+            signed=not unsigned,
+            rounding=_mode(rnd, _ROUNDING, "AP_TRN"),
+            overflow=_mode(ovf, _OVERFLOW, "AP_WRAP"),
+        )
+
+    @property
+    def frac(self) -> int:
+        return self.width - self.integer
+
+    @property
+    def limits(self) -> Tuple[int, int]:
+        if self.signed:
+            return -(1 << (self.width - 1)), (1 << (self.width - 1)) - 1
+        return 0, (1 << self.width) - 1
+
+    def __str__(self) -> str:
+        base = f"ap_{'' if self.signed else 'u'}fixed<{self.width},{self.integer}"
+        if (self.rounding, self.overflow) != ("AP_TRN", "AP_WRAP"):
+            base += f",{self.rounding},{self.overflow}"
+        return base + ">"
+
+    # -- casts ---------------------------------------------------------------
+
+    def saturate(self, v: "np.ndarray") -> "np.ndarray":
+        """Apply this type's overflow mode to integer mantissas."""
+        lo, hi = self.limits
+        if self.overflow == "AP_WRAP":
+            return (v - lo) % (1 << self.width) + lo
+        if self.overflow == "AP_SAT_ZERO":
+            return np.where((v < lo) | (v > hi), 0, v)
+        if self.overflow == "AP_SAT_SYM" and self.signed:
+            lo = -hi
+        return np.clip(v, lo, hi)
+
+    def shift_round(self, raw: "np.ndarray", s: int) -> "np.ndarray":
+        """Divide integers by 2**s with this type's rounding mode."""
+        if s <= 0:
+            return raw << -s
+        if self.rounding == "AP_TRN":
+            return raw >> s
+        half = 1 << (s - 1)
+        mag = np.abs(raw)
+        if self.rounding == "AP_TRN_ZERO":
+            return np.sign(raw) * (mag >> s)
+        if self.rounding == "AP_RND":
+            return (raw + half) >> s
+        if self.rounding == "AP_RND_MIN_INF":
+            return (raw + half - 1) >> s
+        if self.rounding == "AP_RND_INF":
+            return np.sign(raw) * ((mag + half) >> s)
+        if self.rounding == "AP_RND_ZERO":
+            return np.sign(raw) * ((mag + half - 1) >> s)
+        q = raw >> s  # AP_RND_CONV: ties to even
+        rem = raw - (q << s)
+        return q + ((rem > half) | ((rem == half) & ((q & 1) == 1)))
+
+    def cast(self, raw: "np.ndarray", frac: int) -> "np.ndarray":
+        """Cast integers with ``frac`` fractional bits to this type (int64, ``self.frac`` bits)."""
+        return self.saturate(self.shift_round(np.asarray(raw, dtype=np.int64), frac - self.frac))
+
+    def from_float(self, values) -> "np.ndarray":
+        """Cast floats to this type; returns the integer mantissas (int64)."""
+        _require_numpy()
+        scaled = np.ldexp(np.asarray(values, dtype=np.float64), self.frac)  # exact
+        mag = np.abs(scaled)
+        if self.rounding == "AP_TRN":
+            q = np.floor(scaled)
+        elif self.rounding == "AP_TRN_ZERO":
+            q = np.trunc(scaled)
+        elif self.rounding == "AP_RND":
+            q = np.floor(scaled + 0.5)
+        elif self.rounding == "AP_RND_MIN_INF":
+            q = np.ceil(scaled - 0.5)
+        elif self.rounding == "AP_RND_INF":
+            q = np.sign(scaled) * np.floor(mag + 0.5)
+        elif self.rounding == "AP_RND_ZERO":
+            q = np.sign(scaled) * np.ceil(mag - 0.5)
+        else:
+            q = np.rint(scaled)
+        return self.saturate(q.astype(np.int64))
+
+    def from_decimal_text(self, values) -> "np.ndarray":
+        """Cast floats as hls4ml's weight export does: ``f"{v:.{frac}f}"``, parsed as double, then cast."""
+        _require_numpy()
+        a = np.asarray(values, dtype=np.float64)
+        digits = max(0, self.frac)
+        text = np.array([float(f"{v:.{digits}f}") for v in a.ravel()], dtype=np.float64)
+        return self.from_float(text.reshape(a.shape))
+
+    def to_float(self, raw: "np.ndarray") -> "np.ndarray":
+        return np.ldexp(np.asarray(raw, dtype=np.float64), -self.frac)
+
+
+@dataclass(frozen=True)
+class DenseTypes:
+    weight: FixedType
+    bias: FixedType
+    accum: Optional[FixedType]  # None: lossless (bit_exact)
+    result: FixedType
+
+    @classmethod
+    def uniform(cls, t: FixedType, bit_exact: bool = False) -> "DenseTypes":
+        return cls(weight=t, bias=t, accum=None if bit_exact else t, result=t)
+
+
+def _layer_types(spec: Any, default: FixedType, bit_exact: bool) -> DenseTypes:
+    if spec is None:
+        return DenseTypes.uniform(default, bit_exact)
+    if isinstance(spec, str):
+        return DenseTypes.uniform(FixedType.parse(spec), bit_exact)
+
+    def _get(key: str) -> FixedType:
+        return FixedType.parse(spec[key]) if key in spec else default
+
+    accum = None if bit_exact and "accum" not in spec else _get("accum")
+    return DenseTypes(weight=_get("weight"), bias=_get("bias"), accum=accum, result=_get("result"))
+
+
+def _lookup(overrides: Dict[str, Any], index: int) -> Any:
+    for key in (str(index), f"_{index}"):
+        if key in overrides:
+            return overrides[key]
+    return None
+
+
+class ApFixedMLP:
+    """``build_mlp`` network evaluated with hls4ml ap_fixed semantics (see module docstring).
+
+    ``layers`` are ``(weight, bias)`` float arrays of each Linear, in order;
+    ``layer_index`` holds their hls4ml layer names' Sequential indices
+    (default 0, 2, 4, ... with the ReLU in between).
+    """
+
+    def __init__(
+        self,
+        layers: List[Tuple["np.ndarray", "np.ndarray"]],
+        precision: str = DEFAULT_PRECISION,
+        layer_precision: Optional[Dict[str, Any]] = None,
+        bit_exact: bool = False,
+        layer_index: Optional[List[int]] = None,
+    ) -> None:
+        _require_numpy()
+        default = FixedType.parse(precision)
+        overrides = layer_precision or {}
+        index = layer_index if layer_index is not None else [2 * i for i in range(len(layers))]
+        in_spec = overrides.get("x", overrides.get("input"))
+        self.input_type = FixedType.parse(in_spec) if isinstance(in_spec, str) else default
+        self.types: List[DenseTypes] = []
+        self.relu_types: List[FixedType] = []
+        self.layers: List[Tuple["np.ndarray", "np.ndarray"]] = []
+        for (w, b), i in zip(layers, index):
+            t = _layer_types(_lookup(overrides, i), default, bit_exact)
+            relu = _lookup(overrides, i + 1)
+            self.types.append(t)
+            self.relu_types.append(FixedType.parse(relu) if isinstance(relu, str) else t.result)
+            self.layers.append((t.weight.from_decimal_text(w), t.bias.from_decimal_text(b)))
+
+    @property
+    def input_dim(self) -> int:
+        return int(self.layers[0][0].shape[1])
+
+    @property
+    def output_type(self) -> FixedType:
+        return self.types[-1].result
+
+    def forward_ints(self, x: "np.ndarray") -> "np.ndarray":
+        """Run integer inputs (``input_type`` mantissas, shape (N, in_dim)); return output mantissas (N, out)."""
+        h = np.atleast_2d(np.asarray(x, dtype=np.int64))
+        h_frac = self.input_type.frac
+        last = len(self.layers) - 1
+        for n, ((w, b), t) in enumerate(zip(self.layers, self.types)):
+            p_frac = h_frac + t.weight.frac
+            if t.accum is None:
+                # Lossless accumulator: keep every product bit.
+                acc_frac = max(p_frac, t.bias.frac)
+                acc = ((h @ w.T) << (acc_frac - p_frac)) + (b << (acc_frac - t.bias.frac))
+            else:
+                acc_frac = t.accum.frac
+                s = p_frac - acc_frac
+                # Work transposed (out, N) so each input column is one contiguous row.
+                hT = np.ascontiguousarray(h.T)
+                accT = np.repeat(t.accum.cast(b, t.bias.frac)[:, None], h.shape[0], axis=1)
+                # Wrapping is modular, so one wrap at the end equals one per add.
+                wrap_once = t.accum.overflow == "AP_WRAP"
+                prod = np.empty_like(accT)
+                for j in range(w.shape[1]):
+                    np.multiply(w[:, j : j + 1], hT[j], out=prod)
+                    accT += t.accum.shift_round(prod, s)
+                    if not wrap_once:
+                        accT = t.accum.saturate(accT)
+                acc = accT.T
+                if wrap_once:
+                    acc = t.accum.saturate(acc)
+            h = t.result.cast(acc, acc_frac)
+            h_frac = t.result.frac
+            if n < last:
+                h = self.relu_types[n].cast(np.maximum(h, 0), h_frac)
+                h_frac = self.relu_types[n].frac
+        return h
+
+    def __call__(self, x) -> "np.ndarray":
+        """Cast float inputs to ``input_type`` (as ``hls_model.predict`` does) and return float outputs (N,)."""
+        xi = self.input_type.from_float(np.atleast_2d(np.asarray(x, dtype=np.float64)))
+        return self.output_type.to_float(self.forward_ints(xi))[:, 0]
+
+    @classmethod
+    def from_config(cls, layers, hls_cfg: Optional[Dict[str, Any]] = None, **kwargs) -> "ApFixedMLP":
+        """Build from the ``hls4ml`` section of nn/hls4ml_config.yaml (or the whole file's dict)."""
+        h = dict((hls_cfg or {}).get("hls4ml", hls_cfg or {}))
+        bit_exact = h.get("bit_exact", None)
+        if isinstance(bit_exact, str):
+            bit_exact = bit_exact.strip().lower() in ("true", "1", "yes")
+        return cls(
+            layers,
+            precision=h.get("precision", DEFAULT_PRECISION),
+            layer_precision=h.get("layer_precision", {}) or {},
+            bit_exact=bool(bit_exact),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_checkpoint(cls, path: str | Path, hls_cfg: Optional[Dict[str, Any]] = None) -> "ApFixedMLP":
+        layers, index = layers_from_state_dict(load_state_dict(path))
+        return cls.from_config(layers, hls_cfg, layer_index=index)
+
+
+def load_hls_config(path: str | Path) -> Dict[str, Any]:
+    """Read an hls4ml YAML config (needs PyYAML)."""
+    try:
+        import yaml  # type: ignore
+    except Exception as exc:  # pragma: no cover - environment-dependent
+        raise RuntimeError("PyYAML is required to read hls4ml configs (pip install pyyaml)") from exc
+    with Path(path).open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def load_state_dict(path: str | Path) -> Dict[str, "np.ndarray"]:
+    """Load `model.pt` (needs torch) or an `.npz` holding the same state_dict keys."""
+    _require_numpy()
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            return {k: np.asarray(data[k]) for k in data.files}
+    try:
+        import torch
+    except Exception as exc:  # pragma: no cover - environment-dependent
+        raise RuntimeError("torch is required to read .pt checkpoints (or pass an .npz)") from exc
+    state = torch.load(path, map_location="cpu")
+    return {k: v.detach().cpu().numpy() for k, v in state.items()}
+
+
+def layers_from_state_dict(state: Dict[str, "np.ndarray"]) -> Tuple[List[Tuple["np.ndarray", "np.ndarray"]], List[int]]:
+    """Linear ``(weight, bias)`` pairs in order, and their Sequential indices."""
+    # nn.Sequential keys look like "0.weight", "0.bias", "2.weight", ...
+    idx = sorted(int(k.split(".")[0]) for k in state if k.endswith(".weight"))
+    if not idx:
+        raise ValueError("state_dict has no Linear weights")
+    return [(state[f"{i}.weight"], state[f"{i}.bias"]) for i in idx], idx
@@ -0,0 +1,194 @@
+"""Long-lived host session with the board over UART.
+
+Holds the serial port open, keeps one streaming decoder (and its receive
+buffer) for the whole session, and pre-encodes the packets and headers that
+never change, so per-call cost is just quantize + write + decode.
+
+Example:
+    from nnfpga.client import NNFpgaClient
+
+    with NNFpgaClient("/dev/ttyUSB0") as dev:
+        print(dev.status())
+        y = dev.infer(x_test[0])
+        ys = dev.infer_many(x_test)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, Sequence
+
+from . import fixedpoint, pipeline, proto
+
+STATUS_LEN = 20  # mmio_status LEN_BYTES
+COUNTER_BITS = 32  # perf_counters G_WIDTH
+CLK_HZ = 100_000_000  # clk_100mhz, the rate of the STATUS cycle counter
+UART_BITS_PER_BYTE = 10  # start + 8 data + stop
+
+
+@dataclass
+class Status:
+    build_id: int
+    cycles: int
+    stalls: int
+    infers: int
+    nn_data_w: int
+    nn_frac_w: int
+
+
+def parse_status(payload: bytes) -> Status:
+    """Decode the little-endian STATUS_RSP payload laid out by mmio_status.vhd."""
+    if len(payload) < STATUS_LEN:
+        raise ValueError(f"STATUS payload too short: {len(payload)} bytes")
+    build_id = int.from_bytes(payload[0:4], "little")
+    cycles = int.from_bytes(payload[4:8], "little")
+    stalls = int.from_bytes(payload[8:12], "little")
+    infers = int.from_bytes(payload[12:16], "little")
+    nn_data_w = int.from_bytes(payload[16:18], "little")
+    nn_frac_w = int.from_bytes(payload[18:20], "little")
+    return Status(build_id, cycles, stalls, infers, nn_data_w, nn_frac_w)
+
+
+def counter_delta(after: int, before: int, bits: int = COUNTER_BITS) -> int:
+    """Difference of two free-running counter snapshots, modulo wraparound.
+
+    Exact as long as fewer than 2**bits ticks elapse between the snapshots
+    (about 42.9 s for the 32-bit cycle counter at 100 MHz).
+    """
+    return (after - before) & ((1 << bits) - 1)
+
+
+def open_serial(port: str, baud: int = 115200, timeout: float = 2.0):
+    """Open ``port`` with pyserial; URLs such as ``socket://host:port`` also work."""
+    try:
+        import serial  # type: ignore
+    except Exception as exc:  # pragma: no cover - environment-dependent
+        raise RuntimeError("pyserial is required (pip install pyserial)") from exc
+    return serial.serial_for_url(port, baudrate=baud, timeout=timeout)
+
+
+class NNFpgaClient:
+    """Session with one board: ``status()``, ``infer()``, ``infer_many()``.
+
+    Pass ``ser`` to reuse an already-open pyserial-like object (the client
+    then does not close it).
+    """
+
+    def __init__(
+        self,
+        port: str = "",
+        baud: int = 115200,
+        timeout: float = 2.0,
+        crc: bool = False,
+        in_dim: int = 8,
+        data_width: int = 16,
+        frac_width: int = 10,
+        ser=None,
+    ) -> None:
+        if ser is None and not port:
+            raise ValueError("either port or ser is required")
+        self.crc = crc
+        self.in_dim = in_dim
+        self.data_width = data_width
+        self.frac_width = frac_width
+        self._owns_port = ser is None
+        self.ser = open_serial(port, baud, timeout) if ser is None else ser
+        if self._owns_port:
+            self.ser.reset_input_buffer()
+            self.ser.reset_output_buffer()
+
+        self.decoder = proto.PacketDecoder(crc=crc)
+        self._backlog: Deque[proto.Packet] = deque()
+        # Constant packets/headers, encoded once per session
+        self._status_req = proto.pack_packet(proto.STATUS_REQ, b"", crc=crc)
+        self._payload_len = in_dim * (data_width // 8)
+        self._infer_hdr = proto.pack_packet(proto.INFER_REQ, bytes(self._payload_len))[:6]
+
+    def __enter__(self) -> "NNFpgaClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_port and self.ser is not None:
+            self.ser.close()
+        self.ser = None
+
+    # -- raw packet I/O -------------------------------------------------------
+
+    def read_packet(self) -> proto.Packet:
+        """Return the next response, reading whatever the port has buffered."""
+        while not self._backlog:
+            chunk = self.ser.read(max(1, self.ser.in_waiting))
+            if not chunk:
+                # pyserial returns b'' on timeout
+                raise TimeoutError(f"UART timeout while waiting for packet ({self.decoder.pending} bytes buffered)")
+            self._backlog.extend(self.decoder.feed(chunk))
+        return self._backlog.popleft()
+
+    def request(self, frame: bytes) -> proto.Packet:
+        """Write one pre-encoded request frame and return its response."""
+        self.ser.write(frame)
+        self.ser.flush()
+        return self.read_packet()
+
+    def request_many(self, frames: Sequence[bytes], window: int = pipeline.DEFAULT_WINDOW) -> pipeline.PipelineResult:
+        """Pipeline pre-encoded request frames (see nnfpga.pipeline)."""
+        if self._backlog:
+            raise RuntimeError("unread responses pending; drain read_packet() first")
+        return pipeline.run_pipelined(self.ser, frames, window=window, crc=self.crc, decoder=self.decoder)
+
+    # -- high-level calls -----------------------------------------------------
+
+    def encode_infer(self, payload: bytes) -> bytes:
+        """Frame an already-quantized INFER_REQ payload using the cached header."""
+        if len(payload) != self._payload_len:
+            raise ValueError(f"INFER payload must be {self._payload_len} bytes, got {len(payload)}")
+        frame = self._infer_hdr + payload
+        if self.crc:
+            frame += proto.crc16_ccitt(frame[2:]).to_bytes(2, "big")
+        return frame
+
+    def status(self) -> Status:
+        pkt = self.request(self._status_req)
+        if pkt.pkt_type != proto.STATUS_RSP:
+            raise ValueError(f"expected STATUS_RSP, got 0x{pkt.pkt_type:02X}")
+        return parse_status(pkt.payload)
+
+    def infer(self, x) -> float:
+        """Run one feature vector of length ``in_dim``; return the dequantized output."""
+        payload = fixedpoint.pack_array(x, data_width=self.data_width, frac_width=self.frac_width)
+        pkt = self.request(self.encode_infer(payload))
+        return float(proto.unpack_infer_batch(pkt, data_width=self.data_width, frac_width=self.frac_width)[0])
+
+    def infer_many(self, rows: Iterable, window: int = pipeline.DEFAULT_WINDOW, batch: int = 0):
+        """Run every row of an (N, in_dim) array; return N outputs in order.
+
+        Rows are quantized in one vectorized call. With ``batch=K`` they are
+        sent as INFER_BATCH_REQ frames of up to K rows, otherwise as
+        pipelined INFER_REQ frames with ``window`` in flight.
+        """
+        import numpy as np
+
+        x = np.asarray(rows if hasattr(rows, "shape") else list(rows), dtype=np.float64).reshape(-1, self.in_dim)
+        if x.shape[0] == 0:
+            return np.zeros(0)
+        buf = fixedpoint.pack_array(x, data_width=self.data_width, frac_width=self.frac_width)
+        n = self._payload_len
+        if batch:
+            batch = min(batch, proto.max_batch(self.in_dim, self.data_width))
+            frames = [
+                proto.pack_packet(proto.INFER_BATCH_REQ, buf[i : i + batch * n], crc=self.crc)
+                for i in range(0, len(buf), batch * n)
+            ]
+        else:
+            frames = [self.encode_infer(buf[i : i + n]) for i in range(0, len(buf), n)]
+        result = self.request_many(frames, window=window)
+        return np.concatenate(
+            [
+                proto.unpack_infer_batch(p, data_width=self.data_width, frac_width=self.frac_width)
+                for p in result.responses
+            ]
+        )
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Software FPGA device emulator speaking the UART packet protocol.
+
+Stands in for the Nexys Video board so host tools can be exercised and
+benchmarked on a plain Linux machine. The emulator listens on a
+pseudo-terminal (or a TCP socket), frames incoming bytes like `pkt_rx`,
+answers STATUS_REQ, INFER_REQ and INFER_BATCH_REQ the same way `top_nexys_video.vhd` does,
+and keeps cycle/inference counters that behave like `perf_counters`.
+
+Inference runs the trained MLP bit-exactly in ap_fixed arithmetic (see
+nnfpga/apfixed.py), with the precision from an hls4ml config if given.
+Without a checkpoint it behaves like `hls4ml_wrap` with G_STUB (y = x[0]).
+With `--baud`, responses are delayed to the time the bytes would take on a
+real UART (10 bits per byte), so throughput numbers are comparable.
+
+Example:
+  python host/python/nnfpga/emulator.py --pty \
+    --checkpoint nn/outputs/calhouse/default/model.pt --baud 115200
+  # prints: Emulator listening on /dev/pts/N
+  python host/python/nnfpga/send_uart.py --port /dev/pts/N --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import queue
+import select
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import sys
+
+import numpy as np
+
+PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+from nnfpga import apfixed, client, fixedpoint, proto
+
+# Cycles from last request byte to first response byte. Rough figure for the
+# calhouse core at reuse_factor 1; override with the csynth latency.
+DEFAULT_LATENCY_CYCLES = 60
+
+Model = Callable[[np.ndarray], np.ndarray]
+
+
+class FixedPointMLP(apfixed.ApFixedMLP):
+    """Dense/ReLU stack from `build_mlp` with every type ``ap_fixed<data_width, data_width - frac_width>``.
+
+    This is hls4ml's ``granularity="model"`` configuration (AP_TRN, AP_WRAP),
+    so outputs are bit-exact with the core. Use ``apfixed.ApFixedMLP.from_config``
+    for per-layer precision.
+    """
+
+    def __init__(
+        self, layers: List[Tuple[np.ndarray, np.ndarray]], data_width: int = 16, frac_width: int = 10, **kwargs
+    ) -> None:
+        super().__init__(layers, precision=f"ap_fixed<{data_width},{data_width - frac_width}>", **kwargs)
+        self.data_width = data_width
+        self.frac_width = frac_width
+
+    @classmethod
+    def from_checkpoint(cls, path: str | Path, **kwargs) -> "FixedPointMLP":
+        layers, index = load_layers(path)
+        return cls(layers, layer_index=index, **kwargs)
+
+
+def load_layers(path: str | Path):
+    """Linear ``(weight, bias)`` pairs and Sequential indices from a `.pt`/`.npz` checkpoint."""
+    return apfixed.layers_from_state_dict(apfixed.load_state_dict(path))
+
+
+class DeviceEmulator:
+    """Protocol-level model of the board: bytes in, response bytes out."""
+
+    def __init__(
+        self,
+        model: Optional[Model] = None,
+        in_dim: int = 8,
+        data_width: int = 16,
+        frac_width: int = 10,
+        crc: bool = False,
+        baud: int = 0,
+        latency_cycles: int = DEFAULT_LATENCY_CYCLES,
+        build_id: int = 0,
+        clk_hz: int = client.CLK_HZ,
+    ) -> None:
+        self.model = model
+        self.in_dim = in_dim
+        self.data_width = data_width
+        self.frac_width = frac_width
+        self.crc = crc
+        self.baud = baud
+        self.latency_cycles = latency_cycles
+        self.build_id = build_id
+        self.clk_hz = clk_hz
+        self.infers = 0
+        self.stalls = 0
+        self.rejected = 0  # frames dropped (bad length / unknown type)
+        self._decoder = proto.PacketDecoder(crc=crc)
+        self._t0 = time.monotonic()
+
+    @property
+    def byte_time_s(self) -> float:
+        return client.UART_BITS_PER_BYTE / self.baud if self.baud else 0.0
+
+    @property
+    def latency_s(self) -> float:
+        return self.latency_cycles / self.clk_hz
+
+    def cycles(self, now: Optional[float] = None) -> int:
+        """Free-running 32-bit cycle counter, wrapping like perf_counters."""
+        now = time.monotonic() if now is None else now
+        return int((now - self._t0) * self.clk_hz) & 0xFFFFFFFF
+
+    def status_payload(self, now: Optional[float] = None) -> bytes:
+        # Little-endian layout from mmio_status.vhd
+        return (
+            (self.build_id & 0xFFFFFFFF).to_bytes(4, "little")
+            + self.cycles(now).to_bytes(4, "little")
+            + (self.stalls & 0xFFFFFFFF).to_bytes(4, "little")
+            + (self.infers & 0xFFFFFFFF).to_bytes(4, "little")
+            + self.data_width.to_bytes(2, "little")
+            + self.frac_width.to_bytes(2, "little")
+        )
+
+    def infer(self, payload: bytes) -> bytes:
+        x = fixedpoint.unpack_values_array(
+            payload, data_width=self.data_width, frac_width=self.frac_width, dim=self.in_dim
+        )
+        y = x[:, 0] if self.model is None else np.asarray(self.model(x)).reshape(-1)
+        return fixedpoint.pack_array(y, data_width=self.data_width, frac_width=self.frac_width)
+
+    def handle(self, data: bytes, now: Optional[float] = None) -> bytes:
+        """Feed received bytes; return the response bytes for every completed request."""
+        out = bytearray()
+        in_len = self.in_dim * self.data_width // 8
+        for pkt in self._decoder.feed(data):
+            if pkt.pkt_type == proto.STATUS_REQ:
+                out += proto.pack_packet(proto.STATUS_RSP, self.status_payload(now), crc=self.crc)
+            elif pkt.pkt_type == proto.INFER_REQ and len(pkt.payload) == in_len:
+                rsp = self.infer(pkt.payload)
+                self.infers += 1
+                out += proto.pack_packet(proto.INFER_RSP, rsp, crc=self.crc)
+            elif pkt.pkt_type == proto.INFER_BATCH_REQ and pkt.payload and len(pkt.payload) % in_len == 0:
+                rsp = self.infer(pkt.payload)
+                self.infers += len(pkt.payload) // in_len
+                out += proto.pack_packet(proto.INFER_BATCH_RSP, rsp, crc=self.crc)
+            else:
+                # top_nexys_video drains these (wrong length or unknown type) without a response
+                self.rejected += 1
+        return bytes(out)
+
+    def serve_fd(self, fd: int, stop: Optional[threading.Event] = None) -> None:
+        """Serve requests on a file descriptor until EOF or ``stop`` is set.
+
+        Throttling models the link as two independent serial lines: received
+        bytes are timestamped as if they arrived at ``baud``, and each
+        response is written no earlier than it would finish transmitting.
+        """
+        stop = stop or threading.Event()
+        outbox: "queue.Queue[Optional[Tuple[float, bytes]]]" = queue.Queue()
+
+        def _sender() -> None:
+            # Separate thread so reads keep draining while a response "transmits".
+            while True:
+                item = outbox.get()
+                if item is None:
+                    return
+                due, rsp = item
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    os.write(fd, rsp)
+                except OSError:
+                    return
+
+        sender = threading.Thread(target=_sender, name="nnfpga-emulator-tx", daemon=True)
+        sender.start()
+        rx_done = 0.0
+        tx_free = 0.0
+        try:
+            while not stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.05)
+                if not ready:
+                    continue
+                try:
+                    chunk = os.read(fd, 4096)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                rx_done = max(rx_done, time.monotonic()) + len(chunk) * self.byte_time_s
+                rsp = self.handle(chunk, now=rx_done)
+                if rsp:
+                    tx_free = max(tx_free, rx_done + self.latency_s) + len(rsp) * self.byte_time_s
+                    outbox.put((tx_free, rsp))
+        finally:
+            outbox.put(None)
+            sender.join()
+
+    def serve_tcp(self, host: str, port: int, stop: Optional[threading.Event] = None) -> None:
+        """Accept one TCP client at a time (pyserial URL ``socket://host:port``)."""
+        stop = stop or threading.Event()
+        with socket.create_server((host, port)) as srv:
+            srv.settimeout(0.1)
+            while not stop.is_set():
+                try:
+                    conn, _ = srv.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    self.serve_fd(conn.fileno(), stop)
+
+
+def open_pty() -> Tuple[int, int, str]:
+    """Open a raw pseudo-terminal; returns (master_fd, slave_fd, slave_path).
+
+    Keep ``slave_fd`` open for the emulator's lifetime: otherwise reads on the
+    master fail with EIO whenever no client has the port open.
+    """
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    return master, slave, os.ttyname(slave)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    where = ap.add_mutually_exclusive_group(required=True)
+    where.add_argument("--pty", action="store_true", help="Listen on a new pseudo-terminal")
+    where.add_argument("--tcp", type=int, default=0, help="Listen on this TCP port instead")
+    ap.add_argument("--host", default="127.0.0.1", help="Bind address for --tcp")
+    ap.add_argument("--checkpoint", default="", help="model.pt or .npz weights (default: stub y = x[0])")
+    ap.add_argument("--hls-config", default="", help="hls4ml YAML for per-layer precision (needs PyYAML)")
+    ap.add_argument("--in-dim", type=int, default=8, help="Input features per INFER_REQ")
+    ap.add_argument("--data-width", type=int, default=16, help="NN_DATA_WIDTH")
+    ap.add_argument("--frac-width", type=int, default=10, help="NN_FRAC_WIDTH")
+    ap.add_argument("--baud", type=int, default=0, help="Throttle to this baud rate (0 = no throttle)")
+    ap.add_argument("--latency-cycles", type=int, default=DEFAULT_LATENCY_CYCLES, help="Core latency in cycles")
+    ap.add_argument("--build-id", type=lambda s: int(s, 0), default=0, help="BUILD_ID reported by STATUS")
+    ap.add_argument("--crc", action="store_true", help="Expect/emit CRC in packets")
+    args = ap.parse_args()
+
+    model: Optional[Model] = None
+    in_dim = args.in_dim
+    if args.checkpoint and args.hls_config:
+        mlp = apfixed.ApFixedMLP.from_checkpoint(args.checkpoint, apfixed.load_hls_config(args.hls_config))
+        model, in_dim = mlp, mlp.input_dim
+    elif args.checkpoint:
+        mlp = FixedPointMLP.from_checkpoint(
+            args.checkpoint, data_width=args.data_width, frac_width=args.frac_width
+        )
+        model, in_dim = mlp, mlp.input_dim
+
+    emu = DeviceEmulator(
+        model=model,
+        in_dim=in_dim,
+        data_width=args.data_width,
+        frac_width=args.frac_width,
+        crc=args.crc,
+        baud=args.baud,
+        latency_cycles=args.latency_cycles,
+        build_id=args.build_id,
+    )
+
+    try:
+        if args.pty:
+            master, _slave, path = open_pty()
+            print(f"Emulator listening on {path}", flush=True)
+            emu.serve_fd(master)
+        else:
+            print(f"Emulator listening on socket://{args.host}:{args.tcp}", flush=True)
+            emu.serve_tcp(args.host, args.tcp)
+    except KeyboardInterrupt:
+        pass
+    print(f"Served {emu.infers} inferences ({emu.rejected} frames rejected)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,11 @@ from __future__ import annotations
 
 from typing import Iterable, List
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
 
 def _limits(width: int, signed: bool) -> tuple[int, int]:
     if signed:
@@ -54,3 +59,65 @@ def unpack_values(payload: bytes, data_width: int = 16, frac_width: int = 10, si
     scale = 1 << frac_width
     ints = unpack_ints(payload, data_width=data_width, signed=signed)
     return [v / scale for v in ints]
+
+
+# ---------------------------------------------------------------------------
+# Vectorized (NumPy) batch API
+#
+# Same saturation/rounding semantics as the scalar helpers above: Python's
+# round() and np.rint() both round half-to-even, and clipping matches
+# quantize(). Payloads are one contiguous little-endian buffer, row-major,
+# so an (N, D) array packs into N back-to-back INFER payloads.
+# ---------------------------------------------------------------------------
+
+
+def _np_dtype(data_width: int, signed: bool):
+    if np is None:
+        raise RuntimeError("numpy is required for the batch fixed-point API (pip install numpy)")
+    if data_width not in (8, 16, 32, 64):
+        raise ValueError(f"batch API supports data_width of 8/16/32/64, got {data_width}")
+    kind = "i" if signed else "u"
+    return np.dtype(f"<{kind}{data_width // 8}")
+
+
+def quantize_array(values, data_width: int = 16, frac_width: int = 10, signed: bool = True):
+    """Quantize an ndarray of floats to saturated fixed-point integers (int64)."""
+    _np_dtype(data_width, signed)
+    scale = float(1 << frac_width)
+    raw = np.rint(np.asarray(values, dtype=np.float64) * scale)
+    lo, hi = _limits(data_width, signed)
+    return np.clip(raw, lo, hi).astype(np.int64)
+
+
+def pack_array(values, data_width: int = 16, frac_width: int = 10, signed: bool = True) -> bytes:
+    """Pack an (N, D) (or 1-D) float array into one little-endian fixed-point buffer.
+
+    Row i occupies bytes [i * D * step, (i + 1) * D * step), so the buffer can be
+    sliced into per-sample INFER payloads without re-quantizing.
+    """
+    dtype = _np_dtype(data_width, signed)
+    q = quantize_array(values, data_width=data_width, frac_width=frac_width, signed=signed)
+    return np.ascontiguousarray(q.astype(dtype)).tobytes()
+
+
+def unpack_ints_array(payload, data_width: int = 16, signed: bool = True, dim: int = 0):
+    """View little-endian fixed-point bytes as an integer ndarray (no copy).
+
+    If ``dim`` is set the result is reshaped to ``(-1, dim)``. The returned array
+    aliases ``payload`` and is read-only when ``payload`` is ``bytes``.
+    """
+    dtype = _np_dtype(data_width, signed)
+    if len(payload) % dtype.itemsize:
+        raise ValueError(f"payload length {len(payload)} is not a multiple of {dtype.itemsize}")
+    ints = np.frombuffer(payload, dtype=dtype)
+    if dim:
+        ints = ints.reshape(-1, dim)
+    return ints
+
+
+def unpack_values_array(
+    payload, data_width: int = 16, frac_width: int = 10, signed: bool = True, dim: int = 0
+):
+    """Unpack little-endian fixed-point bytes into a float64 ndarray."""
+    ints = unpack_ints_array(payload, data_width=data_width, signed=signed, dim=dim)
+    return ints / float(1 << frac_width)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Packet fixture files: one-byte-per-line hex and a compact binary container.
+
+The `.hex` format (one byte per line, uppercase) is what the VHDL
+testbenches read with textio, so it stays the format for single-packet
+fixtures such as sim/fixtures/nn_in.hex.
+
+For large request/expected-response sets, the `.nnfx` container stores raw
+frames back to back with an offset index and is opened with mmap, so a
+multi-megabyte set opens instantly and each packet is a zero-copy slice.
+
+Layout (little-endian, sections 8-byte aligned):
+  0   magic  b"NNFX"
+  4   u16    version (1)
+  6   u16    flags (bit 0: frames carry CRC)
+  8   u64    count
+  16  u64    offset of request index  (u64[count + 1])
+  24  u64    offset of response index (u64[count + 1])
+  32  u64    offset of request data
+  40  u64    offset of response data
+Index entry i is the start of frame i within its data section; entry
+count is the section length.
+
+Examples:
+  # pack hex fixtures into a container
+  python host/python/nnfpga/fixtures.py pack --req sim/fixtures/nn_in.hex \
+    --rsp sim/fixtures/nn_out.hex --out sim/fixtures/nn.nnfx
+  # export packet 3 back to hex for a testbench
+  python host/python/nnfpga/fixtures.py export sim/fixtures/nn.nnfx --index 3 \
+    --req-out sim/fixtures/nn_in.hex --rsp-out sim/fixtures/nn_out.hex
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+import sys
+
+import numpy as np
+
+PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+from nnfpga import proto
+
+MAGIC = b"NNFX"
+VERSION = 1
+FLAG_CRC = 0x1
+_HEADER = struct.Struct("<4sHHQQQQQ")
+
+
+def load_hex_bytes(path: str | Path) -> bytes:
+    """Read a one-byte-per-line hex fixture."""
+    data: List[int] = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data.append(int(line, 16) & 0xFF)
+    return bytes(data)
+
+
+def save_hex_bytes(path: str | Path, data: bytes) -> None:
+    """Write ``data`` as a one-byte-per-line hex fixture (testbench format)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("".join(f"{b:02X}\n" for b in data))
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _index(frames: Sequence[bytes]) -> np.ndarray:
+    idx = np.zeros(len(frames) + 1, dtype="<u8")
+    np.cumsum([len(f) for f in frames], out=idx[1:])
+    return idx
+
+
+def write_fixture(
+    path: str | Path, requests: Sequence[bytes], responses: Sequence[bytes], crc: bool = False
+) -> Path:
+    """Write matching request/expected-response frames to a `.nnfx` container."""
+    if len(requests) != len(responses):
+        raise ValueError(f"{len(requests)} requests but {len(responses)} responses")
+    count = len(requests)
+    req_idx = _index(requests)
+    rsp_idx = _index(responses)
+    req_idx_off = _align8(_HEADER.size)
+    rsp_idx_off = req_idx_off + req_idx.nbytes
+    req_off = rsp_idx_off + rsp_idx.nbytes
+    rsp_off = _align8(req_off + int(req_idx[-1]))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(
+            _HEADER.pack(MAGIC, VERSION, FLAG_CRC if crc else 0, count, req_idx_off, rsp_idx_off, req_off, rsp_off)
+        )
+        f.write(bytes(req_idx_off - _HEADER.size))
+        f.write(req_idx.tobytes())
+        f.write(rsp_idx.tobytes())
+        f.writelines(requests)
+        f.write(bytes(rsp_off - req_off - int(req_idx[-1])))
+        f.writelines(responses)
+    return path
+
+
+class FixtureSet:
+    """Read-only, memory-mapped view of a `.nnfx` container.
+
+    ``request(i)``/``response(i)`` return zero-copy memoryviews into the
+    mapping. ``close()`` unmaps the file only when none of them is alive;
+    otherwise the mapping stays until the last view is dropped. Take
+    ``bytes(view)`` for anything that must outlive the set.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, count, req_idx_off, rsp_idx_off, req_off, rsp_off = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"not an NNFX fixture: {self.path}")
+        if version != VERSION:
+            self._mm.close()
+            raise ValueError(f"unsupported NNFX version {version}")
+        self.crc = bool(flags & FLAG_CRC)
+        self._view = memoryview(self._mm)
+        self.req_index = np.frombuffer(self._mm, dtype="<u8", count=count + 1, offset=req_idx_off)
+        self.rsp_index = np.frombuffer(self._mm, dtype="<u8", count=count + 1, offset=rsp_idx_off)
+        self._req_off = req_off
+        self._rsp_off = rsp_off
+
+    def __len__(self) -> int:
+        return len(self.req_index) - 1
+
+    def __enter__(self) -> "FixtureSet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._view is None:
+            return
+        # Drop our own exports before unmapping.
+        self.req_index = self.rsp_index = None
+        self._view.release()
+        self._view = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Caller still holds request()/response() views; the mmap is
+            # unmapped when the last of them is released.
+            pass
+
+    def request(self, i: int) -> memoryview:
+        a, b = int(self.req_index[i]), int(self.req_index[i + 1])
+        return self._view[self._req_off + a : self._req_off + b]
+
+    def response(self, i: int) -> memoryview:
+        a, b = int(self.rsp_index[i]), int(self.rsp_index[i + 1])
+        return self._view[self._rsp_off + a : self._rsp_off + b]
+
+    def requests(self, start: int = 0, stop: int = -1) -> memoryview:
+        """Contiguous view over requests ``start`` .. ``stop - 1`` (to the end by default)."""
+        stop = len(self) if stop < 0 else stop
+        return self._view[self._req_off + int(self.req_index[start]) : self._req_off + int(self.req_index[stop])]
+
+    def pairs(self) -> Iterator[Tuple[memoryview, memoryview]]:
+        for i in range(len(self)):
+            yield self.request(i), self.response(i)
+
+
+def _split_frames(data: bytes, crc: bool) -> List[bytes]:
+    dec = proto.PacketDecoder(crc=crc)
+    frames = [proto.pack_packet(p.pkt_type, p.payload, crc=crc) for p in dec.feed(data)]
+    if dec.pending or dec.discarded or dec.errors:
+        raise ValueError("hex fixture does not contain a whole number of valid packets")
+    return frames
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_pack = sub.add_parser("pack", help="Pack hex fixtures (one or more packets each) into .nnfx")
+    p_pack.add_argument("--req", required=True, help="Request hex fixture")
+    p_pack.add_argument("--rsp", required=True, help="Expected response hex fixture")
+    p_pack.add_argument("--out", required=True, help="Output .nnfx path")
+    p_pack.add_argument("--crc", action="store_true", help="Frames carry CRC")
+    p_exp = sub.add_parser("export", help="Export one packet pair to hex for testbenches")
+    p_exp.add_argument("fixture", help=".nnfx path")
+    p_exp.add_argument("--index", type=int, default=0)
+    p_exp.add_argument("--req-out", default="sim/fixtures/nn_in.hex")
+    p_exp.add_argument("--rsp-out", default="sim/fixtures/nn_out.hex")
+    p_info = sub.add_parser("info", help="Print packet count and sizes")
+    p_info.add_argument("fixture", help=".nnfx path")
+    args = ap.parse_args()
+
+    if args.cmd == "pack":
+        reqs = _split_frames(load_hex_bytes(args.req), args.crc)
+        rsps = _split_frames(load_hex_bytes(args.rsp), args.crc)
+        out = write_fixture(args.out, reqs, rsps, crc=args.crc)
+        print(f"Wrote {len(reqs)} packet pairs to {out}")
+    elif args.cmd == "export":
+        with FixtureSet(args.fixture) as fx:
+            save_hex_bytes(args.req_out, bytes(fx.request(args.index)))
+            save_hex_bytes(args.rsp_out, bytes(fx.response(args.index)))
+        print(f"Wrote {args.req_out} and {args.rsp_out}")
+    else:
+        with FixtureSet(args.fixture) as fx:
+            print(f"{fx.path}: {len(fx)} pairs, crc={fx.crc}")
+            print(f"  request bytes : {int(fx.req_index[-1])}")
+            print(f"  response bytes: {int(fx.rsp_index[-1])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
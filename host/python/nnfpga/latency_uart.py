@@ -11,14 +11,27 @@ Workflow:
 Example:
   python host/python/nnfpga/latency_uart.py --port /dev/ttyUSB0 \
     --req sim/fixtures/nn_in.hex
+
+Benchmark mode (`--bench N`) repeats step 2/3 N times, chaining each STATUS
+snapshot to the next. Counter deltas are taken modulo 2**32, so a wrapping
+`cycles` counter does not corrupt results. It reports p50/p90/p99/max of
+cycles and wall-clock time per inference and throughput. The STATUS
+`stalls` counter is not reported: top_nexys_video ties perf_counters'
+stall_pulse to '0', so it always reads zero on this bitstream.
+The cycle deltas span everything between two STATUS snapshots, UART bytes
+included, so an estimate of the wire time is reported alongside. `--json`
+writes the report for tracking across bitstream builds:
+  python host/python/nnfpga/latency_uart.py --port /dev/ttyUSB0 \
+    --req sim/fixtures/nn_in.hex --bench 1000 --json latency.json
 """
 
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import json
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Sequence
 
 import sys
 
@@ -26,60 +39,102 @@ PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
 if str(PKG_ROOT) not in sys.path:
     sys.path.insert(0, str(PKG_ROOT))
 
-from nnfpga import proto
-
-
-@dataclass
-class Status:
-    build_id: int
-    cycles: int
-    stalls: int
-    infers: int
-    nn_data_w: int
-    nn_frac_w: int
-
-
-def _load_hex_bytes(path: Path) -> bytes:
-    data: List[int] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            data.append(int(line, 16) & 0xFF)
-    return bytes(data)
-
-
-def _read_exact(ser, n: int, timeout_s: float) -> bytes:
-    buf = bytearray()
-    while len(buf) < n:
-        chunk = ser.read(n - len(buf))
-        if not chunk:
-            raise TimeoutError(f"UART timeout while reading {n} bytes (got {len(buf)})")
-        buf.extend(chunk)
-    return bytes(buf)
-
-
-def _read_packet(ser, timeout_s: float, crc: bool) -> bytes:
-    hdr = _read_exact(ser, 6, timeout_s)
-    length = int.from_bytes(hdr[4:6], "big")
-    payload = _read_exact(ser, length, timeout_s)
-    tail = b""
-    if crc:
-        tail = _read_exact(ser, 2, timeout_s)
-    return hdr + payload + tail
-
-
-def _parse_status(payload: bytes) -> Status:
-    if len(payload) < 20:
-        raise ValueError(f"STATUS payload too short: {len(payload)} bytes")
-    build_id = int.from_bytes(payload[0:4], "little")
-    cycles = int.from_bytes(payload[4:8], "little")
-    stalls = int.from_bytes(payload[8:12], "little")
-    infers = int.from_bytes(payload[12:16], "little")
-    nn_data_w = int.from_bytes(payload[16:18], "little")
-    nn_frac_w = int.from_bytes(payload[18:20], "little")
-    return Status(build_id, cycles, stalls, infers, nn_data_w, nn_frac_w)
+from nnfpga import client, fixtures, perf_model
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (``q`` in 0..100) of a non-empty sequence."""
+    data = sorted(values)
+    pos = (len(data) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(data) - 1)
+    return data[lo] + (data[hi] - data[lo]) * (pos - lo)
+
+
+def _summary(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "mean": sum(values) / len(values),
+        "p50": _percentile(values, 50),
+        "p90": _percentile(values, 90),
+        "p99": _percentile(values, 99),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def _run_bench(dev: client.NNFpgaClient, infer_req: bytes, args: argparse.Namespace) -> Dict:
+    for _ in range(args.warmup):
+        dev.request(infer_req)
+
+    cycles: List[int] = []
+    wall_s: List[float] = []
+    total_infers = 0
+    prev = dev.status()
+    first = prev
+    start = time.perf_counter()
+    for _ in range(args.bench):
+        t0 = time.perf_counter()
+        dev.request(infer_req)
+        wall_s.append(time.perf_counter() - t0)
+        cur = dev.status()
+        d_infers = client.counter_delta(cur.infers, prev.infers)
+        if d_infers != 1:
+            raise RuntimeError(f"expected 1 new inference between snapshots, counted {d_infers}")
+        cycles.append(client.counter_delta(cur.cycles, prev.cycles))
+        total_infers += d_infers
+        prev = cur
+    elapsed = time.perf_counter() - start
+
+    # Wire time between two snapshots: STATUS_RSP, the INFER_REQ/INFER_RSP
+    # round trip, and the next STATUS_REQ header (the snapshot is taken when
+    # it is parsed).
+    tail = 2 if args.crc else 0
+    in_dim = (len(infer_req) - 6 - tail) // (first.nn_data_w // 8)
+    link = perf_model.Link(in_dim, data_width=first.nn_data_w, baud=args.baud, crc=bool(args.crc), clk_hz=client.CLK_HZ)
+    uart_cycles = perf_model.status_loop_cycles(link, perf_model.Core(latency=0, interval=0))
+    report = {
+        "build_id": f"0x{first.build_id:08X}",
+        "nn_data_w": first.nn_data_w,
+        "nn_frac_w": first.nn_frac_w,
+        "baud": args.baud,
+        "crc": bool(args.crc),
+        "inferences": total_infers,
+        "cycles_per_inference": _summary(cycles),
+        "uart_cycles_est": uart_cycles,
+        "non_uart_cycles_p50": _percentile(cycles, 50) - uart_cycles,
+        "wall_us_per_inference": _summary([w * 1e6 for w in wall_s]),
+        "throughput_infers_per_s": total_infers / elapsed if elapsed > 0 else 0.0,
+    }
+    if getattr(args, "csynth", ""):
+        core = perf_model.Core.from_report(json.loads(Path(args.csynth).read_text()))
+        report["model_check"] = perf_model.check(
+            _percentile(cycles, 50),
+            perf_model.status_loop_cycles(link, core),
+            tolerance=args.tolerance,
+            allowance=args.host_us * client.CLK_HZ / 1e6,
+        )
+    return report
+
+
+def _print_bench(report: Dict) -> None:
+    cyc = report["cycles_per_inference"]
+    wall = report["wall_us_per_inference"]
+    print(f"Inferences: {report['inferences']} (build_id {report['build_id']})")
+    print(
+        f"Cycles/inference: p50={cyc['p50']:.0f} p90={cyc['p90']:.0f} p99={cyc['p99']:.0f} max={cyc['max']:.0f}"
+    )
+    print(f"  of which UART wire time (est.): {report['uart_cycles_est']} cycles")
+    print(
+        f"Wall us/inference: p50={wall['p50']:.1f} p90={wall['p90']:.1f} p99={wall['p99']:.1f} max={wall['max']:.1f}"
+    )
+    print(f"Throughput: {report['throughput_infers_per_s']:.1f} inferences/s (incl. STATUS polling)")
+    check = report.get("model_check")
+    if check:
+        flag = "REGRESSION" if check["regressed"] else "ok"
+        print(
+            f"Model check: p50 {check['measured_cycles']:.0f} vs predicted {check['predicted_cycles']:.0f} cycles "
+            f"({check['unexplained_cycles']:+.0f} unexplained) -> {flag}"
+        )
 
 
 def main() -> int:
@@ -89,42 +144,35 @@ def main() -> int:
     ap.add_argument("--req", required=True, help="Hex file for INFER_REQ packet")
     ap.add_argument("--timeout", type=float, default=2.0, help="Read timeout in seconds")
     ap.add_argument("--crc", action="store_true", help="Expect CRC in packets")
+    ap.add_argument("--bench", type=int, default=0, help="Benchmark mode: run this many inferences")
+    ap.add_argument("--warmup", type=int, default=10, help="Unmeasured inferences before --bench")
+    ap.add_argument("--json", default="", help="Write the --bench report to this JSON file")
+    ap.add_argument("--csynth", default="", help="csynth report JSON; check --bench against perf_model.py")
+    ap.add_argument("--tolerance", type=float, default=0.1, help="Allowed excess over the model (fraction)")
+    ap.add_argument("--host-us", type=float, default=0.0, help="Host turnaround allowance per inference (us)")
     ap.add_argument("--verbose", action="store_true")
     args = ap.parse_args()
 
-    try:
-        import serial  # type: ignore
-    except Exception as exc:  # pragma: no cover - environment-dependent
-        raise RuntimeError("pyserial is required (pip install pyserial)") from exc
-
-    infer_req = _load_hex_bytes(Path(args.req))
-    status_req = proto.pack_packet(proto.STATUS_REQ, b"", crc=args.crc)
-
-    with serial.Serial(args.port, args.baud, timeout=args.timeout) as ser:
-        ser.reset_input_buffer()
-        ser.reset_output_buffer()
-
-        # STATUS before
-        ser.write(status_req)
-        ser.flush()
-        rsp_before = _read_packet(ser, args.timeout, args.crc)
-        pkt_before = proto.unpack_packet(rsp_before, crc=args.crc)
-        status_before = _parse_status(pkt_before.payload)
-
-        # INFER
-        ser.write(infer_req)
-        ser.flush()
-        _ = _read_packet(ser, args.timeout, args.crc)
-
-        # STATUS after
-        ser.write(status_req)
-        ser.flush()
-        rsp_after = _read_packet(ser, args.timeout, args.crc)
-        pkt_after = proto.unpack_packet(rsp_after, crc=args.crc)
-        status_after = _parse_status(pkt_after.payload)
-
-    delta_cycles = status_after.cycles - status_before.cycles
-    delta_infers = status_after.infers - status_before.infers
+    infer_req = fixtures.load_hex_bytes(args.req)
+
+    if args.bench > 0:
+        with client.NNFpgaClient(args.port, args.baud, args.timeout, crc=args.crc) as dev:
+            report = _run_bench(dev, infer_req, args)
+        _print_bench(report)
+        if args.json:
+            out = Path(args.json)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(report, indent=2, sort_keys=True))
+            print(f"Wrote {out}")
+        return 1 if report.get("model_check", {}).get("regressed") else 0
+
+    with client.NNFpgaClient(args.port, args.baud, args.timeout, crc=args.crc) as dev:
+        status_before = dev.status()
+        _ = dev.request(infer_req)
+        status_after = dev.status()
+
+    delta_cycles = client.counter_delta(status_after.cycles, status_before.cycles)
+    delta_infers = client.counter_delta(status_after.infers, status_before.infers)
     if delta_infers <= 0:
         print("No new inferences counted; cannot compute latency.")
         return 1
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Analytical latency/throughput model of the UART inference path.
+
+Splits end-to-end time into UART wire time and hls4ml core time from the
+packet format in `proto.py`, the input/output dims, data width, baud, CRC
+and the csynth latency/II. The timeline follows the RTL:
+
+- uart_rx/uart_tx are independent lines, each byte 10 bit times of
+  ``round(clk_hz / baud)`` cycles (G_CLKS_PER_BIT => 868 at 115200 baud).
+- pkt_rx accepts the header after 6 bytes and streams the payload straight
+  into the core, so row i starts once its last byte is in (and no sooner
+  than II after row i-1).
+- pkt_tx starts the response header when the request header is accepted,
+  then sends each output as the core produces it.
+
+Modes: ``single`` is one request in flight (send_uart.py, client.infer),
+``pipelined`` keeps ``window`` INFER_REQ frames in flight from the host
+(client.infer_many; pipeline.DEFAULT_WINDOW is an empirical host-side
+default, the board itself buffers no whole frames) and ``batched`` sends
+K rows per INFER_BATCH_REQ frame, also windowed. Host-side time (USB
+latency, Python) is not modelled; give it as an allowance when checking
+measurements.
+
+Measured STATUS counter deltas are compared against the prediction to
+flag regressions, e.g. a latency_uart.py --bench report:
+  python host/python/nnfpga/perf_model.py --in-dim 8 \
+    --csynth nn/outputs/calhouse/default/hls4ml/hls_report.json \
+    --measured latency.json --tolerance 0.05
+or raw counter deltas from a pipelined/batched run:
+  python host/python/nnfpga/perf_model.py --in-dim 8 --latency 24 --ii 1 \
+    --mode batched --batch 64 --cycles 912345678 --infers 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import sys
+
+PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+from nnfpga import client, pipeline, proto
+
+HEADER_BYTES = 6  # magic, version, type, length
+MODES = ("single", "pipelined", "batched")
+
+
+@dataclass(frozen=True)
+class Link:
+    """Packet and UART parameters of the board link."""
+
+    in_dim: int
+    out_dim: int = 1
+    data_width: int = 16
+    baud: int = 115200
+    crc: bool = False
+    clk_hz: int = client.CLK_HZ
+
+    @property
+    def clks_per_bit(self) -> int:
+        return round(self.clk_hz / self.baud)
+
+    @property
+    def byte_cycles(self) -> int:
+        return client.UART_BITS_PER_BYTE * self.clks_per_bit
+
+    @property
+    def tail(self) -> int:
+        return 2 if self.crc else 0
+
+    def request_bytes(self, batch: int = 1) -> int:
+        return HEADER_BYTES + batch * self.in_dim * (self.data_width // 8) + self.tail
+
+    def response_bytes(self, batch: int = 1) -> int:
+        return HEADER_BYTES + batch * self.out_dim * (self.data_width // 8) + self.tail
+
+
+@dataclass(frozen=True)
+class Core:
+    """csynth latency and initiation interval of the hls4ml core, in cycles."""
+
+    latency: int
+    interval: int = 1
+
+    @classmethod
+    def from_report(cls, report: Dict[str, Any]) -> "Core":
+        """From a csynth report dict (``CSynthesisReport`` keys, or the run_hls4ml JSON wrapping it)."""
+        r = report.get("CSynthesisReport", report)
+        return cls(latency=int(r["WorstLatency"]), interval=int(r.get("IntervalMax", 1)))
+
+
+@dataclass
+class Prediction:
+    mode: str
+    batch: int
+    window: int
+    latency_cycles: int  # first request byte to last response byte of one frame
+    uart_cycles: int  # the same with a zero-latency core
+    core_cycles: int  # core time not hidden behind the wire
+    cycles_per_inference: float  # steady-state period
+    bottleneck: str
+    clk_hz: int = client.CLK_HZ
+
+    @property
+    def latency_us(self) -> float:
+        return self.latency_cycles * 1e6 / self.clk_hz
+
+    @property
+    def throughput(self) -> float:
+        """Inferences per second in steady state."""
+        return self.clk_hz / self.cycles_per_inference
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d.update(latency_us=self.latency_us, throughput_infers_per_s=self.throughput)
+        return d
+
+
+def frame_cycles(link: Link, core: Core, batch: int = 1) -> int:
+    """Cycles from the first request byte to the last response byte of one frame."""
+    t = link.byte_cycles
+    row_bytes = link.in_dim * (link.data_width // 8)
+    out_cycles = link.out_dim * (link.data_width // 8) * t
+    tx_free = 2 * HEADER_BYTES * t  # response header follows request header acceptance
+    start = None
+    for i in range(batch):
+        arrive = (HEADER_BYTES + (i + 1) * row_bytes) * t
+        start = arrive if start is None else max(arrive, start + core.interval)
+        tx_free = max(tx_free, start + core.latency) + out_cycles
+    return tx_free + link.tail * t
+
+
+def predict(link: Link, core: Core, mode: str = "single", batch: int = 1, window: int = pipeline.DEFAULT_WINDOW) -> Prediction:
+    """Latency and steady-state throughput for one of MODES."""
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+    if mode != "batched":
+        batch = 1
+    if mode == "single":
+        window = 1
+    if not 1 <= batch <= proto.max_batch(link.in_dim, link.data_width):
+        raise ValueError(f"batch must be 1..{proto.max_batch(link.in_dim, link.data_width)}")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    latency = frame_cycles(link, core, batch)
+    uart = frame_cycles(link, Core(latency=0, interval=0), batch)
+    # Per-frame period: each line and the core work in parallel, and at most
+    # `window` frames overlap their round trips.
+    limits = {
+        "uart_rx": link.request_bytes(batch) * link.byte_cycles,
+        "uart_tx": link.response_bytes(batch) * link.byte_cycles,
+        "core": batch * core.interval,
+        "round_trip": latency / window,
+    }
+    bottleneck = max(limits, key=limits.get)
+    return Prediction(
+        mode=mode,
+        batch=batch,
+        window=window,
+        latency_cycles=latency,
+        uart_cycles=uart,
+        core_cycles=latency - uart,
+        cycles_per_inference=limits[bottleneck] / batch,
+        bottleneck=bottleneck,
+        clk_hz=link.clk_hz,
+    )
+
+
+def status_loop_cycles(link: Link, core: Core) -> int:
+    """Board-side cycles between two STATUS snapshots of the latency_uart.py bench loop.
+
+    STATUS_RSP goes out, the INFER_REQ/INFER_RSP round trip runs, and the
+    next STATUS_REQ header is parsed (the snapshot is latched there). The
+    two host turnarounds in between are not included.
+    """
+    status_rsp = (HEADER_BYTES + client.STATUS_LEN + link.tail) * link.byte_cycles
+    return status_rsp + frame_cycles(link, core) + HEADER_BYTES * link.byte_cycles
+
+
+def check(measured: float, predicted: float, tolerance: float = 0.1, allowance: float = 0.0) -> Dict[str, Any]:
+    """Flag ``measured`` cycles as a regression above ``predicted * (1 + tolerance) + allowance``."""
+    limit = predicted * (1.0 + tolerance) + allowance
+    return {
+        "measured_cycles": measured,
+        "predicted_cycles": predicted,
+        "unexplained_cycles": measured - predicted,
+        "ratio": measured / predicted if predicted else float("inf"),
+        "limit_cycles": limit,
+        "regressed": measured > limit,
+    }
+
+
+def measured_cycles(before: client.Status, after: client.Status) -> float:
+    """Cycles per inference between two STATUS snapshots."""
+    infers = client.counter_delta(after.infers, before.infers)
+    if infers <= 0:
+        raise ValueError("no inferences counted between the STATUS snapshots")
+    return client.counter_delta(after.cycles, before.cycles) / infers
+
+
+def _print_prediction(p: Prediction) -> None:
+    shape = f"batch={p.batch} window={p.window}" if p.mode != "single" else "1 in flight"
+    print(
+        f"{p.mode:<9} ({shape}): latency {p.latency_cycles} cycles = {p.latency_us:.1f} us "
+        f"(UART {p.uart_cycles}, core {p.core_cycles}); "
+        f"{p.cycles_per_inference:.0f} cycles/inference = {p.throughput:.1f} inferences/s, bound by {p.bottleneck}"
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in-dim", type=int, required=True, help="Features per inference (NN_IN_DIM)")
+    ap.add_argument("--out-dim", type=int, default=1, help="Outputs per inference")
+    ap.add_argument("--data-width", type=int, default=16, help="Fixed-point word width in bits")
+    ap.add_argument("--baud", type=int, default=115200, help="UART baud rate")
+    ap.add_argument("--clk-hz", type=int, default=client.CLK_HZ, help="Fabric clock")
+    ap.add_argument("--crc", action="store_true", help="Packets carry CRC-16")
+    ap.add_argument("--csynth", default="", help="csynth report JSON (run_hls4ml report.out_json)")
+    ap.add_argument("--latency", type=int, default=0, help="Core latency in cycles (instead of --csynth)")
+    ap.add_argument("--ii", type=int, default=1, help="Core initiation interval in cycles (with --latency)")
+    ap.add_argument("--batch", type=int, default=64, help="Rows per INFER_BATCH_REQ for batched mode")
+    ap.add_argument("--window", type=int, default=pipeline.DEFAULT_WINDOW, help="Frames in flight")
+    ap.add_argument("--measured", default="", help="latency_uart.py --bench JSON to check")
+    ap.add_argument("--cycles", type=int, default=0, help="Measured STATUS cycles delta to check")
+    ap.add_argument("--infers", type=int, default=0, help="Measured STATUS infers delta (with --cycles)")
+    ap.add_argument("--mode", choices=MODES, default="single", help="Mode the --cycles run used")
+    ap.add_argument("--tolerance", type=float, default=0.1, help="Allowed fractional excess over the prediction")
+    ap.add_argument("--host-us", type=float, default=0.0, help="Allowance for host time per measured interval")
+    ap.add_argument("--json", default="", help="Write predictions and checks to this JSON file")
+    args = ap.parse_args()
+
+    if args.csynth:
+        core = Core.from_report(json.loads(Path(args.csynth).read_text()))
+    elif args.latency > 0:
+        core = Core(latency=args.latency, interval=args.ii)
+    else:
+        ap.error("give --csynth or --latency")
+    link = Link(args.in_dim, args.out_dim, args.data_width, args.baud, args.crc, args.clk_hz)
+
+    print(f"Link: {link.baud} baud ({link.clks_per_bit} clks/bit, {link.byte_cycles} cycles/byte), crc={link.crc}")
+    print(f"Core: latency {core.latency} cycles, II {core.interval}")
+    preds = {m: predict(link, core, m, batch=args.batch, window=args.window) for m in MODES}
+    for p in preds.values():
+        _print_prediction(p)
+    out: Dict[str, Any] = {"link": asdict(link), "core": asdict(core), "predictions": {m: p.to_dict() for m, p in preds.items()}}
+
+    allowance = args.host_us * link.clk_hz / 1e6
+    checks: Dict[str, Any] = {}
+    if args.measured:
+        bench = json.loads(Path(args.measured).read_text())
+        checks["status_loop"] = check(
+            float(bench["cycles_per_inference"]["p50"]), status_loop_cycles(link, core), args.tolerance, allowance
+        )
+    if args.cycles:
+        if args.infers <= 0:
+            ap.error("--cycles needs --infers")
+        checks[args.mode] = check(args.cycles / args.infers, preds[args.mode].cycles_per_inference, args.tolerance, allowance)
+    for name, c in checks.items():
+        flag = "REGRESSION" if c["regressed"] else "ok"
+        print(
+            f"{name}: measured {c['measured_cycles']:.0f} vs predicted {c['predicted_cycles']:.0f} cycles "
+            f"({c['ratio']:.3f}x, {c['unexplained_cycles']:+.0f} unexplained) -> {flag}"
+        )
+    out["checks"] = checks
+
+    if args.json:
+        p = Path(args.json)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(out, indent=2, sort_keys=True))
+        print(f"Wrote {p}")
+    return 1 if any(c["regressed"] for c in checks.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Pipelined INFER client: keep a bounded window of requests in flight.
+
+The one-shot tools write a request, flush, and block on the response, so the
+UART sits idle while the host and the FPGA take turns. Here a writer thread
+streams requests while the caller's thread decodes responses, and a
+semaphore caps how many requests are outstanding so the board's receive
+path is never overrun.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from . import proto
+
+# Outstanding requests allowed by default. This is an empirical choice, not
+# derived from the RTL: the receive path has no frame buffer (uart_rx holds
+# one byte and stream_fifo is not instantiated in top_nexys_video), so queued
+# requests wait in the host/USB-UART buffers. 4 keeps the rx line busy across
+# host turnarounds while bounding how many frames a board reset can lose.
+DEFAULT_WINDOW = 4
+
+
+@dataclass
+class PipelineResult:
+    responses: List[proto.Packet] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    resync_bytes: int = 0
+    resync_frames: int = 0
+
+    @property
+    def inferences_per_s(self) -> float:
+        return len(self.responses) / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def run_pipelined(
+    ser,
+    requests: Sequence[bytes],
+    window: int = DEFAULT_WINDOW,
+    crc: bool = False,
+    decoder: Optional[proto.PacketDecoder] = None,
+) -> PipelineResult:
+    """Send ``requests`` with at most ``window`` in flight; return responses in order.
+
+    ``ser`` is any pyserial-like object with ``write``, ``read`` and
+    ``in_waiting``; its read timeout bounds how long we wait for each chunk.
+    The board answers strictly in order, so response i belongs to request i.
+    Pass ``decoder`` to keep framing state (and buffered bytes) across calls.
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    slots = threading.Semaphore(window)
+    stop = threading.Event()
+    writer_errors: List[BaseException] = []
+
+    def _writer() -> None:
+        try:
+            for req in requests:
+                while not slots.acquire(timeout=0.05):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                ser.write(req)
+        except BaseException as exc:  # surfaced on the reader side
+            writer_errors.append(exc)
+
+    if decoder is None:
+        decoder = proto.PacketDecoder(crc=crc)
+    errors0, discarded0 = decoder.errors, decoder.discarded
+    result = PipelineResult()
+    writer = threading.Thread(target=_writer, name="nnfpga-pipeline-writer", daemon=True)
+    start = time.perf_counter()
+    writer.start()
+    try:
+        while len(result.responses) < len(requests):
+            if writer_errors:
+                raise writer_errors[0]
+            chunk = ser.read(max(1, ser.in_waiting))
+            if not chunk:
+                raise TimeoutError(
+                    f"UART timeout with {len(result.responses)}/{len(requests)} responses received"
+                )
+            for pkt in decoder.feed(chunk):
+                result.responses.append(pkt)
+                slots.release()
+    finally:
+        stop.set()
+        writer.join()
+    result.elapsed_s = time.perf_counter() - start
+    result.resync_bytes = decoder.discarded - discarded0
+    result.resync_frames = decoder.errors - errors0
+    return result
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import List
+
+from . import fixedpoint
 
 MAGIC = 0xA55A
 VERSION = 0x01
@@ -11,10 +14,18 @@ STATUS_REQ = 0x01
 STATUS_RSP = 0x81
 INFER_REQ = 0x02
 INFER_RSP = 0x82
+# K feature vectors back to back in one frame; the response carries K outputs.
+INFER_BATCH_REQ = 0x03
+INFER_BATCH_RSP = 0x83
 
+# Largest payload of any frame (a 256-row INFER_BATCH at 8 x 16-bit inputs;
+# STATUS is 20 bytes). Well below what the 16-bit length field can carry, so
+# PacketDecoder rejects a corrupted length instead of waiting for up to 64 KiB.
+MAX_PAYLOAD = 4096
 
-def crc16_ccitt(data: bytes, init: int = 0xFFFF) -> int:
-    """CRC-16/CCITT-FALSE, MSB-first, poly 0x1021, no xorout."""
+
+def _crc16_bitwise(data: bytes, init: int = 0xFFFF) -> int:
+    """Bit-serial reference, mirrors the per-bit update in rtl/protocol/crc16.vhd."""
     crc = init & 0xFFFF
     for b in data:
         for i in range(8):
@@ -26,6 +37,48 @@ def crc16_ccitt(data: bytes, init: int = 0xFFFF) -> int:
     return crc & 0xFFFF
 
 
+def _make_crc16_table() -> tuple:
+    table = []
+    for b in range(256):
+        crc = b << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC16_TABLE = _make_crc16_table()
+
+
+def crc16_ccitt(data: bytes, init: int = 0xFFFF) -> int:
+    """CRC-16/CCITT-FALSE, MSB-first, poly 0x1021, no xorout (byte-table driven)."""
+    crc = init & 0xFFFF
+    table = _CRC16_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFF00) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+class Crc16:
+    """Incremental CRC-16/CCITT-FALSE, fed chunk by chunk as bytes arrive.
+
+    ``Crc16().update(a).update(b).value == crc16_ccitt(a + b)``.
+    """
+
+    __slots__ = ("_init", "value")
+
+    def __init__(self, init: int = 0xFFFF) -> None:
+        self._init = init & 0xFFFF
+        self.value = self._init
+
+    def update(self, data: bytes) -> "Crc16":
+        self.value = crc16_ccitt(data, init=self.value)
+        return self
+
+    def reset(self) -> None:
+        self.value = self._init
+
+
 @dataclass
 class Packet:
     pkt_type: int
@@ -42,6 +95,28 @@ def pack_packet(pkt_type: int, payload: bytes, crc: bool = False) -> bytes:
     return body
 
 
+def max_batch(in_dim: int, data_width: int = 16) -> int:
+    """Largest K whose INFER_BATCH_REQ payload fits MAX_PAYLOAD."""
+    return MAX_PAYLOAD // (in_dim * (data_width // 8))
+
+
+def pack_infer_batch(
+    rows, crc: bool = False, data_width: int = 16, frac_width: int = 10, signed: bool = True
+) -> bytes:
+    """Quantize a (K, D) float array into a single INFER_BATCH_REQ frame."""
+    payload = fixedpoint.pack_array(rows, data_width=data_width, frac_width=frac_width, signed=signed)
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"batch payload of {len(payload)} bytes exceeds {MAX_PAYLOAD}; split the batch")
+    return pack_packet(INFER_BATCH_REQ, payload, crc=crc)
+
+
+def unpack_infer_batch(pkt: Packet, data_width: int = 16, frac_width: int = 10, signed: bool = True):
+    """Return the K outputs of an INFER_BATCH_RSP (or INFER_RSP) as a float ndarray."""
+    if pkt.pkt_type not in (INFER_RSP, INFER_BATCH_RSP):
+        raise ValueError(f"not an inference response: 0x{pkt.pkt_type:02X}")
+    return fixedpoint.unpack_values_array(pkt.payload, data_width=data_width, frac_width=frac_width, signed=signed)
+
+
 def unpack_packet(data: bytes, crc: bool = False) -> Packet:
     if len(data) < 6:
         raise ValueError("packet too short")
@@ -61,3 +136,70 @@ def unpack_packet(data: bytes, crc: bool = False) -> Packet:
         if crc_rx != crc_calc:
             raise ValueError("crc mismatch")
     return Packet(pkt_type=pkt_type, payload=payload)
+
+
+_MAGIC_BYTES = MAGIC.to_bytes(2, "big")
+
+
+class PacketDecoder:
+    """Streaming packet decoder: feed arbitrary byte chunks, get whole Packets back.
+
+    Scans for MAGIC like pkt_rx, then validates VERSION, length and (optionally)
+    CRC. A frame that fails validation is rejected by skipping one byte and
+    rescanning, so the decoder resynchronizes after garbage or a torn frame
+    instead of staying misaligned.
+    """
+
+    def __init__(self, crc: bool = False, max_payload: int = MAX_PAYLOAD) -> None:
+        self.crc = crc
+        self.max_payload = max_payload
+        self.errors = 0  # frames rejected (bad version/length/crc)
+        self.discarded = 0  # bytes dropped while hunting for MAGIC
+        self._buf = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered but not yet part of a decoded packet."""
+        return len(self._buf)
+
+    def reset(self) -> None:
+        self._buf.clear()
+
+    def feed(self, data: bytes) -> List[Packet]:
+        """Buffer ``data`` and return every packet completed by it, in order."""
+        buf = self._buf
+        buf += data
+        n = len(buf)
+        tail = 2 if self.crc else 0
+        out: List[Packet] = []
+        pos = 0
+        while True:
+            idx = buf.find(_MAGIC_BYTES, pos)
+            if idx < 0:
+                # A trailing MAGIC[15:8] may be the first half of the next frame.
+                keep = n - 1 if n > pos and buf[-1] == _MAGIC_BYTES[0] else n
+                self.discarded += keep - pos
+                pos = keep
+                break
+            self.discarded += idx - pos
+            pos = idx
+            if n - pos < 6:
+                break
+            length = (buf[pos + 4] << 8) | buf[pos + 5]
+            if buf[pos + 2] != VERSION or length > self.max_payload:
+                self.errors += 1
+                pos += 1
+                continue
+            end = pos + 6 + length + tail
+            if n < end:
+                break
+            if self.crc:
+                crc_rx = (buf[end - 2] << 8) | buf[end - 1]
+                if crc_rx != crc16_ccitt(buf[pos + 2 : end - 2]):
+                    self.errors += 1
+                    pos += 1
+                    continue
+            out.append(Packet(pkt_type=buf[pos + 3], payload=bytes(buf[pos + 6 : pos + 6 + length])))
+            pos = end
+        del buf[:pos]
+        return out
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Shard a dataset across several boards with work stealing.
+
+The dataset is cut into fixed-size chunks. Each board pulls the next chunk
+when it finishes the last one, so fast boards take more of the work. When
+the queue is empty, an idle board re-runs the oldest chunk still in flight
+on another board and the first answer wins, so one slow board cannot hold
+up the tail. A board whose chunk fails has the chunk requeued for the
+other boards and leaves the rotation until ``resync()`` brings it back; it
+is retired when the resync fails or after `max_failures`. Predictions come
+back in the original row order.
+
+Example (two boards, test split saved as .npy):
+  python host/python/nnfpga/scheduler.py --ports /dev/ttyUSB0 /dev/ttyUSB1 \
+    --npy nn/outputs/calhouse/default/X_test.npy --out preds.npy
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence
+
+import sys
+
+import numpy as np
+
+PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+from nnfpga.aio import AsyncNNFpgaClient
+
+DEFAULT_CHUNK = 64  # samples per work item
+_TRANSPORT_ERRORS = (TimeoutError, ConnectionError, OSError)
+
+
+@dataclass
+class BoardStats:
+    name: str
+    samples: int = 0
+    chunks: int = 0
+    stolen: int = 0  # chunks this board finished first after duplicating another's
+    failures: int = 0
+    retired: bool = False
+    busy_s: float = 0.0
+
+
+@dataclass
+class ShardResult:
+    predictions: np.ndarray
+    boards: List[BoardStats] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def inferences_per_s(self) -> float:
+        return len(self.predictions) / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+async def infer_sharded(
+    clients: Sequence[AsyncNNFpgaClient],
+    X,
+    chunk: int = DEFAULT_CHUNK,
+    max_failures: int = 2,
+    names: Optional[Sequence[str]] = None,
+) -> ShardResult:
+    """Run every row of ``X`` on whichever board is free; return predictions in row order."""
+    if not clients:
+        raise ValueError("at least one client is required")
+    X = np.asarray(X)
+    X = X.reshape(X.shape[0], -1)
+    n = X.shape[0]
+    spans = [(s, min(s + chunk, n)) for s in range(0, n, chunk)]
+    out = np.zeros(n, dtype=np.float64)
+    stats = [BoardStats(name=names[i] if names else f"board{i}") for i in range(len(clients))]
+
+    todo: Deque[int] = deque(range(len(spans)))
+    done = [False] * len(spans)
+    running: Dict[int, int] = {}  # chunk id -> boards currently working on it
+    remaining = len(spans)
+    finished = asyncio.Event()
+    progress = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def _notify() -> None:
+        nonlocal progress
+        progress.set()
+        progress = asyncio.Event()
+
+    def _next_chunk() -> Optional[int]:
+        if todo:
+            return todo.popleft()
+        # Steal: duplicate the oldest chunk that only one board is working on.
+        for cid in sorted(running):
+            if running[cid] == 1 and not done[cid]:
+                return cid
+        return None
+
+    async def _worker(idx: int, client: AsyncNNFpgaClient) -> None:
+        nonlocal remaining
+        st = stats[idx]
+        while not finished.is_set():
+            cid = _next_chunk()
+            if cid is None:
+                if not running:
+                    return
+                await progress.wait()
+                continue
+            duplicate = running.get(cid, 0) > 0
+            running[cid] = running.get(cid, 0) + 1
+            s, e = spans[cid]
+            t0 = loop.time()
+            try:
+                y = await client.infer_many(X[s:e])
+            except _TRANSPORT_ERRORS:
+                st.failures += 1
+                running[cid] -= 1
+                if not running[cid]:
+                    del running[cid]
+                    if not done[cid]:
+                        todo.appendleft(cid)
+                _notify()
+                if st.failures >= max_failures:
+                    st.retired = True
+                    return
+                # Out of rotation until the link is back in step; a board
+                # that cannot answer STATUS is retired at once.
+                try:
+                    await client.resync()
+                except _TRANSPORT_ERRORS:
+                    st.retired = True
+                    return
+                continue
+            finally:
+                st.busy_s += loop.time() - t0
+            running[cid] -= 1
+            if not running[cid]:
+                del running[cid]
+            if not done[cid]:
+                done[cid] = True
+                out[s:e] = y
+                remaining -= 1
+                st.samples += e - s
+                st.chunks += 1
+                st.stolen += int(duplicate)
+                if remaining == 0:
+                    finished.set()
+            _notify()
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(_worker(i, c)) for i, c in enumerate(clients)]
+    waiter = asyncio.create_task(finished.wait())
+    try:
+        while not finished.is_set():
+            await asyncio.wait([waiter, *tasks], return_when=asyncio.FIRST_COMPLETED)
+            for t in tasks:
+                if t.done() and not t.cancelled() and t.exception() is not None:
+                    raise t.exception()
+            if not finished.is_set() and all(t.done() for t in tasks):
+                raise RuntimeError(f"all boards failed or retired with {remaining}/{len(spans)} chunks left")
+    finally:
+        # Boards still working on a duplicated chunk are abandoned; their late
+        # responses are absorbed by the client's pending queue.
+        for t in (waiter, *tasks):
+            t.cancel()
+        await asyncio.gather(waiter, *tasks, return_exceptions=True)
+    return ShardResult(predictions=out, boards=stats, elapsed_s=time.perf_counter() - start)
+
+
+async def _open(port: str, baud: int, **kwargs) -> AsyncNNFpgaClient:
+    if port.startswith("socket://"):
+        host, _, tcp_port = port[len("socket://") :].rpartition(":")
+        return await AsyncNNFpgaClient.open_tcp(host, int(tcp_port), **kwargs)
+    return await AsyncNNFpgaClient.open_serial(port, baud, **kwargs)
+
+
+def run_sharded(
+    ports: Sequence[str],
+    X,
+    baud: int = 115200,
+    chunk: int = DEFAULT_CHUNK,
+    max_failures: int = 2,
+    **client_kwargs,
+) -> ShardResult:
+    """Open every port (device path or ``socket://host:port``) and shard ``X`` across them."""
+
+    async def _main() -> ShardResult:
+        clients = [await _open(p, baud, **client_kwargs) for p in ports]
+        try:
+            return await infer_sharded(clients, X, chunk=chunk, max_failures=max_failures, names=list(ports))
+        finally:
+            for c in clients:
+                c.close()
+
+    return asyncio.run(_main())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ports", nargs="+", required=True, help="UART devices or socket://host:port URLs")
+    ap.add_argument("--npy", required=True, help="(N, in_dim) float array, e.g. a saved X_test")
+    ap.add_argument("--out", default="", help="Write predictions (.npy) here")
+    ap.add_argument("--baud", type=int, default=115200, help="UART baud rate")
+    ap.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Samples per work item")
+    ap.add_argument("--window", type=int, default=4, help="Requests in flight per board")
+    ap.add_argument("--timeout", type=float, default=2.0, help="Per-request timeout in seconds")
+    ap.add_argument("--max-failures", type=int, default=2, help="Retire a board after this many failed chunks")
+    ap.add_argument("--crc", action="store_true", help="Expect CRC in packets")
+    args = ap.parse_args()
+
+    X = np.load(args.npy)
+    result = run_sharded(
+        args.ports,
+        X,
+        baud=args.baud,
+        chunk=args.chunk,
+        max_failures=args.max_failures,
+        in_dim=X.shape[1],
+        window=args.window,
+        timeout=args.timeout,
+        crc=args.crc,
+    )
+    for b in result.boards:
+        state = " (retired)" if b.retired else ""
+        print(f"{b.name}: {b.samples} samples in {b.chunks} chunks, {b.stolen} stolen, {b.failures} failures{state}")
+    print(f"Total: {len(result.predictions)} inferences in {result.elapsed_s:.3f} s")
+    print(f"Throughput: {result.inferences_per_s:.1f} inferences/s")
+    if args.out:
+        np.save(args.out, result.predictions)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
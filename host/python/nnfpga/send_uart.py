@@ -16,6 +16,17 @@ expected hex fixture. This is the hardware validation step for Milestone 9:
    python host/python/nnfpga/send_uart.py --port /dev/ttyUSB0 \
      --req sim/fixtures/nn_in.hex --expect sim/fixtures/nn_out.hex
 
+To measure sustained throughput, repeat the request with several packets in
+flight (see nnfpga/pipeline.py):
+   python host/python/nnfpga/send_uart.py --port /dev/ttyUSB0 \
+     --req sim/fixtures/nn_in.hex --expect sim/fixtures/nn_out.hex \
+     --count 1000 --window 4
+
+To replay a whole fixture set (see nnfpga/fixtures.py), every request is
+pipelined and each response is checked against its own expected frame:
+   python host/python/nnfpga/send_uart.py --port /dev/ttyUSB0 \
+     --fixture sim/fixtures/nn_test.nnfx
+
 If the response matches the expected bytes, we have verified that the
 hardware UART path and the integrated hls4ml core are producing the
 same results as the golden PyTorch model.
@@ -25,55 +36,56 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import List
-
 import sys
 
 PKG_ROOT = Path(__file__).resolve().parents[1]  # host/python
 if str(PKG_ROOT) not in sys.path:
     sys.path.insert(0, str(PKG_ROOT))
 
-from nnfpga import proto
-
-
-def _load_hex_bytes(path: Path) -> bytes:
-    data: List[int] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            data.append(int(line, 16) & 0xFF)
-    return bytes(data)
+from nnfpga import client, fixtures, pipeline, proto
 
 
-def _save_hex_bytes(path: Path, data: bytes) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for b in data:
-            f.write(f"{b:02X}\n")
+def _run_pipelined(dev: client.NNFpgaClient, args: argparse.Namespace, req_data: bytes, expect_data: bytes) -> int:
+    result = dev.request_many([req_data] * args.count, window=args.window)
 
+    last = result.responses[-1]
+    fixtures.save_hex_bytes(Path(args.out), proto.pack_packet(last.pkt_type, last.payload, crc=args.crc))
+    print(f"Wrote last response to {args.out}")
+    print(f"Responses: {len(result.responses)} in {result.elapsed_s:.3f} s (window={args.window})")
+    print(f"Throughput: {result.inferences_per_s:.1f} inferences/s")
+    if args.verbose and (result.resync_bytes or result.resync_frames):
+        print(f"Resynchronized: dropped {result.resync_bytes} bytes, rejected {result.resync_frames} frames")
 
-def _read_exact(ser, n: int, timeout_s: float) -> bytes:
-    buf = bytearray()
-    while len(buf) < n:
-        chunk = ser.read(n - len(buf))
-        if not chunk:
-            # pyserial returns b'' on timeout
-            raise TimeoutError(f"UART timeout while reading {n} bytes (got {len(buf)})")
-        buf.extend(chunk)
-    return bytes(buf)
+    if expect_data:
+        mismatches = sum(
+            1 for pkt in result.responses if proto.pack_packet(pkt.pkt_type, pkt.payload, crc=args.crc) != expect_data
+        )
+        if mismatches:
+            print(f"Mismatch: {mismatches}/{len(result.responses)} responses differ from expected bytes")
+            return 1
+        print("Match: all responses equal expected bytes")
+    return 0
 
 
-def _read_packet(ser, timeout_s: float, crc: bool) -> bytes:
-    # Header is 6 bytes: magic(2) + version + type + length(2)
-    hdr = _read_exact(ser, 6, timeout_s)
-    length = int.from_bytes(hdr[4:6], "big")
-    payload = _read_exact(ser, length, timeout_s)
-    tail = b""
-    if crc:
-        tail = _read_exact(ser, 2, timeout_s)
-    return hdr + payload + tail
+def _run_fixture(dev: client.NNFpgaClient, args: argparse.Namespace) -> int:
+    with fixtures.FixtureSet(args.fixture) as fx:
+        if fx.crc != args.crc:
+            raise ValueError(f"{args.fixture} was written with crc={fx.crc}; pass --crc to match")
+        if args.verbose:
+            print(f"Loaded {len(fx)} packet pairs from {args.fixture}")
+        result = dev.request_many([fx.request(i) for i in range(len(fx))], window=args.window)
+        mismatched = [
+            i
+            for i, pkt in enumerate(result.responses)
+            if proto.pack_packet(pkt.pkt_type, pkt.payload, crc=args.crc) != fx.response(i)
+        ]
+    print(f"Responses: {len(result.responses)} in {result.elapsed_s:.3f} s (window={args.window})")
+    print(f"Throughput: {result.inferences_per_s:.1f} packets/s")
+    if mismatched:
+        print(f"Mismatch: {len(mismatched)}/{len(result.responses)} responses differ (first at index {mismatched[0]})")
+        return 1
+    print("Match: all responses equal expected bytes")
+    return 0
 
 
 def main() -> int:
@@ -82,17 +94,21 @@ def main() -> int:
     ap.add_argument("--baud", type=int, default=115200, help="UART baud rate")
     ap.add_argument("--req", default="", help="Hex file for request packet (one byte per line)")
     ap.add_argument("--status", action="store_true", help="Send STATUS_REQ instead of file payload")
+    ap.add_argument("--fixture", default="", help="Replay every request in a .nnfx fixture set")
     ap.add_argument("--expect", default="", help="Optional hex file for expected response packet")
     ap.add_argument("--out", default="sim/fixtures/uart_last_rsp.hex", help="Save response hex here")
     ap.add_argument("--timeout", type=float, default=2.0, help="Read timeout in seconds")
     ap.add_argument("--crc", action="store_true", help="Expect CRC in packets")
+    ap.add_argument("--count", type=int, default=1, help="Send the request this many times (pipelined if > 1)")
+    ap.add_argument(
+        "--window", type=int, default=pipeline.DEFAULT_WINDOW, help="Max requests in flight when --count > 1"
+    )
     ap.add_argument("--verbose", action="store_true")
     args = ap.parse_args()
 
-    try:
-        import serial  # type: ignore
-    except Exception as exc:  # pragma: no cover - environment-dependent
-        raise RuntimeError("pyserial is required (pip install pyserial)") from exc
+    if args.fixture:
+        with client.NNFpgaClient(args.port, args.baud, args.timeout, crc=args.crc) as dev:
+            return _run_fixture(dev, args)
 
     if args.status:
         req_data = proto.pack_packet(proto.STATUS_REQ, b"", crc=args.crc)
@@ -100,29 +116,30 @@ def main() -> int:
             print("Using STATUS_REQ packet")
     else:
         if not args.req:
-            raise ValueError("--req is required unless --status is set")
+            raise ValueError("--req is required unless --status or --fixture is set")
         req_path = Path(args.req)
-        req_data = _load_hex_bytes(req_path)
+        req_data = fixtures.load_hex_bytes(req_path)
         if args.verbose:
             print(f"Loaded {len(req_data)} request bytes from {req_path}")
 
     expect_data = b""
     expect_path = Path(args.expect) if args.expect else None
     if expect_path and expect_path.exists():
-        expect_data = _load_hex_bytes(expect_path)
+        expect_data = fixtures.load_hex_bytes(expect_path)
         if args.verbose:
             print(f"Loaded {len(expect_data)} expected bytes from {expect_path}")
 
-    with serial.Serial(args.port, args.baud, timeout=args.timeout) as ser:
-        ser.reset_input_buffer()
-        ser.reset_output_buffer()
-        ser.write(req_data)
-        ser.flush()
+    with client.NNFpgaClient(args.port, args.baud, args.timeout, crc=args.crc) as dev:
+        if args.count > 1:
+            return _run_pipelined(dev, args, req_data, expect_data)
+        rsp_pkt = dev.request(req_data)
+        if args.verbose and (dev.decoder.discarded or dev.decoder.errors):
+            print(f"Resynchronized: dropped {dev.decoder.discarded} bytes, rejected {dev.decoder.errors} frames")
 
-        rsp_data = _read_packet(ser, args.timeout, args.crc)
+    rsp_data = proto.pack_packet(rsp_pkt.pkt_type, rsp_pkt.payload, crc=args.crc)
 
     out_path = Path(args.out)
-    _save_hex_bytes(out_path, rsp_data)
+    fixtures.save_hex_bytes(out_path, rsp_data)
     print(f"Wrote response to {out_path}")
 
     # Basic sanity check
@@ -130,20 +147,15 @@ def main() -> int:
         pkt = proto.unpack_packet(rsp_data, crc=args.crc)
         if args.verbose:
             print(f"Response type: 0x{pkt.pkt_type:02X}, payload length: {len(pkt.payload)}")
-        if pkt.pkt_type == proto.STATUS_RSP and len(pkt.payload) >= 20:
-            build_id = int.from_bytes(pkt.payload[0:4], "little")
-            cycles = int.from_bytes(pkt.payload[4:8], "little")
-            stalls = int.from_bytes(pkt.payload[8:12], "little")
-            infers = int.from_bytes(pkt.payload[12:16], "little")
-            nn_data_w = int.from_bytes(pkt.payload[16:18], "little")
-            nn_frac_w = int.from_bytes(pkt.payload[18:20], "little")
+        if pkt.pkt_type == proto.STATUS_RSP and len(pkt.payload) >= client.STATUS_LEN:
+            st = client.parse_status(pkt.payload)
             print("STATUS:")
-            print(f"  build_id : 0x{build_id:08X}")
-            print(f"  cycles   : {cycles}")
-            print(f"  stalls   : {stalls}")
-            print(f"  infers   : {infers}")
-            print(f"  nn_width : {nn_data_w}")
-            print(f"  nn_frac  : {nn_frac_w}")
+            print(f"  build_id : 0x{st.build_id:08X}")
+            print(f"  cycles   : {st.cycles}")
+            print(f"  stalls   : {st.stalls}")
+            print(f"  infers   : {st.infers}")
+            print(f"  nn_width : {st.nn_data_w}")
+            print(f"  nn_frac  : {st.nn_frac_w}")
     except Exception as exc:
         print(f"Warning: response packet parse failed: {exc}")
 
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import threading
+
+import numpy as np
+
+from nnfpga import aio, emulator, proto
+
+
+def _start_emulator(**kwargs):
+    emu = emulator.DeviceEmulator(**kwargs)
+    master, slave, _ = emulator.open_pty()
+    stop = threading.Event()
+    t = threading.Thread(target=emu.serve_fd, args=(master, stop), daemon=True)
+    t.start()
+
+    def _stop():
+        stop.set()
+        t.join()
+        os.close(master)
+        os.close(slave)
+
+    return emu, slave, _stop
+
+
+def test_async_multiplex_two_boards():
+    boards = [_start_emulator(in_dim=8, build_id=i + 1) for i in range(2)]
+    x = np.random.default_rng(3).uniform(-2, 2, size=(40, 8))
+
+    async def _main():
+        clients = [aio.AsyncNNFpgaClient(slave, window=4) for _, slave, _ in boards]
+        try:
+            st = await asyncio.gather(*(c.status() for c in clients))
+            ys = await asyncio.gather(clients[0].infer_many(x[:20]), clients[1].infer_many(x[20:]))
+            single = await clients[0].infer(x[0])
+            return st, ys, single
+        finally:
+            for c in clients:
+                c.close()
+
+    try:
+        st, ys, single = asyncio.run(_main())
+    finally:
+        for _, _, stop in boards:
+            stop()
+    assert [s.build_id for s in st] == [1, 2]
+    expected = np.round(x[:, 0] * 1024) / 1024
+    assert np.array_equal(np.concatenate(ys), expected)
+    assert single == expected[0]
+    assert boards[0][0].infers == 21 and boards[1][0].infers == 20
+
+
+def test_async_timeout():
+    master, slave, _ = emulator.open_pty()
+
+    async def _main():
+        c = aio.AsyncNNFpgaClient(slave, timeout=0.05)
+        try:
+            await c.status()
+        finally:
+            c.close()
+
+    try:
+        asyncio.run(_main())
+        assert False, "expected timeout"
+    except TimeoutError:
+        pass
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_async_lost_response_desyncs_until_resync():
+    emu, slave, stop = _start_emulator(in_dim=8)
+    handle, seen = emu.handle, []
+
+    def _drop_third_infer(data, now=None):
+        # Lose the third INFER_RSP on the wire, as a dropped UART frame would.
+        out = bytearray()
+        for pkt in proto.PacketDecoder().feed(handle(data, now)):
+            if pkt.pkt_type == proto.INFER_RSP:
+                seen.append(pkt)
+                if len(seen) == 3:
+                    continue
+            out += proto.pack_packet(pkt.pkt_type, pkt.payload)
+        return bytes(out)
+
+    emu.handle = _drop_third_infer
+    x = np.random.default_rng(5).uniform(-2, 2, size=(8, 8))
+
+    async def _main():
+        c = aio.AsyncNNFpgaClient(slave, window=4, timeout=0.3)
+        try:
+            try:
+                await c.infer_many(x)
+                assert False, "expected timeout"
+            except TimeoutError:
+                pass
+            assert c.desynchronized
+            try:
+                await c.infer(x[0])
+                assert False, "expected DesyncError"
+            except aio.DesyncError:
+                pass
+            await c.resync()
+            assert not c.desynchronized
+            return await c.infer_many(x)
+        finally:
+            c.close()
+
+    try:
+        y = asyncio.run(_main())
+    finally:
+        stop()
+    assert np.array_equal(y, np.round(x[:, 0] * 1024) / 1024)
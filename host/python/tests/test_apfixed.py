@@ -0,0 +1,156 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from nnfpga import apfixed
+from nnfpga.apfixed import FixedType
+
+
+def _ref_cast(v: Fraction, t: FixedType) -> Fraction:
+    """Scalar ap_fixed cast on exact rationals (independent of the vectorized code)."""
+    s = v * (1 << t.frac)
+    fl, frac = math.floor(s), s - math.floor(s)
+    r = {
+        "AP_TRN": fl,
+        "AP_TRN_ZERO": int(s),
+        "AP_RND": math.floor(s + Fraction(1, 2)),
+        "AP_RND_CONV": round(s),
+        "AP_RND_MIN_INF": math.ceil(s - Fraction(1, 2)),
+    }.get(t.rounding)
+    if r is None:
+        away = fl + 1 if frac >= Fraction(1, 2) else fl
+        toward = fl + 1 if frac > Fraction(1, 2) else fl
+        if s < 0:
+            away, toward = toward, away
+        r = away if t.rounding == "AP_RND_INF" else toward
+    lo, hi = t.limits
+    if t.overflow == "AP_WRAP":
+        r = (r - lo) % (1 << t.width) + lo
+    elif t.overflow == "AP_SAT_ZERO":
+        r = 0 if r < lo or r > hi else r
+    else:
+        lo = -hi if t.overflow == "AP_SAT_SYM" and t.signed else lo
+        r = min(max(r, lo), hi)
+    return Fraction(r, 1 << t.frac)
+
+
+def _ref_weight(v: float, t: FixedType) -> Fraction:
+    """hls4ml weight export: decimal text with one digit per fractional bit, then the cast."""
+    return _ref_cast(Fraction(f"{float(v):.{max(0, t.frac)}f}"), t)
+
+
+def _ref_mlp(layers, x, t: FixedType, accum: FixedType):
+    h = [_ref_cast(Fraction(float(v)), t) for v in x]
+    for n, (w, b) in enumerate(layers):
+        out = []
+        for i in range(w.shape[0]):
+            acc = _ref_cast(_ref_weight(b[i], t), accum)
+            for j in range(w.shape[1]):
+                acc = _ref_cast(acc + _ref_cast(h[j] * _ref_weight(w[i, j], t), accum), accum)
+            out.append(_ref_cast(acc, t))
+        h = [max(v, Fraction(0)) for v in out] if n < len(layers) - 1 else out
+    return float(h[0])
+
+
+def _layers(rng, dims=(8, 6, 1), scale=0.6):
+    return [
+        (rng.normal(scale=scale, size=(dims[i + 1], dims[i])), rng.normal(scale=0.2, size=dims[i + 1]))
+        for i in range(len(dims) - 1)
+    ]
+
+
+def test_parse_types():
+    t = FixedType.parse("ap_fixed<16,6>")
+    assert (t.width, t.integer, t.frac, t.signed, t.rounding, t.overflow) == (16, 6, 10, True, "AP_TRN", "AP_WRAP")
+    u = FixedType.parse("ap_ufixed<8, 0, AP_RND_CONV, AP_SAT>")
+    assert (u.signed, u.frac, u.rounding, u.overflow) == (False, 8, "AP_RND_CONV", "AP_SAT")
+    assert FixedType.parse("fixed<12,4,RND,SAT>").rounding == "AP_RND"
+    assert str(FixedType.parse("ap_fixed<16,6>")) == "ap_fixed<16,6>"
+    with pytest.raises(ValueError):
+        FixedType.parse("float")
+
+
+@pytest.mark.parametrize("rounding", ["AP_TRN", "AP_TRN_ZERO", "AP_RND", "AP_RND_ZERO", "AP_RND_INF", "AP_RND_MIN_INF", "AP_RND_CONV"])
+@pytest.mark.parametrize("overflow", ["AP_WRAP", "AP_SAT", "AP_SAT_SYM", "AP_SAT_ZERO"])
+def test_casts_match_scalar_reference(rounding, overflow):
+    t = FixedType(8, 3, True, rounding, overflow)
+    raw = np.arange(-4000, 4000, 7, dtype=np.int64)  # 8 fractional bits in, ties included
+    got = t.cast(raw, 8)
+    want = [_ref_cast(Fraction(int(v), 256), t) * (1 << t.frac) for v in raw]
+    assert got.tolist() == [int(v) for v in want]
+    vals = raw / 256.0
+    assert t.from_float(vals).tolist() == [int(v) for v in want]
+
+
+@pytest.mark.parametrize(
+    "precision,accum",
+    [("ap_fixed<16,6>", None), ("ap_fixed<10,3>", None), ("ap_fixed<10,3>", "ap_fixed<12,4,AP_RND,AP_SAT>")],
+)
+def test_mlp_matches_scalar_reference(precision, accum):
+    rng = np.random.default_rng(3)
+    layers = _layers(rng)
+    overrides = {"0": {"accum": accum}, "2": {"accum": accum}} if accum else {}
+    mlp = apfixed.ApFixedMLP(layers, precision=precision, layer_precision=overrides)
+    x = rng.normal(scale=2.0, size=(24, 8))
+    t = FixedType.parse(precision)
+    acc_t = FixedType.parse(accum) if accum else t
+    want = [_ref_mlp(layers, row, t, acc_t) for row in x]
+    assert mlp(x).tolist() == want
+
+
+def test_weights_cast_through_decimal_text():
+    t = FixedType.parse("ap_fixed<10,4>")
+    below = np.nextafter(np.float32(3 / 64), np.float32(0))  # prints as 0.046875
+    assert t.from_float(below).item() == 2
+    assert t.from_decimal_text(below).item() == 3
+    assert t.from_decimal_text([-below, 3 / 64 + 1e-9]).tolist() == [-3, 3]
+    mlp = apfixed.ApFixedMLP([(np.array([[below]]), np.zeros(1))], precision="ap_fixed<10,4>")
+    assert mlp.layers[0][0].item() == 3
+
+
+def test_bit_exact_accumulator_and_config():
+    rng = np.random.default_rng(4)
+    layers = _layers(rng, dims=(8, 16, 1), scale=0.3)
+    cfg = {"hls4ml": {"precision": "ap_fixed<16,6>", "bit_exact": "True", "layer_precision": {}}}
+    exact = apfixed.ApFixedMLP.from_config(layers, cfg)
+    plain = apfixed.ApFixedMLP.from_config(layers, {"precision": "ap_fixed<16,6>", "bit_exact": "None"})
+    x = rng.normal(size=(200, 8))
+    ref = np.maximum(x @ layers[0][0].T + layers[0][1], 0) @ layers[1][0].T + layers[1][1]
+    lsb = 2.0**-10
+    # Lossless accumulation only loses the final truncation per layer
+    assert np.max(np.abs(exact(x) - ref[:, 0])) < np.max(np.abs(plain(x) - ref[:, 0])) + lsb
+    assert np.all(np.abs(exact(x) - ref[:, 0]) < 0.05)
+    assert exact.forward_ints(exact.input_type.from_float(x)).dtype == np.int64
+
+
+@pytest.mark.parametrize("precision", ["ap_fixed<16,6>", "ap_fixed<10,4>"])
+def test_apfixed_matches_hls4ml(tmp_path, precision):
+    """Compare against compiled hls4ml, including its decimal-text weight export."""
+    torch = pytest.importorskip("torch")
+    hls4ml = pytest.importorskip("hls4ml")
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(8, 16), torch.nn.ReLU(), torch.nn.Linear(16, 1)).eval()
+    frac = FixedType.parse(precision).frac
+    with torch.no_grad():
+        # Weights one float32 ulp below an LSB boundary print as the boundary itself
+        for lin in (model[0], model[2]):
+            w = lin.weight.view(-1)
+            grid = torch.round(w[::3] * 2**frac) / 2**frac
+            w[::3] = torch.nextafter(grid, torch.zeros_like(grid))
+    config = hls4ml.utils.config_from_pytorch_model(
+        model, input_shape=(8,), granularity="model", backend="Vitis", default_precision=precision
+    )
+    hls_model = hls4ml.converters.convert_from_pytorch_model(
+        model, hls_config=config, output_dir=str(tmp_path / "prj"), backend="Vitis", io_type="io_parallel"
+    )
+    hls_model.compile()
+
+    t = FixedType.parse(precision)
+    x = t.to_float(t.from_float(np.random.default_rng(0).uniform(-4, 4, size=(500, 8))))
+    y_hls = np.asarray(hls_model.predict(np.ascontiguousarray(x, dtype=np.float32))).reshape(-1)
+    state = {k: v.detach().numpy() for k, v in model.state_dict().items()}
+    layers, index = apfixed.layers_from_state_dict(state)
+    y = apfixed.ApFixedMLP(layers, precision=precision, layer_index=index)(x)
+    assert np.array_equal(y, y_hls)
@@ -0,0 +1,98 @@
+import threading
+
+import numpy as np
+
+from nnfpga import client, emulator, proto
+
+
+class _EmulatorPort:
+    """Serial-like object backed by an in-process DeviceEmulator."""
+
+    def __init__(self, emu: emulator.DeviceEmulator, timeout: float = 1.0) -> None:
+        self.emu = emu
+        self.timeout = timeout
+        self.writes = 0
+        self._rx = bytearray()
+        self._cv = threading.Condition()
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cv:
+            return len(self._rx)
+
+    def write(self, data: bytes) -> int:
+        with self._cv:
+            self.writes += 1
+            self._rx += self.emu.handle(data)
+            self._cv.notify_all()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def read(self, n: int) -> bytes:
+        with self._cv:
+            self._cv.wait_for(lambda: self._rx, timeout=self.timeout)
+            out = bytes(self._rx[:n])
+            del self._rx[:n]
+            return out
+
+
+def test_parse_status():
+    payload = bytes(range(20))
+    st = client.parse_status(payload)
+    assert st.build_id == 0x03020100
+    assert st.nn_frac_w == 0x1312
+
+
+def test_client_status_and_infer():
+    dev = client.NNFpgaClient(ser=_EmulatorPort(emulator.DeviceEmulator(in_dim=8, build_id=7)))
+    assert dev.status().build_id == 7
+    assert dev.infer([0.75] + [0.0] * 7) == 0.75
+    st = dev.status()
+    assert st.infers == 1
+
+
+def test_client_infer_many_pipelined_and_batched():
+    rng = np.random.default_rng(2)
+    x = rng.uniform(-4, 4, size=(50, 8))
+    expected = np.round(x[:, 0] * 1024) / 1024
+    port = _EmulatorPort(emulator.DeviceEmulator(in_dim=8))
+    dev = client.NNFpgaClient(ser=port)
+    assert np.array_equal(dev.infer_many(x, window=4), expected)
+    assert port.writes == 50
+    port.writes = 0
+    assert np.array_equal(dev.infer_many(iter(x), batch=16), expected)
+    assert port.writes == 4
+
+
+def test_client_crc_frames():
+    dev = client.NNFpgaClient(ser=_EmulatorPort(emulator.DeviceEmulator(in_dim=2, crc=True)), crc=True, in_dim=2)
+    frame = dev.encode_infer(bytes(4))
+    assert frame == proto.pack_packet(proto.INFER_REQ, bytes(4), crc=True)
+    assert dev.infer([-0.5, 1.0]) == -0.5
+
+
+def test_counter_delta_wraps():
+    assert client.counter_delta(5, 0xFFFFFFFB) == 10
+    assert client.counter_delta(100, 40) == 60
+
+
+def test_latency_bench_report():
+    import argparse
+
+    from nnfpga import fixedpoint, latency_uart
+
+    emu = emulator.DeviceEmulator(in_dim=8)
+    # Start 0.2 ms before the 32-bit cycle counter wraps so the bench spans it
+    emu._t0 -= ((1 << client.COUNTER_BITS) - 20_000) / client.CLK_HZ
+    start = emu.cycles()
+    dev = client.NNFpgaClient(ser=_EmulatorPort(emu))
+    req = proto.pack_packet(proto.INFER_REQ, fixedpoint.pack_values([0.0] * 8))
+    args = argparse.Namespace(bench=20, warmup=2, crc=False, baud=115200)
+    report = latency_uart._run_bench(dev, req, args)
+    assert report["inferences"] == 20
+    cyc = report["cycles_per_inference"]
+    assert 0 < cyc["p50"] <= cyc["p90"] <= cyc["p99"] <= cyc["max"] < 1 << 31
+    assert "stall_ratio" not in report  # stall_pulse is tied off in the top
+    assert emu.cycles() < start, "counter did not wrap during the bench"
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from nnfpga import emulator, fixedpoint, proto
+
+
+def test_status_and_stub_infer():
+    emu = emulator.DeviceEmulator(in_dim=8, build_id=0x1234ABCD)
+    x = [1.5, -2.0, 0, 0, 0, 0, 0, 0]
+    req = proto.pack_packet(proto.STATUS_REQ, b"") + proto.pack_packet(
+        proto.INFER_REQ, fixedpoint.pack_values(x)
+    ) + proto.pack_packet(proto.STATUS_REQ, b"")
+    pkts = proto.PacketDecoder().feed(emu.handle(req))
+    assert [p.pkt_type for p in pkts] == [proto.STATUS_RSP, proto.INFER_RSP, proto.STATUS_RSP]
+    assert fixedpoint.unpack_values(pkts[1].payload) == [1.5]
+    before, after = pkts[0].payload, pkts[2].payload
+    assert len(after) == 20
+    assert int.from_bytes(after[0:4], "little") == 0x1234ABCD
+    assert int.from_bytes(before[12:16], "little") == 0
+    assert int.from_bytes(after[12:16], "little") == 1
+    assert int.from_bytes(after[16:18], "little") == 16
+    assert int.from_bytes(after[18:20], "little") == 10
+
+
+def test_short_infer_rejected():
+    emu = emulator.DeviceEmulator(in_dim=8)
+    assert emu.handle(proto.pack_packet(proto.INFER_REQ, bytes(4))) == b""
+    assert emu.rejected == 1 and emu.infers == 0
+
+
+def test_fixed_point_mlp_close_to_float(tmp_path):
+    rng = np.random.default_rng(1)
+    state = {
+        "0.weight": rng.normal(scale=0.3, size=(16, 8)),
+        "0.bias": rng.normal(scale=0.1, size=16),
+        "2.weight": rng.normal(scale=0.3, size=(1, 16)),
+        "2.bias": rng.normal(scale=0.1, size=1),
+    }
+    path = tmp_path / "w.npz"
+    np.savez(path, **state)
+    mlp = emulator.FixedPointMLP.from_checkpoint(path)
+    assert mlp.input_dim == 8
+    x = rng.normal(size=(32, 8))
+    ref = np.maximum(x @ state["0.weight"].T + state["0.bias"], 0) @ state["2.weight"].T + state["2.bias"]
+    assert np.max(np.abs(mlp(x) - ref[:, 0])) < 0.05
+
+
+def test_serve_pty_roundtrip():
+    emu = emulator.DeviceEmulator(in_dim=2, baud=1_000_000)
+    master, slave, _ = emulator.open_pty()
+    stop = threading.Event()
+    t = threading.Thread(target=emu.serve_fd, args=(master, stop), daemon=True)
+    t.start()
+    try:
+        os.write(slave, proto.pack_packet(proto.INFER_REQ, fixedpoint.pack_values([0.25, 3.0])))
+        dec = proto.PacketDecoder()
+        pkts = []
+        deadline = time.monotonic() + 2.0
+        while not pkts and time.monotonic() < deadline:
+            pkts = dec.feed(os.read(slave, 64))
+        assert pkts[0].pkt_type == proto.INFER_RSP
+        assert fixedpoint.unpack_values(pkts[0].payload) == [0.25]
+    finally:
+        stop.set()
+        t.join()
+        os.close(master)
+        os.close(slave)
+
+
+def test_batch_infer():
+    emu = emulator.DeviceEmulator(in_dim=2)
+    rows = np.array([[0.5, 9.0], [-1.25, 9.0], [2.0, 9.0]])
+    pkts = proto.PacketDecoder().feed(emu.handle(proto.pack_infer_batch(rows)))
+    assert pkts[0].pkt_type == proto.INFER_BATCH_RSP
+    assert proto.unpack_infer_batch(pkts[0]).tolist() == [0.5, -1.25, 2.0]
+    assert emu.infers == 3
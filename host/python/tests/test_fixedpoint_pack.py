@@ -15,3 +15,23 @@ def test_saturation():
     payload = fixedpoint.pack_values([1000.0], data_width=16, frac_width=8, signed=True)
     ints = fixedpoint.unpack_ints(payload, data_width=16, signed=True)
     assert ints[0] == 32767
+
+
+def test_pack_array_matches_scalar():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(scale=20.0, size=(64, 8)).astype(np.float32)
+    x[0, :4] = [0.5 / 1024, 1.5 / 1024, 2.5 / 1024, -0.5 / 1024]  # half-LSB ties
+    payload = fixedpoint.pack_array(x)
+    expected = b"".join(fixedpoint.pack_values(row.tolist()) for row in x)
+    assert payload == expected
+
+
+def test_unpack_array_roundtrip():
+    payload = fixedpoint.pack_values([0.0, 1.0, -1.0, 1.5, 1000.0, -1000.0], data_width=16, frac_width=8)
+    ints = fixedpoint.unpack_ints_array(payload, data_width=16, dim=2)
+    assert ints.shape == (3, 2)
+    assert ints.tolist() == [[0, 256], [-256, 384], [32767, -32768]]
+    vals = fixedpoint.unpack_values_array(payload, data_width=16, frac_width=8)
+    assert vals.tolist() == fixedpoint.unpack_values(payload, data_width=16, frac_width=8)
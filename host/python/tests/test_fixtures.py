@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from nnfpga import client, emulator, fixedpoint, fixtures, proto
+
+from test_client import _EmulatorPort
+
+
+def _frames(n: int):
+    rng = np.random.default_rng(5)
+    x = rng.uniform(-4, 4, size=(n, 8))
+    reqs = [proto.pack_packet(proto.INFER_REQ, fixedpoint.pack_array(row)) for row in x]
+    # The emulator's stub model echoes the quantized first feature.
+    rsps = [proto.pack_packet(proto.INFER_RSP, fixedpoint.pack_array(row[:1])) for row in x]
+    return reqs, rsps
+
+
+def test_hex_roundtrip(tmp_path):
+    data = bytes(range(256))
+    fixtures.save_hex_bytes(tmp_path / "a.hex", data)
+    assert (tmp_path / "a.hex").read_text().splitlines()[:2] == ["00", "01"]
+    assert fixtures.load_hex_bytes(tmp_path / "a.hex") == data
+
+
+def test_nnfx_roundtrip(tmp_path):
+    reqs, rsps = _frames(100)
+    reqs[3] = proto.pack_packet(proto.STATUS_REQ, b"")  # mixed frame sizes
+    path = fixtures.write_fixture(tmp_path / "set.nnfx", reqs, rsps)
+    with fixtures.FixtureSet(path) as fx:
+        assert len(fx) == 100
+        assert not fx.crc
+        assert fx.request(3) == reqs[3]
+        assert all(fx.request(i) == reqs[i] and fx.response(i) == rsps[i] for i in range(100))
+        assert bytes(fx.requests(10, 20)) == b"".join(reqs[10:20])
+        assert bytes(fx.requests()) == b"".join(reqs)
+
+
+def test_nnfx_close_with_live_views(tmp_path):
+    reqs, rsps = _frames(4)
+    fx = fixtures.FixtureSet(fixtures.write_fixture(tmp_path / "set.nnfx", reqs, rsps))
+    req = fx.request(2)
+    fx.close()  # must not raise while a view is alive
+    fx.close()
+    assert req == reqs[2]
+    req.release()
+
+
+def test_nnfx_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        fixtures.write_fixture(tmp_path / "x.nnfx", [b"a"], [])
+    (tmp_path / "bad.nnfx").write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        fixtures.FixtureSet(tmp_path / "bad.nnfx")
+
+
+def test_replay_fixture_against_emulator(tmp_path):
+    reqs, rsps = _frames(40)
+    path = fixtures.write_fixture(tmp_path / "set.nnfx", reqs, rsps)
+    dev = client.NNFpgaClient(ser=_EmulatorPort(emulator.DeviceEmulator(in_dim=8)))
+    with fixtures.FixtureSet(path) as fx:
+        result = dev.request_many([fx.request(i) for i in range(len(fx))])
+        got = [proto.pack_packet(p.pkt_type, p.payload) for p in result.responses]
+        assert all(g == fx.response(i) for i, g in enumerate(got))
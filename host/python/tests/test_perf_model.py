@@ -0,0 +1,48 @@
+import pytest
+
+from nnfpga import client, perf_model
+
+T = 8680  # cycles per UART byte at 115200 baud, 100 MHz
+
+
+def test_single_frame_splits_uart_and_core():
+    link = perf_model.Link(in_dim=8)
+    assert link.clks_per_bit == 868 and link.byte_cycles == T
+    p = perf_model.predict(link, perf_model.Core(latency=24), "single")
+    # 22 request bytes in, core, 2 output bytes out (response header already sent)
+    assert p.latency_cycles == 24 * T + 24
+    assert (p.uart_cycles, p.core_cycles) == (24 * T, 24)
+    assert p.bottleneck == "round_trip" and p.cycles_per_inference == p.latency_cycles
+
+
+def test_pipelined_and_batched_are_wire_bound():
+    link = perf_model.Link(in_dim=8, crc=True)
+    core = perf_model.Core(latency=24)
+    pipe = perf_model.predict(link, core, "pipelined", window=4)
+    assert pipe.bottleneck == "uart_rx" and pipe.cycles_per_inference == link.request_bytes() * T
+    batch = perf_model.predict(link, core, "batched", batch=64, window=4)
+    assert batch.cycles_per_inference == pytest.approx((6 + 64 * 16 + 2) * T / 64)
+    assert batch.throughput > pipe.throughput
+    with pytest.raises(ValueError):
+        perf_model.predict(link, core, "batched", batch=10_000)
+
+
+def test_slow_core_is_exposed():
+    link = perf_model.Link(in_dim=8)
+    core = perf_model.Core(latency=200_000, interval=300_000)  # II above one row of wire time
+    p = perf_model.predict(link, core, "batched", batch=4, window=1)
+    assert p.core_cycles > 200_000 and p.bottleneck == "round_trip"
+    assert perf_model.predict(link, core, "pipelined", window=64).bottleneck == "core"
+
+
+def test_check_and_status_deltas():
+    core = perf_model.Core.from_report({"CSynthesisReport": {"WorstLatency": "24", "IntervalMax": "1"}})
+    predicted = perf_model.status_loop_cycles(perf_model.Link(in_dim=8), core)
+    assert predicted == (6 + client.STATUS_LEN) * T + 24 * T + 24 + 6 * T
+    assert not perf_model.check(predicted * 1.05, predicted, tolerance=0.1)["regressed"]
+    assert perf_model.check(predicted * 1.2, predicted, tolerance=0.1)["regressed"]
+    assert not perf_model.check(predicted * 1.2, predicted, tolerance=0.1, allowance=predicted)["regressed"]
+
+    before = client.Status(0, 0xFFFFFF00, 0, 0xFFFFFFFF, 16, 10)
+    after = client.Status(0, 0x00000300, 0, 3, 16, 10)
+    assert perf_model.measured_cycles(before, after) == 0x400 / 4
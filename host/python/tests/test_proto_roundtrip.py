@@ -18,3 +18,91 @@ def test_bad_magic():
         assert False, "expected bad magic"
     except ValueError:
         pass
+
+
+def test_crc_table_matches_bitwise():
+    data = bytes(range(256)) + b"123456789"
+    assert proto.crc16_ccitt(b"123456789") == 0x29B1
+    assert proto.crc16_ccitt(data) == proto._crc16_bitwise(data)
+    assert proto.crc16_ccitt(data, init=0x1D0F) == proto._crc16_bitwise(data, init=0x1D0F)
+
+
+def test_crc_incremental():
+    data = bytes(range(200))
+    crc = proto.Crc16()
+    for i in range(0, len(data), 7):
+        crc.update(data[i : i + 7])
+    assert crc.value == proto.crc16_ccitt(data)
+    crc.reset()
+    assert crc.value == 0xFFFF
+
+
+def test_roundtrip_crc():
+    payload = bytes(range(16))
+    data = proto.pack_packet(proto.INFER_REQ, payload, crc=True)
+    pkt = proto.unpack_packet(data, crc=True)
+    assert pkt.payload == payload
+    bad = data[:-1] + bytes([data[-1] ^ 0x01])
+    try:
+        proto.unpack_packet(bad, crc=True)
+        assert False, "expected crc mismatch"
+    except ValueError:
+        pass
+
+
+def test_decoder_chunked_back_to_back():
+    frames = [proto.pack_packet(proto.INFER_RSP, bytes([i, i + 1]), crc=True) for i in range(10)]
+    stream = b"".join(frames)
+    dec = proto.PacketDecoder(crc=True)
+    pkts = []
+    for i in range(0, len(stream), 3):
+        pkts.extend(dec.feed(stream[i : i + 3]))
+    assert [p.payload for p in pkts] == [bytes([i, i + 1]) for i in range(10)]
+    assert dec.pending == 0
+    assert dec.errors == 0
+
+
+def test_decoder_resync_on_garbage():
+    good = proto.pack_packet(proto.STATUS_RSP, bytes(20), crc=True)
+    corrupt = bytearray(proto.pack_packet(proto.INFER_RSP, b"\x01\x02", crc=True))
+    corrupt[6] ^= 0xFF
+    bad_version = b"\xA5\x5A\x07\x82\x00\x02"
+    stream = b"\x00\xA5\x11" + bad_version + bytes(corrupt) + b"\xA5" + good
+    dec = proto.PacketDecoder(crc=True)
+    pkts = dec.feed(stream)
+    assert len(pkts) == 1
+    assert pkts[0].pkt_type == proto.STATUS_RSP
+    assert dec.errors == 2
+    assert dec.pending == 0
+
+
+def test_decoder_rejects_corrupted_length():
+    good = proto.pack_packet(proto.INFER_RSP, b"\x01\x02")
+    corrupt = b"\xA5\x5A\x01\x82\xF0\x02\x01\x02"  # length 0xF002 > MAX_PAYLOAD
+    dec = proto.PacketDecoder()
+    pkts = dec.feed(corrupt + good)
+    assert [p.payload for p in pkts] == [b"\x01\x02"]
+    assert dec.errors == 1 and dec.pending == 0
+
+
+def test_decoder_holds_partial_frame():
+    frame = proto.pack_packet(proto.INFER_RSP, b"\xAB\xCD", crc=False)
+    dec = proto.PacketDecoder()
+    assert dec.feed(frame[:1]) == []
+    assert dec.feed(frame[1:5]) == []
+    assert dec.pending == 5
+    pkts = dec.feed(frame[5:])
+    assert len(pkts) == 1 and pkts[0].payload == b"\xAB\xCD"
+
+
+def test_infer_batch_pack():
+    import numpy as np
+
+    rows = np.arange(24, dtype=np.float32).reshape(3, 8) / 8.0
+    frame = proto.pack_infer_batch(rows)
+    pkt = proto.unpack_packet(frame)
+    assert pkt.pkt_type == proto.INFER_BATCH_REQ
+    assert len(pkt.payload) == 3 * 8 * 2
+    assert proto.max_batch(8) == 256
+    rsp = proto.Packet(proto.INFER_BATCH_RSP, b"\x00\x04\x00\xfc")
+    assert proto.unpack_infer_batch(rsp).tolist() == [1.0, -1.0]
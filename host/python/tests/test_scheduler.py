@@ -0,0 +1,80 @@
+import asyncio
+import os
+
+import numpy as np
+
+from nnfpga import aio, emulator, proto, scheduler
+
+from test_aio import _start_emulator
+
+
+def test_sharded_order_with_slow_and_stalled_boards():
+    fast = _start_emulator(in_dim=8)
+    slow = _start_emulator(in_dim=8, baud=20_000)
+    dead_master, dead_slave, _ = emulator.open_pty()  # nobody answers
+    x = np.random.default_rng(4).uniform(-3, 3, size=(300, 8))
+
+    async def _main():
+        clients = [
+            aio.AsyncNNFpgaClient(fast[1], timeout=1.0),
+            aio.AsyncNNFpgaClient(slow[1], timeout=1.0),
+            aio.AsyncNNFpgaClient(dead_slave, timeout=0.2),
+        ]
+        try:
+            return await scheduler.infer_sharded(clients, x, chunk=16, max_failures=1)
+        finally:
+            for c in clients:
+                c.close()
+
+    try:
+        result = asyncio.run(_main())
+    finally:
+        fast[2]()
+        slow[2]()
+        os.close(dead_master)
+        os.close(dead_slave)
+
+    assert np.array_equal(result.predictions, np.round(x[:, 0] * 1024) / 1024)
+    fast_st, slow_st, dead_st = result.boards
+    assert dead_st.samples == 0
+    assert fast_st.samples > slow_st.samples
+    assert fast_st.samples + slow_st.samples == 300
+
+
+def test_sharded_resyncs_board_after_lost_response():
+    good = _start_emulator(in_dim=8, baud=50_000)  # slow enough to outlast the lossy timeout
+    lossy = _start_emulator(in_dim=8)
+    handle, sent = lossy[0].handle, []
+
+    def _drop_second_infer(data, now=None):
+        out = bytearray()
+        for pkt in proto.PacketDecoder().feed(handle(data, now)):
+            if pkt.pkt_type == proto.INFER_RSP:
+                sent.append(pkt)
+                if len(sent) == 2:
+                    continue
+            out += proto.pack_packet(pkt.pkt_type, pkt.payload)
+        return bytes(out)
+
+    lossy[0].handle = _drop_second_infer
+    x = np.random.default_rng(6).uniform(-3, 3, size=(200, 8))
+
+    async def _main():
+        clients = [aio.AsyncNNFpgaClient(good[1], timeout=2.0), aio.AsyncNNFpgaClient(lossy[1], timeout=0.2)]
+        try:
+            return await scheduler.infer_sharded(clients, x, chunk=8, max_failures=2)
+        finally:
+            for c in clients:
+                c.close()
+
+    try:
+        result = asyncio.run(_main())
+    finally:
+        good[2]()
+        lossy[2]()
+
+    assert np.array_equal(result.predictions, np.round(x[:, 0] * 1024) / 1024)
+    good_st, lossy_st = result.boards
+    assert lossy_st.failures == 1 and not lossy_st.retired
+    assert lossy_st.samples > 0
+    assert good_st.samples + lossy_st.samples == 200
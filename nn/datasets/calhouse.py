@@ -1,21 +1,37 @@
-"""California Housing dataset loader from the local zip bundle."""
+"""California Housing dataset loader from the local zip bundle.
+
+Parsed, scaled and split arrays are cached as plain .npy files (opened
+memory-mapped) under ``dataset.cache_dir``, keyed by the dataset section,
+the seed and the zip contents, so repeat loads skip CSV parsing and
+refitting. Set ``dataset.cache: false`` to always rebuild.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import shutil
 from pathlib import Path
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 
+if TYPE_CHECKING:  # sklearn/pandas are imported lazily so cache hits skip them
+    from sklearn.preprocessing import StandardScaler
+
+DEFAULT_CACHE_DIR = "nn/outputs/cache/datasets"
+_CACHE_VERSION = 1
+_SPLITS = ("X_train", "y_train", "X_val", "y_val", "X_test", "y_test")
+
+
+def _parse_and_split(cfg: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]:
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
 
-def load_dataset(cfg: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]:
     ds = cfg["dataset"]
     zip_path = Path(ds["zip_path"])
-    if not zip_path.exists():
-        raise FileNotFoundError(f"dataset zip not found: {zip_path}")
 
     # The zip contains a CSV named 'housing.csv'
     df = pd.read_csv(zip_path, compression="zip")
@@ -57,3 +73,72 @@ def load_dataset(cfg: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndar
     # X_test = scaler.transform(X_test)
 
     return X_train, y_train, X_val, y_val, X_test, y_test, xscaler, yscaler
+
+
+def cache_key(cfg: dict) -> str:
+    """Hash of the dataset section, the split seed and the zip bytes."""
+    h = hashlib.sha256()
+    h.update(json.dumps([_CACHE_VERSION, cfg["dataset"], cfg["training"]["seed"]], sort_keys=True).encode())
+    with Path(cfg["dataset"]["zip_path"]).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:32]
+
+
+def _scaler_arrays(prefix: str, scaler) -> dict:
+    return {
+        f"{prefix}_mean": scaler.mean_,
+        f"{prefix}_scale": scaler.scale_,
+        f"{prefix}_var": scaler.var_,
+        f"{prefix}_n": np.asarray(scaler.n_samples_seen_),
+    }
+
+
+def _restore_scaler(prefix: str, data) -> StandardScaler:
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    scaler.mean_ = data[f"{prefix}_mean"]
+    scaler.scale_ = data[f"{prefix}_scale"]
+    scaler.var_ = data[f"{prefix}_var"]
+    n = data[f"{prefix}_n"]
+    scaler.n_samples_seen_ = int(n) if n.ndim == 0 else n
+    scaler.n_features_in_ = scaler.mean_.shape[0]
+    return scaler
+
+
+def _save_cache(entry: Path, arrays: tuple) -> None:
+    tmp = entry.with_name(f".{entry.name}.{os.getpid()}")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, arr in zip(_SPLITS, arrays[:6]):
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+    np.savez(tmp / "scalers.npz", **_scaler_arrays("x", arrays[6]), **_scaler_arrays("y", arrays[7]))
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another process filled the entry first; keep theirs.
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _load_cache(entry: Path) -> tuple:
+    # Copy-on-write maps: callers may modify the arrays without touching the cache.
+    splits = tuple(np.load(entry / f"{name}.npy", mmap_mode="c") for name in _SPLITS)
+    with np.load(entry / "scalers.npz") as data:
+        return splits + (_restore_scaler("x", data), _restore_scaler("y", data))
+
+
+def load_dataset(cfg: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]:
+    ds = cfg["dataset"]
+    zip_path = Path(ds["zip_path"])
+    if not zip_path.exists():
+        raise FileNotFoundError(f"dataset zip not found: {zip_path}")
+
+    if not ds.get("cache", True):
+        return _parse_and_split(cfg)
+
+    entry = Path(ds.get("cache_dir", DEFAULT_CACHE_DIR)) / cache_key(cfg)
+    if (entry / "scalers.npz").exists():
+        return _load_cache(entry)
+    arrays = _parse_and_split(cfg)
+    _save_cache(entry, arrays)
+    return arrays
@@ -17,3 +17,43 @@ def r2(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     ss_res = np.sum((y_true - y_pred) ** 2)
     ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
     return float(1.0 - ss_res / ss_tot) if ss_tot != 0 else 0.0
+
+
+class RunningRegression:
+    """MAE/RMSE/R2 accumulated over chunks; matches the functions above on the concatenated data."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self._abs = 0.0
+        self._sq = 0.0
+        self._mean = 0.0  # of y_true
+        self._m2 = 0.0  # sum of squared deviations of y_true
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        y_true = np.asarray(y_true, dtype=np.float64).reshape(-1)
+        err = y_true - np.asarray(y_pred, dtype=np.float64).reshape(-1)
+        k = y_true.size
+        if k == 0:
+            return
+        self._abs += float(np.sum(np.abs(err)))
+        self._sq += float(np.sum(err**2))
+        # Chan et al. pairwise merge of mean / M2
+        mean_k = float(np.mean(y_true))
+        m2_k = float(np.sum((y_true - mean_k) ** 2))
+        n = self.n + k
+        delta = mean_k - self._mean
+        self._mean += delta * k / n
+        self._m2 += m2_k + delta**2 * self.n * k / n
+        self.n = n
+
+    def mae(self) -> float:
+        return self._abs / self.n if self.n else 0.0
+
+    def rmse(self) -> float:
+        return float(np.sqrt(self._sq / self.n)) if self.n else 0.0
+
+    def r2(self) -> float:
+        return float(1.0 - self._sq / self._m2) if self._m2 != 0 else 0.0
+
+    def summary(self) -> dict:
+        return {"mae": self.mae(), "rmse": self.rmse(), "r2": self.r2()}
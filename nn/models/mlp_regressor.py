@@ -1,23 +1,126 @@
-"""Simple MLP regressor for tabular data."""
+"""Simple MLP regressor for tabular data.
+
+With ``precision`` set (e.g. ``"ap_fixed<10,4,AP_RND,AP_SAT>"``), the
+Linear layers fake-quantize their input (first layer), weights, bias and
+output to that ap_fixed type during forward, with a straight-through
+gradient. This is quantization-aware training matched to the hls4ml model
+precision. Parameter names are the same as the float model, so checkpoints
+load into either; use ``export_float`` to get a plain model with weights
+snapped to the fixed-point grid for ONNX/hls4ml. The ap_fixed type parser
+(host/python/nnfpga/apfixed.py) is only imported when a precision is set.
+"""
 
 from __future__ import annotations
 
-from typing import List
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+import sys
 
 import torch
 from torch import nn
 
+# Same import root as the host tools, so one process has one nnfpga.apfixed
+PKG_ROOT = Path(__file__).resolve().parents[2] / "host" / "python"
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
+
+if TYPE_CHECKING:  # pragma: no cover
+    from nnfpga.apfixed import FixedType
+
+
+def _round(x: torch.Tensor, mode: str) -> torch.Tensor:
+    if mode == "AP_TRN":
+        return torch.floor(x)
+    if mode == "AP_TRN_ZERO":
+        return torch.trunc(x)
+    if mode == "AP_RND":
+        return torch.floor(x + 0.5)
+    if mode == "AP_RND_MIN_INF":
+        return torch.ceil(x - 0.5)
+    if mode == "AP_RND_CONV":
+        return torch.round(x)  # ties to even
+    if mode == "AP_RND_INF":
+        return torch.sign(x) * torch.floor(torch.abs(x) + 0.5)
+    if mode == "AP_RND_ZERO":
+        return torch.sign(x) * torch.ceil(torch.abs(x) - 0.5)
+    raise ValueError(f"unsupported rounding mode: {mode}")
+
+
+def fake_quantize(x: torch.Tensor, t: FixedType) -> torch.Tensor:
+    """Round/overflow ``x`` onto the grid of ``t``; gradient passes straight through."""
+    scale = float(1 << t.frac) if t.frac >= 0 else 1.0 / (1 << -t.frac)
+    lo, hi = t.limits
+    r = _round(x.detach() * scale, t.rounding)
+    if t.overflow == "AP_WRAP":
+        r = torch.remainder(r - lo, float(1 << t.width)) + lo
+    elif t.overflow == "AP_SAT_ZERO":
+        r = torch.where((r < lo) | (r > hi), torch.zeros_like(r), r)
+    else:
+        sym_lo = -hi if t.overflow == "AP_SAT_SYM" and t.signed else lo
+        r = torch.clamp(r, sym_lo, hi)
+    return x + (r / scale - x).detach()
+
+
+class QuantLinear(nn.Linear):
+    """nn.Linear with fake-quantized weights, bias and output (and optionally input)."""
+
+    def __init__(self, in_features: int, out_features: int, precision: str, quantize_input: bool = False) -> None:
+        from nnfpga.apfixed import FixedType
+
+        super().__init__(in_features, out_features)
+        self.fixed = FixedType.parse(precision)
+        self.quantize_input = quantize_input
+        self.quant_enabled = True
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if not self.quant_enabled:
+            return super().forward(x)
+        t = self.fixed
+        if self.quantize_input:
+            x = fake_quantize(x, t)
+        y = nn.functional.linear(x, fake_quantize(self.weight, t), fake_quantize(self.bias, t))
+        return fake_quantize(y, t)
+
+    def extra_repr(self) -> str:
+        return f"{super().extra_repr()}, precision={self.fixed}"
+
 
 # TODO: add batchnorm, activations, etc. as options
 # TODO: add tensorflow/keras switching or different function
-def build_mlp(input_dim: int, hidden: List[int], dropout: float = 0.0) -> nn.Module:
+def build_mlp(input_dim: int, hidden: List[int], dropout: float = 0.0, precision: Optional[str] = None) -> nn.Module:
     layers: List[nn.Module] = []
     prev = input_dim
+
+    def linear(i: int, o: int) -> nn.Module:
+        if precision:
+            return QuantLinear(i, o, precision, quantize_input=not layers)
+        return nn.Linear(i, o)
+
     for h in hidden:
-        layers.append(nn.Linear(prev, h))
+        layers.append(linear(prev, h))
         layers.append(nn.ReLU())
         if dropout > 0.0:
             layers.append(nn.Dropout(dropout))
         prev = h
-    layers.append(nn.Linear(prev, 1))
+    layers.append(linear(prev, 1))
     return nn.Sequential(*layers)
+
+
+def set_quantization(model: nn.Module, enabled: bool) -> None:
+    """Switch fake quantization on/off for every QuantLinear in ``model``."""
+    for m in model.modules():
+        if isinstance(m, QuantLinear):
+            m.quant_enabled = enabled
+
+
+def export_float(model: nn.Module) -> nn.Module:
+    """Plain nn.Linear copy of ``model`` with QuantLinear weights snapped to their grid."""
+    out = nn.Sequential(
+        *[nn.Linear(m.in_features, m.out_features) if isinstance(m, QuantLinear) else m for m in model]
+    )
+    with torch.no_grad():
+        for src, dst in zip(model, out):
+            if isinstance(src, QuantLinear):
+                dst.weight.copy_(fake_quantize(src.weight, src.fixed))
+                dst.bias.copy_(fake_quantize(src.bias, src.fixed))
+    return out.to(next(model.parameters()).device)
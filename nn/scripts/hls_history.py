@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Query and fill the SQLite history of csynth reports.
+
+Subcommands:
+  ingest   add the csynth XML of one or more hls4ml projects (--scan walks a
+           tree, e.g. a DSE output directory) or of an hls4ml config
+  list     recent runs with latency, II and resources
+  trend    one metric over time for a label
+  compare  diff two runs (id, latest, prev or git commit prefix); exits 1 on
+           a regression above --tolerance
+
+run_hls4ml.py (and the stub runner) ingest automatically when
+`report.history_db` is set in the hls4ml config.
+
+Examples:
+  python nn/scripts/hls_history.py ingest --config nn/hls4ml_config.yaml
+  python nn/scripts/hls_history.py ingest --scan nn/outputs/calhouse/default/hls4ml_dse
+  python nn/scripts/hls_history.py trend --metric WorstLatency
+  python nn/scripts/hls_history.py compare prev latest --tolerance 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import yaml
+
+from nn.utils import hls_history
+
+_LIST_COLUMNS = ["WorstLatency", "IntervalMax", "EstimatedClockPeriod", "LUT", "FF", "DSP", "BRAM_18K"]
+
+
+def _fmt(v: Any) -> str:
+    if v is None:
+        return "-"
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return f"{v:g}" if isinstance(v, float) else str(v)
+
+
+def _run_line(r: Any) -> str:
+    commit = (r["git_commit"] or "-")[:10] + ("+" if r["git_dirty"] else "")
+    metrics = " ".join(f"{c}={_fmt(r[c])}" for c in _LIST_COLUMNS)
+    return f"#{r['id']:<4} {_ts(r['ts'])} {commit:<11} cfg={r['config_hash'][:8] or '-':<8} {metrics}  [{r['label']}]"
+
+
+def _ts(t: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(t))
+
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    conn = hls_history.connect(args.db)
+    targets: List[tuple[Path, Dict[str, Any] | None]] = []
+    if args.config:
+        cfg = yaml.safe_load(Path(args.config).read_text())
+        targets.append((Path(cfg["model"]["output_dir"]), cfg))
+    targets += [(Path(p), None) for p in args.project]
+    for root in args.scan:
+        targets += [(p.parent, None) for p in sorted(Path(root).rglob("project.tcl"))]
+    if not targets:
+        print("nothing to ingest: pass --config, --project or --scan")
+        return 2
+    added = 0
+    for project, cfg in targets:
+        result = hls_history.ingest_project(conn, project, cfg, label=args.label, repo=ROOT)
+        if result is None:
+            print(f"skip {project}: no csynth XML")
+            continue
+        run_id, inserted = result
+        added += inserted
+        print(f"{'added' if inserted else 'known'} #{run_id} {project}")
+    print(f"{added} new runs in {args.db}")
+    return 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    rows = hls_history.runs(hls_history.connect(args.db), args.label, args.limit)
+    for r in rows:
+        print(_run_line(r))
+    if not rows:
+        print("no runs")
+    return 0
+
+
+def cmd_trend(args: argparse.Namespace) -> int:
+    if args.metric not in hls_history.METRICS:
+        raise SystemExit(f"unknown metric {args.metric}; choose from {', '.join(hls_history.METRICS)}")
+    rows = [r for r in hls_history.runs(hls_history.connect(args.db), args.label, args.limit) if r[args.metric] is not None]
+    prev = None
+    for r in rows:
+        v = r[args.metric]
+        change = "" if prev is None or v == prev else f" ({v - prev:+g}{f', {(v - prev) / prev:+.1%}' if prev else ''})"
+        commit = (r["git_commit"] or "-")[:10]
+        print(f"#{r['id']:<4} {_ts(r['ts'])} {commit:<10} {args.metric}={_fmt(v)}{change}  [{r['label']}]")
+        prev = v
+    if not rows:
+        print("no runs")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    conn = hls_history.connect(args.db)
+    try:
+        base = hls_history.get_run(conn, args.base, args.label)
+        new = hls_history.get_run(conn, args.new, args.label)
+    except LookupError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"base {_run_line(base)}")
+    print(f"new  {_run_line(new)}")
+    if base["config_hash"] != new["config_hash"]:
+        print("config hash differs (model or hls4ml config changed)")
+    rows = hls_history.compare(base, new, args.tolerance)
+    for d in rows:
+        flag = "  REGRESSION" if d["regressed"] else ""
+        print(f"  {d['metric']:<21} {_fmt(d['base']):>10} -> {_fmt(d['new']):>10}  {d['delta']:+g} ({d['pct']:+.1%}){flag}")
+    regressed = [d["metric"] for d in rows if d["regressed"]]
+    if regressed:
+        print(f"regressed: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=hls_history.DEFAULT_DB, help="SQLite history file")
+    ap.add_argument(
+        "--label",
+        default="",
+        help="Run label (default: project directory relative to the repo; latest/prev: the newest run's label)",
+    )
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("ingest", help="Add csynth reports")
+    p.add_argument("--config", default="", help="hls4ml YAML; ingests model.output_dir with its config hash")
+    p.add_argument("--project", action="append", default=[], help="hls4ml project directory (repeatable)")
+    p.add_argument("--scan", action="append", default=[], help="Directory tree to search for projects (repeatable)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("list", help="Recent runs")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("trend", help="One metric over time")
+    p.add_argument("--metric", default="WorstLatency")
+    p.add_argument("--limit", type=int, default=0)
+    p.set_defaults(func=cmd_trend)
+
+    p = sub.add_parser("compare", help="Diff two runs")
+    p.add_argument("base", help="Run id, latest, prev or git commit prefix")
+    p.add_argument("new", nargs="?", default="latest")
+    p.add_argument("--tolerance", type=float, default=0.0, help="Allowed fractional increase per metric")
+    p.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Stand-in for run_hls4ml.py that needs neither hls4ml nor Vitis.
+
+Takes the same --config/--synth/--compare flags and writes the same
+artifacts. The project layout (project.tcl and a
+`myproject_prj/solution1/syn/report/myproject_csynth.xml`) matches what
+`hls_report.find_synth_report` expects, and `plots/compare_metrics.json`
+matches `compile_and_compare`. Latency and resources come from a rough
+per-layer model: multipliers = MACs / reuse, DSPs only above 10-bit
+precision, BRAM for Resource strategy weights, II = max reuse. The
+accuracy delta is real: the bit-exact ap_fixed emulator against the
+PyTorch model on the test split. Use it to exercise the DSE driver
+locally; the numbers are not synthesis results.
+
+Example:
+  python nn/scripts/hls_stub_runner.py --config nn/hls4ml_config.yaml --synth --compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+PKG_ROOT = ROOT / "host" / "python"
+for p in (ROOT, PKG_ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import numpy as np
+import yaml
+
+from nnfpga import apfixed
+from nn.utils import config as config_mod
+from nn.utils import hls_history, hls_report, io
+
+# xc7a200t totals, used when the part is unknown to the stub
+_AVAILABLE = {"BRAM_18K": 730, "DSP": 740, "FF": 267600, "LUT": 133800, "URAM": 0}
+_BRAM_BITS = 18432
+
+
+def _dims(cfg: Dict[str, Any]) -> List[int]:
+    pt = cfg["model"].get("pytorch", {}) or {}
+    input_dim, hidden = int(pt.get("input_dim", 0)), list(pt.get("hidden", []))
+    info_path = pt.get("model_info", "")
+    if info_path and Path(info_path).exists():
+        info = json.loads(Path(info_path).read_text())
+        input_dim = int(info.get("input_dim", input_dim))
+        hidden = info.get("hidden", hidden)
+    if input_dim <= 0 or not hidden:
+        raise ValueError("model.pytorch input_dim/hidden (or model_info) must describe the model")
+    return [input_dim, *map(int, hidden), 1]
+
+
+def _linear_index(cfg: Dict[str, Any], dims: List[int]) -> List[int]:
+    """Sequential indices of the Linear layers in the configured build_mlp model (Dropout shifts them)."""
+    import torch
+
+    from nn.models import mlp_regressor
+
+    dropout = float((cfg["model"].get("pytorch", {}) or {}).get("dropout", 0.0))
+    model = mlp_regressor.build_mlp(dims[0], dims[1:-1], dropout=dropout)
+    return [i for i, m in enumerate(model) if isinstance(m, torch.nn.Linear)]
+
+
+def _layer_reuse(h: Dict[str, Any], index: List[int]) -> List[int]:
+    """Reuse factor per dense layer; layer_reuse keys match on the Sequential index in their name."""
+    reuse = [int(h.get("reuse_factor", 1))] * len(index)
+    for name, value in (h.get("layer_reuse", {}) or {}).items():
+        m = re.search(r"(\d+)$", str(name))
+        if m and int(m.group(1)) in index:
+            reuse[index.index(int(m.group(1)))] = int(value)
+    return reuse
+
+
+def estimate(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """csynth-style report dict for the configured model (rough analytical estimate)."""
+    h = cfg["hls4ml"]
+    width = apfixed.FixedType.parse(h.get("precision", "ap_fixed<16,6>")).width
+    strategy = str(h.get("strategy", "Latency")).lower()
+    dims = _dims(cfg)
+    layers: List[Tuple[int, int]] = list(zip(dims, dims[1:]))
+    reuse = _layer_reuse(h, _linear_index(cfg, dims))
+
+    latency = 0
+    lut = ff = dsp = bram = 0
+    for (n_in, n_out), r in zip(layers, reuse):
+        r = max(1, min(r, n_in * n_out))
+        mults = math.ceil(n_in * n_out / r)
+        if width > 10:
+            dsp += mults
+            lut += mults * width + n_out * width * 2
+        else:
+            lut += mults * (width * width // 2) + n_out * width * 2
+        ff += mults * width + n_out * width * 3
+        if strategy == "resource" and r > 1:
+            bram += math.ceil(n_in * n_out * width / _BRAM_BITS)
+        adder_depth = math.ceil(math.log2(max(2, n_in)))
+        latency += r + adder_depth + 2 + 1  # MAC stage, adder tree, cast, ReLU/output
+    target = float(h.get("clock_period", 10.0))
+    report: Dict[str, Any] = {
+        "Part": h.get("part", ""),
+        "TopModelName": "myproject",
+        "TargetClockPeriod": target,
+        "EstimatedClockPeriod": round(min(target, 3.0 + 0.15 * width), 3),
+        "BestLatency": latency,
+        "WorstLatency": latency,
+        "IntervalMin": max(reuse),
+        "IntervalMax": max(reuse),
+        "BRAM_18K": bram,
+        "DSP": dsp,
+        "FF": ff,
+        "LUT": lut,
+        "URAM": 0,
+    }
+    report.update({f"Available{k}": v for k, v in _AVAILABLE.items()})
+    return report
+
+
+def _write_project(out_dir: Path, report: Dict[str, Any]) -> Path:
+    io.ensure_dir(out_dir)
+    (out_dir / "project.tcl").write_text(
+        'variable project_name\nset project_name "myproject"\nvariable backend\nset backend "vitis"\n'
+    )
+    xml = out_dir / "myproject_prj" / "solution1" / "syn" / "report" / "myproject_csynth.xml"
+    hls_report.write_csynth_xml(xml, report)
+    return xml
+
+
+def _compare(cfg: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    from nn.utils import compile as compile_mod
+
+    training_config = (cfg.get("predict", {}) or {}).get("training_config")
+    if not training_config:
+        raise ValueError("predict.training_config is required to load test data")
+    X_test, y_test = compile_mod._load_test_data(training_config)
+    pt_model = compile_mod._load_pytorch_model(cfg["model"])
+    y_pt = compile_mod._predict_pytorch(pt_model, X_test)
+    state = {k: v.detach().cpu().numpy() for k, v in pt_model.state_dict().items()}
+    layers, index = apfixed.layers_from_state_dict(state)
+    y_hls = apfixed.ApFixedMLP.from_config(layers, cfg, layer_index=index)(X_test)
+
+    hls_metrics = compile_mod._compute_metrics(y_test, y_hls)
+    pt_metrics = compile_mod._compute_metrics(y_test, y_pt)
+    summary = {
+        "hls": hls_metrics,
+        "pytorch": pt_metrics,
+        "delta": {k: hls_metrics[k] - pt_metrics[k] for k in hls_metrics},
+    }
+    out_dir = io.ensure_dir(Path(cfg["model"]["output_dir"]) / "plots")
+    io.save_json(out_dir / "compare_metrics.json", summary)
+    io.save_numpy(out_dir / "y_test_hls.npy", y_hls)
+    return summary
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True, help="YAML hls4ml config file")
+    ap.add_argument("--synth", action="store_true", help="Write an estimated csynth report")
+    ap.add_argument("--compare", action="store_true", help="Emulator vs PyTorch accuracy delta")
+    ap.add_argument("--clean", action="store_true", help="Accepted for run_hls4ml.py compatibility")
+    args = ap.parse_args()
+
+    cfg = config_mod.apply_trained_precision(yaml.safe_load(Path(args.config).read_text()))
+    out_dir = Path(cfg["model"]["output_dir"])
+    if args.synth:
+        report = estimate(cfg)
+        xml = _write_project(out_dir, report)
+        out_json = (cfg.get("report", {}) or {}).get("out_json", "")
+        if out_json:
+            Path(out_json).write_text(json.dumps({"CSynthesisReport": report}, indent=2))
+        print(f"stub csynth report: {xml}")
+        history_db = (cfg.get("report", {}) or {}).get("history_db", "")
+        if history_db:
+            hls_history.ingest_project(hls_history.connect(history_db), out_dir, cfg, repo=ROOT)
+    if args.compare:
+        print(f"Delta (HLS - PyTorch): {_compare(cfg)['delta']}")
+    print(f"hls4ml project generated at: {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
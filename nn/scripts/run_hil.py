@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Stream the whole test split through the board and score it.
+
+Every test sample is quantized and sent over UART in chunks (pipelined
+INFER_REQ, or INFER_BATCH_REQ with --batch). For each chunk, the runner
+updates MAE/RMSE/R2 against the targets and the per-sample LSB difference
+against golden outputs. Goldens come from the bit-exact ap_fixed emulator
+(default) or the hls4ml predictions saved by `compile_and_compare`
+(`<output_dir>/plots/y_test_hls.npy`; those were predicted from
+unquantized inputs, so a few LSB differences are expected). Results,
+sustained throughput and STATUS counter deltas go to one JSON file next to
+the compile_and_compare outputs.
+
+Example:
+  python nn/scripts/run_hil.py --config nn/hls4ml_config.yaml --port /dev/ttyUSB0
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+PKG_ROOT = ROOT / "host" / "python"
+for p in (ROOT, PKG_ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import numpy as np
+import yaml
+
+from nnfpga import apfixed, client, fixedpoint, pipeline
+from nn.datasets import calhouse
+from nn.metrics import regression
+from nn.utils import config as config_mod
+from nn.utils import io
+
+
+def _golden(cfg: Dict[str, Any], kind: str, X_q: np.ndarray, start: int) -> Optional[np.ndarray]:
+    if kind == "none":
+        return None
+    if kind == "hls4ml":
+        path = Path(cfg["model"]["output_dir"]) / "plots" / "y_test_hls.npy"
+        if not path.exists():
+            raise FileNotFoundError(f"{path} not found; run run_hls4ml.py --compare first")
+        return np.load(path).reshape(-1)[start : start + X_q.shape[0]]
+    source = cfg["model"].get("source", "pytorch")
+    if source != "pytorch":
+        # The emulator reads Linear weights from a state_dict; ONNX/Keras models have none.
+        raise ValueError(f"--golden fixed-point needs model.source pytorch, not {source}; use --golden hls4ml or none")
+    mlp = apfixed.ApFixedMLP.from_checkpoint(cfg["model"]["pytorch"]["checkpoint"], cfg)
+    return mlp(X_q)
+
+
+def _lsb_histogram(diff: np.ndarray, max_lsb: int) -> Dict[str, int]:
+    """Counts per LSB difference; the end bins collect everything beyond +-max_lsb."""
+    clipped = np.clip(diff, -max_lsb, max_lsb)
+    values, counts = np.unique(clipped, return_counts=True)
+    return {str(int(v)): int(c) for v, c in zip(values, counts)}
+
+
+def stream_eval(
+    dev: client.NNFpgaClient,
+    X: np.ndarray,
+    y_true: np.ndarray,
+    golden: Optional[np.ndarray] = None,
+    chunk: int = 512,
+    window: int = pipeline.DEFAULT_WINDOW,
+    batch: int = 0,
+    max_lsb: int = 16,
+) -> Dict[str, Any]:
+    """Run ``X`` through ``dev`` chunk by chunk; return the report dict."""
+    hw = regression.RunningRegression()
+    ref = regression.RunningRegression() if golden is not None else None
+    diffs = []
+    chunk_rates = []
+    lsb = float(1 << dev.frac_width)
+
+    before = dev.status()
+    busy_s = 0.0
+    for s in range(0, X.shape[0], chunk):
+        e = min(s + chunk, X.shape[0])
+        t0 = time.perf_counter()
+        y_hw = dev.infer_many(X[s:e], window=window, batch=batch)
+        dt = time.perf_counter() - t0
+        busy_s += dt
+        chunk_rates.append((e - s) / dt if dt > 0 else 0.0)
+        hw.update(y_true[s:e], y_hw)
+        if golden is not None:
+            ref.update(y_true[s:e], golden[s:e])
+            diffs.append(np.rint((y_hw - golden[s:e]) * lsb).astype(np.int64))
+    after = dev.status()
+
+    report: Dict[str, Any] = {
+        "samples": int(X.shape[0]),
+        "metrics": {"hardware": hw.summary()},
+        "throughput": {
+            "inferences_per_s": X.shape[0] / busy_s if busy_s > 0 else 0.0,
+            "elapsed_s": busy_s,
+            "chunk_min_per_s": min(chunk_rates, default=0.0),
+            "chunk_max_per_s": max(chunk_rates, default=0.0),
+            "chunk": chunk,
+            "window": window,
+            "batch": batch,
+        },
+        "device": {
+            "build_id": after.build_id,
+            "infers": client.counter_delta(after.infers, before.infers),
+            "stalls": client.counter_delta(after.stalls, before.stalls),
+        },
+    }
+    if golden is not None:
+        diff = np.concatenate(diffs) if diffs else np.zeros(0, dtype=np.int64)
+        report["metrics"]["golden"] = ref.summary()
+        report["lsb_diff"] = {
+            "exact": int(np.count_nonzero(diff == 0)),
+            "max_abs": int(np.max(np.abs(diff), initial=0)),
+            "histogram": _lsb_histogram(diff, max_lsb),
+            "histogram_clip": max_lsb,
+        }
+    return report
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True, help="YAML hls4ml config file (model, predict.training_config)")
+    ap.add_argument("--port", required=True, help="UART device (e.g., /dev/ttyUSB0) or socket://host:port")
+    ap.add_argument("--baud", type=int, default=115200, help="UART baud rate")
+    ap.add_argument("--timeout", type=float, default=2.0, help="Read timeout in seconds")
+    ap.add_argument("--crc", action="store_true", help="Expect CRC in packets")
+    ap.add_argument("--golden", choices=["fixed-point", "hls4ml", "none"], default="fixed-point")
+    ap.add_argument("--index", type=int, default=0, help="First test sample")
+    ap.add_argument("--count", type=int, default=0, help="Samples to run (0 = rest of the split)")
+    ap.add_argument("--chunk", type=int, default=512, help="Samples per metrics update")
+    ap.add_argument("--window", type=int, default=pipeline.DEFAULT_WINDOW, help="Requests in flight")
+    ap.add_argument("--batch", type=int, default=0, help="Samples per INFER_BATCH_REQ (0 = single INFER_REQ)")
+    ap.add_argument("--max-lsb", type=int, default=16, help="Clip the LSB histogram at +-this")
+    ap.add_argument("--out", default="", help="JSON report (default <output_dir>/plots/hil_metrics.json)")
+    args = ap.parse_args()
+
+    cfg = config_mod.apply_trained_precision(yaml.safe_load(Path(args.config).read_text()))
+    training_config = (cfg.get("predict", {}) or {}).get("training_config")
+    if not training_config:
+        raise ValueError("predict.training_config is required to load test data")
+    _, _, _, _, X_test, y_test, _, _ = calhouse.load_dataset(config_mod.load_config(training_config))
+    count = args.count or X_test.shape[0] - args.index
+    X = X_test[args.index : args.index + count]
+    y = y_test[args.index : args.index + count]
+
+    # Goldens see exactly the inputs the board receives.
+    X_q = fixedpoint.unpack_values_array(fixedpoint.pack_array(X), dim=X.shape[1])
+    golden = _golden(cfg, args.golden, X_q, args.index)
+
+    with client.NNFpgaClient(args.port, args.baud, args.timeout, crc=args.crc, in_dim=X.shape[1]) as dev:
+        report = stream_eval(dev, X, y, golden, args.chunk, args.window, args.batch, args.max_lsb)
+    report["golden"] = args.golden
+    report["index"] = args.index
+
+    out = Path(args.out) if args.out else io.ensure_dir(Path(cfg["model"]["output_dir"]) / "plots") / "hil_metrics.json"
+    io.save_json(out, report)
+
+    print(f"Samples: {report['samples']}")
+    print(f"Hardware metrics: {report['metrics']['hardware']}")
+    if "golden" in report["metrics"]:
+        d = report["lsb_diff"]
+        print(f"Golden ({args.golden}) metrics: {report['metrics']['golden']}")
+        print(f"LSB match: {d['exact']}/{report['samples']} exact, max |diff| {d['max_abs']} LSB")
+    print(f"Throughput: {report['throughput']['inferences_per_s']:.1f} inferences/s")
+    print(f"Wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
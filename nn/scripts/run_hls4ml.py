@@ -35,6 +35,10 @@ if str(ROOT) not in sys.path:
 # now we can import from nn
 from nn.models import mlp_regressor
 from nn.utils import compile as compile_mod
+from nn.utils import config as config_mod
+from nn.utils import build_state
+from nn.utils import hls_history
+from nn.utils import hls_report
 
 HLSCONFIG = Dict[str, Any]
 _TFModel = Any if tf is None else tf.keras.Model
@@ -89,6 +93,8 @@ def _build_model(cfg: Dict[str, Any]) -> MODEL:
         dropout = float(pt_cfg.get("dropout", 0.0))
         checkpoint = Path(pt_cfg["checkpoint"]).resolve()
         info_path = pt_cfg.get("model_info", "")
+        if (cfg.get("pruning", {}) or {}).get("enabled", False) and not info_path:
+            raise ValueError("pruning.enabled needs model.pytorch.model_info for the pruned hidden sizes")
 
         # If model_info set in config, then use it instead
         if info_path:
@@ -246,47 +252,18 @@ def _run_build_with_tool(build_tcl: Path, backend: str, runner: str, out_dir: Pa
 
 
 def _resolve_synth_report_path(hls_dir: Path, suffix: str) -> Path | None:
-    project_tcl = hls_dir / "project.tcl"
-    if not project_tcl.exists():
-        return None
-    project_name = None
-    backend_name = None
-    top_name = None
-    for line in project_tcl.read_text().splitlines():
-        if "set project_name" in line:
-            project_name = line.split('"')[-2]
-        if "set backend" in line:
-            backend_name = line.split('"')[-2]
-        if "set_top" in line:
-            parts = line.strip().split()
-            if len(parts) >= 2:
-                top_name = parts[-1]
-    if project_name is None:
-        return None
-    if top_name is None:
-        top_name = project_name
-    if backend_name and "accelerator" in backend_name:
-        project_name = f"{project_name}_axi"
-    prj_dir = hls_dir / f"{project_name}_prj"
-    if not prj_dir.exists():
-        return None
-    for sol_dir in prj_dir.iterdir():
-        if not sol_dir.is_dir():
-            continue
-        report_dir = sol_dir / "syn" / "report"
-        if not report_dir.exists():
-            continue
-        if top_name:
-            candidate = report_dir / f"{top_name}_csynth.{suffix}"
-            if candidate.exists():
-                return candidate
-        candidate = report_dir / f"csynth.{suffix}"
-        if candidate.exists():
-            return candidate
-        # Fallback: first csynth report in solution
-        for rpt in report_dir.glob(f"*_csynth.{suffix}"):
-            return rpt
-    return None
+    return hls_report.find_synth_report(hls_dir, suffix)
+
+
+def _record_history(cfg: Dict[str, Any], out_dir: Path) -> None:
+    db = (cfg.get("report", {}) or {}).get("history_db", "")
+    if not db:
+        return
+    result = hls_history.ingest_project(hls_history.connect(db), out_dir, cfg, repo=ROOT)
+    if result is None:
+        print(f"warning: no csynth XML under {out_dir} to record in {db}")
+    elif result[1]:
+        print(f"Recorded csynth report as run #{result[0]} in {db}")
 
 
 def _plot_model(hls_model: Any, cfg: Dict[str, Any]) -> None:
@@ -319,6 +296,7 @@ def main() -> int:
     ap.add_argument("--plot-model", action="store_true", help="Plot the hls4ml model topology")
     ap.add_argument("--report", action="store_true", help="Read HLS report only")
     ap.add_argument("--clean", action="store_true", help="Remove existing hls4ml project output_dir before running")
+    ap.add_argument("--force", action="store_true", help="Ignore recorded build state and rerun every stage")
     compare_group = ap.add_mutually_exclusive_group()
     compare_group.add_argument("--compare", action="store_true", help="Run hls4ml vs PyTorch comparison")
     compare_group.add_argument("--no-compare", action="store_true", help="Disable comparison even if config enables it")
@@ -332,18 +310,12 @@ def main() -> int:
     if args.report and (args.build or args.all or args.csim or args.synth or args.cosim or args.export or args.bitfile):
         raise ValueError("--report cannot be combined with build step flags")
 
-    cfg = _load_config(args.config)
+    cfg = config_mod.apply_trained_precision(_load_config(args.config))
     model_cfg = cfg["model"]
     source = model_cfg.get("source", "pytorch")
     onnx_path = Path(model_cfg.get("onnx_path", "")).resolve()
     out_dir = Path(model_cfg["output_dir"]).resolve()
 
-    if args.clean:
-        if out_dir.exists():
-            shutil.rmtree(out_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-
     hls_kwargs = {
         "backend": cfg["hls4ml"].get("backend", "Vitis"),       # Vivado 2025.2 lacks vivado_hls support
         "part": cfg["hls4ml"].get("part", "xc7a200tsbg484-1"),  # default Artix-7 T200
@@ -366,6 +338,29 @@ def main() -> int:
         print(f"hls4ml config ({args.config}):")
         print(yaml.dump(hls_config, sort_keys=False))
 
+    # === Incremental build state ===
+    build_cfg = cfg.get("build", {}) or {}
+    incremental = bool(build_cfg.get("incremental", True)) and not args.force
+    stage_keys = build_state.stage_keys(
+        compile_mod._model_files(model_cfg),
+        hls_config,
+        hls_kwargs,
+        {
+            "driver": build_cfg.get("driver", "hls4ml"),
+            "extra": build_cfg.get("extra", {}) or {},
+            "patch": cfg["hls4ml"].get("vitis_patch_array_partition", True),
+            "runner": cfg["hls4ml"].get("vitis_runner", "vitis-run"),
+        },
+    )
+    state = build_state.BuildState(out_dir)
+    cached: list = []
+
+    if args.clean:
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        state.clear()
+
     # === Model conversion ===
     if source == "onnx":
         hls_model = hls4ml.converters.convert_from_onnx_model(
@@ -397,13 +392,17 @@ def main() -> int:
 
     # Emit project files unless user asked for plot-only (and no build requested)
     if not (args.plot_model and not build_requested):
-        _write_model(hls_model)
+        if incremental and state.fresh("write", stage_keys["write"]) and (out_dir / "build_prj.tcl").exists():
+            cached.append("write")
+        else:
+            _write_model(hls_model)
+            state.invalidate(build_state.BUILD_STAGES)
+            state.mark("write", stage_keys["write"])
 
     if args.plot_model or cfg["hls4ml"].get("plot_model", None):
         _plot_model(hls_model, cfg["hls4ml"])
 
     if build_requested:
-        build_cfg = cfg.get("build", {}) or {}
         driver = build_cfg.get("driver", "hls4ml")
         build_tcl = out_dir / "build_prj.tcl"
         extra_build_args = build_cfg.get("extra", {}) or {}
@@ -413,11 +412,39 @@ def main() -> int:
             build_tcl, enabled=backend.lower() == "vitis" and cfg["hls4ml"].get("vitis_patch_array_partition", True)
         )
 
-        if driver == "hls4ml":
-            _run_build_with_hls4ml(hls_model, build_steps, backend, extra_build_args)
+        requested = [s for s in build_state.BUILD_STAGES if build_steps.get(s)]
+        if incremental:
+            synth_present = hls_report.find_synth_report(out_dir, "xml") is not None
+            todo = build_state.plan(state, stage_keys, build_steps, synth_present)
         else:
-            runner = cfg["hls4ml"].get("vitis_runner", "vitis-run")
-            _run_build_with_tool(build_tcl, backend, runner, out_dir)
+            todo = list(requested)
+        if driver != "hls4ml" and todo:
+            todo = list(requested)  # the tool runs the project's own step selection
+        cached += [s for s in requested if s not in todo]
+
+        if todo:
+            if driver == "hls4ml":
+                _run_build_with_hls4ml(
+                    hls_model, {s: s in todo for s in build_state.BUILD_STAGES}, backend, extra_build_args
+                )
+            else:
+                runner = cfg["hls4ml"].get("vitis_runner", "vitis-run")
+                _run_build_with_tool(build_tcl, backend, runner, out_dir)
+            # hls_model.build() returns normally when csim/cosim/export fail, so
+            # only stages whose outputs are really there are recorded as done.
+            failed = {}
+            for s in todo:
+                err = hls_report.stage_output_error(out_dir, s)
+                if err:
+                    failed[s] = err
+                    state.invalidate([s])
+                else:
+                    state.mark(s, stage_keys[s])
+            if failed:
+                raise RuntimeError(
+                    "build stage(s) failed: " + "; ".join(f"{s}: {e}" for s, e in failed.items())
+                )
+        print(f"Build stages run: {', '.join(todo) or 'none'}")
 
         report_cfg = cfg.get("report", {}) or {}
         if report_cfg.get("enable", False):
@@ -429,6 +456,8 @@ def main() -> int:
                 out_json = report_cfg.get("out_json", "")
                 if out_json:
                     Path(out_json).write_text(json.dumps(report, indent=2))
+        if build_steps.get("synth"):
+            _record_history(cfg, out_dir)
 
     if args.report:
         try:
@@ -463,6 +492,8 @@ def main() -> int:
     if compare_requested:
         compile_mod.compile_and_compare(hls_model, cfg)
 
+    if cached:
+        print(f"Cached stages (inputs unchanged): {', '.join(cached)}")
     print(f"hls4ml project generated at: {out_dir}")
     return 0
 
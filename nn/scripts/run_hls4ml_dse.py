@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Fan hls4ml configurations out to parallel csynth runs and report the Pareto front.
+
+The DSE YAML names a base hls4ml config and the keys to vary (dotted paths,
+grid or random as in run_sweep.py):
+
+  base: nn/hls4ml_config.yaml
+  runner: hls4ml        # or stub (nn/scripts/hls_stub_runner.py, no Vitis needed)
+  workers: 2
+  space:
+    hls4ml.precision: ["ap_fixed<16,6>", "ap_fixed<12,4>"]
+    hls4ml.reuse_factor: [1, 4]
+    hls4ml.strategy: [Latency, Resource]
+
+Each variant gets its own `<output_dir>/vNNN/` with the merged config and
+an hls4ml project. It runs as `run_hls4ml.py --synth [--compare]` (or the
+stub) in a bounded pool of subprocesses with a log per variant. The driver
+parses each csynth XML and reads the `compile_and_compare` accuracy delta.
+It writes every variant plus the Pareto front over latency/II/LUT/DSP/BRAM/
+|delta| to `dse_summary.json` and `dse_table.csv`.
+
+Example:
+  python nn/scripts/run_hls4ml_dse.py --dse nn/configs/hls4ml_dse.yaml --runner stub
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import yaml
+
+from nn.utils import hls_report, io, sweep
+
+RUNNERS = {
+    "hls4ml": ROOT / "nn" / "scripts" / "run_hls4ml.py",
+    "stub": ROOT / "nn" / "scripts" / "hls_stub_runner.py",
+}
+DEFAULT_OBJECTIVES = ["latency_ns", "IntervalMax", "LUT", "DSP", "BRAM_18K", "abs_delta"]
+_COLUMNS = ["variant", "pareto", "WorstLatency", "latency_ns", "IntervalMax", "LUT", "FF", "DSP", "BRAM_18K", "delta", "params"]
+
+
+def _variant_config(base: Dict[str, Any], params: Dict[str, Any], vdir: Path) -> Dict[str, Any]:
+    cfg = sweep.apply(base, params)
+    cfg["model"]["output_dir"] = str(vdir / "hls4ml")
+    cfg.setdefault("hls4ml", {})["plot_model"] = ""
+    cfg["report"] = dict(cfg.get("report", {}) or {}, enable=True, out_json=str(vdir / "hls_report.json"))
+    # Only csynth is needed for the table; compare runs via --compare
+    cfg["build"] = dict(cfg.get("build", {}) or {}, csim=False, synth=True, cosim=False, export=False, bitfile=False)
+    cfg["predict"] = dict(cfg.get("predict", {}) or {}, enable=False)
+    return cfg
+
+
+def _run_variant(job: Tuple[int, Path, Dict[str, Any]], runner: Path, compare: bool, metric: str, timeout: float) -> Dict[str, Any]:
+    index, vdir, params = job
+    cmd = [sys.executable, str(runner), "--config", str(vdir / "hls4ml_config.yaml"), "--synth"]
+    if compare:
+        cmd.append("--compare")
+    record: Dict[str, Any] = {"variant": f"v{index:03d}", "dir": str(vdir), "params": params}
+    t0 = time.perf_counter()
+    with (vdir / "build.log").open("w", encoding="utf-8") as log:
+        try:
+            proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, timeout=timeout or None)
+        except subprocess.TimeoutExpired:
+            record["error"] = f"timeout after {timeout:.0f}s"
+            return record
+    record["build_s"] = time.perf_counter() - t0
+    if proc.returncode != 0:
+        record["error"] = f"exit code {proc.returncode}"
+        return record
+
+    xml = hls_report.find_synth_report(vdir / "hls4ml", "xml")
+    if xml is None:
+        record["error"] = "csynth report not found"
+        return record
+    report = hls_report.parse_csynth_xml(xml)
+    record.update(report)
+    clock = report.get("EstimatedClockPeriod") or report.get("TargetClockPeriod")
+    if isinstance(report.get("WorstLatency"), int) and clock:
+        record["latency_ns"] = report["WorstLatency"] * float(clock)
+
+    compare_json = vdir / "hls4ml" / "plots" / "compare_metrics.json"
+    if compare_json.exists():
+        delta = json.loads(compare_json.read_text())["delta"].get(metric)
+        record["delta"] = delta
+        record["abs_delta"] = abs(delta) if delta is not None else None
+    return record
+
+
+def _write_table(path: Path, records: List[Dict[str, Any]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(_COLUMNS)
+        for r in records:
+            w.writerow([json.dumps(r["params"], sort_keys=True) if c == "params" else r.get(c, "") for c in _COLUMNS])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dse", required=True, help="DSE YAML (base, space, runner, ...)")
+    ap.add_argument("--runner", choices=sorted(RUNNERS), default="", help="Override the DSE runner")
+    ap.add_argument("--workers", type=int, default=0, help="Concurrent builds (default from DSE YAML or 2)")
+    ap.add_argument("--no-compare", action="store_true", help="Skip the accuracy comparison")
+    ap.add_argument("--dry-run", action="store_true", help="Write variant configs and list them")
+    args = ap.parse_args()
+
+    spec = yaml.safe_load(Path(args.dse).read_text())
+    base = yaml.safe_load(Path(spec["base"]).read_text())
+    points = sweep.expand(spec["space"], spec.get("mode", "grid"), int(spec.get("samples", 0)), int(spec.get("sampler_seed", 0)))
+    out_root = io.ensure_dir(spec.get("output_dir", str(Path(base["model"]["output_dir"]).parent / "hls4ml_dse")))
+
+    jobs = []
+    for i, params in enumerate(points):
+        vdir = io.ensure_dir(out_root / f"v{i:03d}")
+        (vdir / "hls4ml_config.yaml").write_text(yaml.safe_dump(_variant_config(base, params, vdir), sort_keys=False))
+        jobs.append((i, vdir, params))
+    if args.dry_run:
+        for i, vdir, params in jobs:
+            print(f"v{i:03d} {vdir} {params}")
+        return 0
+
+    runner = RUNNERS[args.runner or spec.get("runner", "hls4ml")]
+    workers = args.workers or int(spec.get("workers", 2))
+    compare = bool(spec.get("compare", True)) and not args.no_compare
+    metric = spec.get("delta_metric", "rmse")
+    timeout = float(spec.get("timeout", 0))
+    objectives = list(spec.get("objectives", DEFAULT_OBJECTIVES))
+    if not compare and "abs_delta" in objectives:
+        objectives.remove("abs_delta")
+    print(f"dse: {len(jobs)} variants, {workers} concurrent builds, runner {runner.name}")
+
+    records: List[Dict[str, Any]] = []
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_variant, job, runner, compare, metric, timeout) for job in jobs]
+        for fut in as_completed(futures):
+            rec = fut.result()
+            records.append(rec)
+            status = rec.get("error") or f"latency={rec.get('WorstLatency')} II={rec.get('IntervalMax')} LUT={rec.get('LUT')} DSP={rec.get('DSP')}"
+            print(f"[{len(records)}/{len(jobs)}] {rec['variant']} {rec['params']} -> {status}")
+    elapsed = time.perf_counter() - t0
+
+    records.sort(key=lambda r: r["variant"])
+    ok = [r for r in records if "error" not in r]
+    front = sweep.pareto_front(ok, objectives)
+    on_front = {id(r) for r in front}
+    for r in records:
+        r["pareto"] = id(r) in on_front
+    front.sort(key=lambda r: (r.get("latency_ns") or 0, r.get("LUT") or 0))
+
+    io.save_json(
+        out_root / "dse_summary.json",
+        {
+            "dse": str(args.dse),
+            "base": str(spec["base"]),
+            "runner": runner.name,
+            "objectives": objectives,
+            "delta_metric": metric,
+            "elapsed_s": elapsed,
+            "pareto": [r["variant"] for r in front],
+            "variants": records,
+        },
+    )
+    _write_table(out_root / "dse_table.csv", front + [r for r in records if not r["pareto"]])
+
+    print(f"\nPareto front ({', '.join(objectives)}):")
+    for r in front:
+        delta = f" d{metric}={r['delta']:+.5f}" if r.get("delta") is not None else ""
+        print(
+            f"  {r['variant']} lat={r.get('WorstLatency')}cyc/{r.get('latency_ns', 0):.1f}ns II={r.get('IntervalMax')} "
+            f"LUT={r.get('LUT')} DSP={r.get('DSP')} BRAM={r.get('BRAM_18K')}{delta} {r['params']}"
+        )
+    failed = len(records) - len(ok)
+    if failed:
+        print(f"{failed} variants failed; see build.log in their directories")
+    print(f"Wrote {out_root / 'dse_summary.json'} and dse_table.csv ({elapsed:.1f}s)")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Train a grid or random sweep of configs in parallel and rank the results.
+
+The sweep YAML names a base training config and the keys to vary:
+
+  base: nn/configs/calhouse.yaml
+  mode: grid            # or random (with samples/sampler_seed)
+  rank_by: rmse
+  space:
+    model.hidden: [[8, 16], [16, 32]]
+    training.lr: [0.001, 0.003]
+
+Each config trains in a worker process with a pinned torch thread count
+(workers * threads <= cores by default). The dataset cache is filled once
+up front so workers share the memory-mapped splits instead of re-parsing
+the CSV. Every run writes metrics.json under `<output_dir>/runNNN/`, and
+the ranked summary goes to `<output_dir>/sweep_summary.json`.
+
+Example:
+  python nn/scripts/run_sweep.py --sweep nn/configs/sweep_calhouse.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import yaml
+
+from nn.datasets import calhouse
+from nn.scripts import run_training
+from nn.utils import config as config_mod
+from nn.utils import io, sweep
+
+
+def _init_worker(threads: int) -> None:
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already fixed once the pool reuses a process
+
+
+def _run_one(job: Tuple[int, Dict[str, Any], Dict[str, Any]]) -> Dict[str, Any]:
+    index, cfg, params = job
+    out_dir = io.ensure_dir(cfg["outputs"]["dir"])
+    io.save_json(out_dir / "params.json", params)
+    record: Dict[str, Any] = {"run": index, "dir": str(out_dir), "params": params}
+    t0 = time.perf_counter()
+    try:
+        with (out_dir / "train.log").open("w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            run_training.run_experiment(cfg, artifacts=False)
+        record["metrics"] = json.loads((out_dir / "metrics.json").read_text())
+        record["hidden"] = json.loads((out_dir / "model_info.json").read_text())["hidden"]
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["train_s"] = time.perf_counter() - t0
+    return record
+
+
+def _jobs(base: Dict[str, Any], points: List[Dict[str, Any]], out_root: Path) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    jobs = []
+    for i, params in enumerate(points):
+        cfg = sweep.apply(base, params)
+        cfg["outputs"]["dir"] = str(out_root / f"run{i:03d}")
+        cfg["training"]["progress"] = "none"
+        jobs.append((i, cfg, params))
+    return jobs
+
+
+def _warm_cache(jobs) -> None:
+    """Build each distinct dataset cache entry once before starting workers."""
+    seen = set()
+    for _, cfg, _ in jobs:
+        key = json.dumps([cfg["dataset"], cfg["training"]["seed"]], sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            calhouse.load_dataset(cfg)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sweep", required=True, help="Sweep YAML (base, mode, space, ...)")
+    ap.add_argument("--workers", type=int, default=0, help="Worker processes (0 = cores // threads)")
+    ap.add_argument("--threads", type=int, default=0, help="Torch threads per worker (default from sweep or 1)")
+    ap.add_argument("--dry-run", action="store_true", help="List the expanded configs and exit")
+    args = ap.parse_args()
+
+    spec = yaml.safe_load(Path(args.sweep).read_text())
+    base = config_mod.load_config(spec["base"])
+    points = sweep.expand(spec["space"], spec.get("mode", "grid"), int(spec.get("samples", 0)), int(spec.get("sampler_seed", 0)))
+
+    input_dim = len(base["dataset"]["features"])
+    max_macs = int(spec.get("max_macs", 0))
+    if max_macs:
+        kept = [p for p in points if sweep.mlp_macs(input_dim, sweep.apply(base, p)["model"]["hidden"]) <= max_macs]
+        print(f"max_macs={max_macs}: {len(points) - len(kept)} of {len(points)} configs over budget")
+        points = kept
+
+    out_root = io.ensure_dir(spec.get("output_dir", str(Path(base["outputs"]["dir"]).parent / "sweep")))
+    jobs = _jobs(base, points, out_root)
+    if args.dry_run:
+        for i, _, params in jobs:
+            print(f"run{i:03d} {params}")
+        return 0
+
+    threads = args.threads or int(spec.get("threads", 1))
+    workers = args.workers or int(spec.get("workers", 0)) or max(1, (os.cpu_count() or 1) // threads)
+    workers = min(workers, len(jobs)) or 1
+    # Inherited by the workers before torch loads its OpenMP runtime.
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+
+    _warm_cache(jobs)
+    print(f"sweep: {len(jobs)} configs, {workers} workers x {threads} threads")
+
+    records: List[Dict[str, Any]] = []
+    t0 = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(threads,)) as pool:
+        futures = [pool.submit(_run_one, job) for job in jobs]
+        for fut in as_completed(futures):
+            rec = fut.result()
+            hidden = rec.get("hidden") or sweep.apply(base, rec["params"])["model"]["hidden"]
+            rec["macs"] = sweep.mlp_macs(input_dim, hidden)
+            records.append(rec)
+            status = rec.get("error") or rec["metrics"]
+            print(f"[{len(records)}/{len(jobs)}] run{rec['run']:03d} {rec['params']} -> {status}")
+    elapsed = time.perf_counter() - t0
+
+    metric = spec.get("rank_by", "rmse")
+    ranked = sweep.rank(records, metric)
+    summary = {
+        "sweep": str(args.sweep),
+        "base": str(spec["base"]),
+        "rank_by": metric,
+        "workers": workers,
+        "threads": threads,
+        "elapsed_s": elapsed,
+        "runs": ranked,
+    }
+    io.save_json(out_root / "sweep_summary.json", summary)
+
+    print(f"\nTop by {metric}:")
+    for rec in ranked[:10]:
+        if "rank" in rec:
+            print(f"  #{rec['rank']:<3d} {metric}={rec['metrics'][metric]:.5f} macs={rec['macs']:<5d} {rec['params']}")
+    failed = sum(1 for r in ranked if "error" in r)
+    if failed:
+        print(f"{failed} runs failed; see train.log in their run directories")
+    print(f"Wrote {out_root / 'sweep_summary.json'} ({elapsed:.1f}s)")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Any, Dict
 import sys
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -19,6 +20,7 @@ from nn.metrics import regression
 from nn.models import mlp_regressor
 from nn.plots import loss_curves, parity_plot
 from nn.train import eval as eval_mod
+from nn.train import prune
 from nn.train import train_loop
 from nn.utils import config as config_mod
 from nn.utils import io, seed
@@ -31,21 +33,41 @@ def print_sample_summary(sample: np.ndarray, name: str) -> None:
     print(f"{name} min: {np.min(sample):.4f}, max: {np.max(sample):.4f}")
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True)
-    ap.add_argument("--verbose", action="store_true")
-    args = ap.parse_args()
+def _draw_diagram(model, input_dim: int, cfg: Dict[str, Any]) -> None:
+    """Render the model graph (requires torchview + graphviz)."""
+    try:
+        from torchview import draw_graph
 
-    cfg = config_mod.load_config(args.config)
-    seed.set_seed(cfg["training"]["seed"])
+        graph = draw_graph(
+            model,
+            input_size=(1, input_dim),
+            expand_nested=True,
+            graph_name="mlp_regressor",
+        )
+        out_dir = io.ensure_dir(cfg["outputs"]["dir"])
+        graph.visual_graph.render(
+            filename=str(out_dir / "model_diagram"), format="png", cleanup=True
+        )
+    except Exception as exc:
+        raise RuntimeError(
+            "Model diagram generation failed. Install torchview and graphviz "
+            "(and ensure Graphviz binaries are available on PATH)."
+        ) from exc
 
-    print(f"config: {args.config}")
-    if args.verbose:
+
+def run_experiment(cfg: Dict[str, Any], verbose: bool = False, artifacts: bool = True) -> Dict[str, float]:
+    """Train, evaluate and save one config; return the test metrics.
+
+    ``artifacts=False`` skips the diagram, plots and ONNX/hls4ml exports and
+    keeps only metrics.json, model_info.json, predictions, scalers and
+    model.pt (used by the sweep runner).
+    """
+    seed.set_seed(cfg["training"]["seed"])
+    if verbose:
         print(cfg)
 
     X_train, y_train, X_val, y_val, X_test, y_test, xscaler, yscaler = calhouse.load_dataset(cfg)
-    if args.verbose:
+    if verbose:
         print_sample_summary(X_train, "X_train")
         print_sample_summary(y_train, "y_train")
         print_sample_summary(X_val, "X_val")
@@ -54,35 +76,32 @@ def main() -> int:
         print_sample_summary(y_test, "y_test")
 
 
+    # Quantization-aware training: fake-quantize to the hls4ml precision
+    qcfg = cfg.get("quantization", {}) or {}
+    precision = qcfg.get("precision", "ap_fixed<16,6>") if qcfg.get("enabled", False) else None
+
     model = mlp_regressor.build_mlp(
         input_dim=X_train.shape[1],
         hidden=cfg["model"]["hidden"],
         dropout=cfg["model"]["dropout"],
+        precision=precision,
     )
 
     # Save model diagram (requires torchview + graphviz)
-    try:
-        from torchview import draw_graph
+    if artifacts:
+        _draw_diagram(model, X_train.shape[1], cfg)
 
-        graph = draw_graph(
-            model,
-            input_size=(1, X_train.shape[1]),
-            expand_nested=True,
-            graph_name="mlp_regressor",
-        )
-        out_dir = io.ensure_dir(cfg["outputs"]["dir"])
-        graph.visual_graph.render(
-            filename=str(out_dir / "model_diagram"), format="png", cleanup=True
-        )
-    except Exception as exc:
-        raise RuntimeError(
-            "Model diagram generation failed. Install torchview and graphviz "
-            "(and ensure Graphviz binaries are available on PATH)."
-        ) from exc
-
-    model, train_losses, val_losses = train_loop.run_train(
+    model, train_losses, val_losses, best_epoch = train_loop.run_train(
         model, (X_train, y_train), (X_val, y_val), cfg
     )
+    epochs_run = len(val_losses)
+
+    # Structured pruning: drop hidden neurons and fine-tune between rounds
+    prune_history = []
+    if (cfg.get("pruning", {}) or {}).get("enabled", False):
+        model, tl, vl, prune_history = prune.run_pruning(model, (X_train, y_train), (X_val, y_val), cfg)
+        train_losses += tl
+        val_losses += vl
 
     metrics = eval_mod.run_eval(model, (X_test, y_test))
 
@@ -91,18 +110,26 @@ def main() -> int:
     io.save_json(out_dir / "metrics.json", metrics)
     io.save_json(
         out_dir / "model_info.json",
-        {"input_dim": int(X_train.shape[1]), "hidden": cfg["model"]["hidden"]},
+        {
+            "input_dim": int(X_train.shape[1]),
+            "hidden": prune.hidden_sizes(model),
+            "epochs_run": epochs_run,
+            "best_epoch": best_epoch,
+            **({"precision": precision} if precision else {}),
+            **({"pruning": prune_history} if prune_history else {}),
+        },
     )
 
-    loss_curves.plot_loss(train_losses, val_losses, out_dir / "loss_curves.png")
-
     # Parity plot from test set
     model.eval()
     import torch
 
     with torch.no_grad():
         preds = model(torch.from_numpy(X_test).float()).numpy().squeeze()
-    parity_plot.plot_parity(y_test, preds, out_dir / "parity.png")
+
+    if artifacts:
+        loss_curves.plot_loss(train_losses, val_losses, out_dir / "loss_curves.png")
+        parity_plot.plot_parity(y_test, preds, out_dir / "parity.png")
 
     # Save predictions
     io.save_numpy(out_dir / "y_test.npy", y_test)
@@ -115,17 +142,44 @@ def main() -> int:
     )
 
 
-    if cfg["export"].get("onnx", False):
-        onnx_export.export_onnx(model, X_train.shape[1], out_dir / "model.onnx")
+    # QAT models are exported as plain Linear layers with on-grid weights
+    export_model = mlp_regressor.export_float(model) if precision else model
+
+    if artifacts and cfg["export"].get("onnx", False):
+        onnx_export.export_onnx(export_model, X_train.shape[1], out_dir / "model.onnx")
 
-    if cfg["export"].get("hls4ml_stub", False):
-        hls4ml_stub.emit_stub(out_dir / "model.onnx", out_dir / "hls4ml_config.yaml")
+    if artifacts and cfg["export"].get("hls4ml_stub", False):
+        hls4ml_stub.emit_stub(
+            out_dir / "model.onnx", out_dir / "hls4ml_config.yaml", precision=precision or "ap_fixed<16,6>"
+        )
 
     # Save PyTorch weights for hls4ml PyTorch frontend
-    torch.save(model.state_dict(), out_dir / "model.pt")
+    torch.save(export_model.state_dict(), out_dir / "model.pt")
 
     print(f"metrics: {metrics}")
+    return metrics
+
 
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    ap.add_argument("--verbose", action="store_true")
+    ap.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        default=None,
+        help="Continue from a training checkpoint (default <outputs.dir>/checkpoint.pt)",
+    )
+    args = ap.parse_args()
+
+    cfg = config_mod.load_config(args.config)
+    if args.resume is not None:
+        tcfg = cfg["training"]
+        default = (tcfg.get("checkpoint", {}) or {}).get("path") or str(Path(cfg["outputs"]["dir"]) / "checkpoint.pt")
+        tcfg["resume"] = args.resume or default
+    print(f"config: {args.config}")
+    run_experiment(cfg, verbose=args.verbose)
     return 0
 
 
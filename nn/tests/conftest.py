@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Import the host package as `nnfpga`, the same root the nn and sim scripts use.
+PKG_ROOT = Path(__file__).resolve().parents[2] / "host" / "python"
+if str(PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(PKG_ROOT))
@@ -0,0 +1,41 @@
+from nn.utils import build_state
+
+
+def _keys(tmp_path, precision="ap_fixed<16,6>", extra=None):
+    ckpt = tmp_path / "model.pt"
+    if not ckpt.exists():
+        ckpt.write_bytes(b"weights-v1")
+    return build_state.stage_keys([ckpt], {"Model": {"Precision": precision}}, {"part": "xc7a200t"}, {"extra": extra or {}})
+
+
+def test_keys_follow_inputs(tmp_path):
+    k1 = _keys(tmp_path)
+    assert k1 == _keys(tmp_path)
+    k2 = _keys(tmp_path, extra={"fifo_opt": True})
+    assert k2["write"] == k1["write"] and k2["csim"] == k1["csim"]
+    assert k2["synth"] != k1["synth"] and k2["cosim"] != k1["cosim"]
+    (tmp_path / "model.pt").write_bytes(b"weights-v2")
+    assert all(a != b for a, b in zip(_keys(tmp_path).values(), k1.values()))
+
+
+def test_plan_skips_fresh_stages(tmp_path):
+    keys = _keys(tmp_path)
+    state = build_state.BuildState(tmp_path / "prj")
+    want = {"csim": True, "synth": True}
+    assert build_state.plan(state, keys, want, synth_present=False) == ["csim", "synth"]
+    for s in ("csim", "synth"):
+        state.mark(s, keys[s])
+
+    reloaded = build_state.BuildState(tmp_path / "prj")
+    assert build_state.plan(reloaded, keys, want, synth_present=True) == []
+    # Report deleted: synth must rerun even though its inputs match
+    assert build_state.plan(reloaded, keys, want, synth_present=False) == ["synth"]
+    assert build_state.plan(reloaded, keys, {"cosim": True}, synth_present=True) == ["cosim"]
+
+    changed = _keys(tmp_path, extra={"fifo_opt": True})
+    assert build_state.plan(reloaded, changed, {"cosim": True}, synth_present=True) == ["synth", "cosim"]
+
+    reloaded.invalidate(build_state.BUILD_STAGES)
+    assert build_state.plan(reloaded, keys, want, synth_present=True) == ["csim", "synth"]
+    reloaded.clear()
+    assert not (tmp_path / "prj" / build_state.STATE_NAME).exists()
@@ -0,0 +1,50 @@
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from nn.datasets import calhouse
+
+
+def _write_zip(path: Path, rows: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    lines = ["a,b,target"] + [f"{a:.4f},{b:.4f},{t:.4f}" for a, b, t in rng.normal(size=(rows, 3))]
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("housing.csv", "\n".join(lines) + "\n")
+
+
+def _cfg(tmp_path: Path) -> dict:
+    return {
+        "dataset": {
+            "zip_path": str(tmp_path / "data.zip"),
+            "features": ["a", "b"],
+            "target": "target",
+            "split": [0.8, 0.1, 0.1],
+            "cache_dir": str(tmp_path / "cache"),
+        },
+        "training": {"seed": 42},
+    }
+
+
+def test_cached_splits_match_and_invalidate(tmp_path: Path):
+    cfg = _cfg(tmp_path)
+    _write_zip(tmp_path / "data.zip", 200, seed=0)
+    fresh = calhouse.load_dataset(cfg)
+    cached = calhouse.load_dataset(cfg)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    for a, b in zip(fresh[:6], cached[:6]):
+        assert isinstance(b, np.memmap)
+        np.testing.assert_array_equal(a, b)
+    np.testing.assert_allclose(cached[6].transform(np.ones((1, 2))), fresh[6].transform(np.ones((1, 2))))
+    np.testing.assert_allclose(cached[7].inverse_transform([[1.0]]), fresh[7].inverse_transform([[1.0]]))
+
+    # Changed zip or seed -> new entry
+    _write_zip(tmp_path / "data.zip", 150, seed=1)
+    assert calhouse.load_dataset(cfg)[0].shape[0] == 120
+    cfg["training"]["seed"] = 7
+    calhouse.load_dataset(cfg)
+    assert len(list((tmp_path / "cache").iterdir())) == 3
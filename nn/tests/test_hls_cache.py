@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from nn.utils import hls_cache
+
+
+class _FakeConfig:
+    def __init__(self, out_dir: Path, precision: str) -> None:
+        self.out_dir = out_dir
+        self.config = {"HLSConfig": {"Model": {"Precision": precision, "ReuseFactor": 1}}}
+
+    def get_output_dir(self) -> str:
+        return str(self.out_dir)
+
+    def get_project_name(self) -> str:
+        return "myproject"
+
+
+class _FakeModel:
+    def __init__(self, out_dir: Path, precision: str = "ap_fixed<16,6>") -> None:
+        self.config = _FakeConfig(out_dir, precision)
+        self.compiles = 0
+        self.loaded = None
+        self._top_function_lib = None
+
+    def compile(self) -> None:
+        self.compiles += 1
+        fw = Path(self.config.out_dir) / "firmware"
+        fw.mkdir(parents=True, exist_ok=True)
+        (fw / "myproject-1234.so").write_bytes(b"lib" + self.config.config["HLSConfig"]["Model"]["Precision"].encode())
+
+
+def test_compile_cache_hit_miss_and_lru(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(hls_cache, "_load_library", lambda m, lib: setattr(m, "loaded", lib))
+    ckpt = tmp_path / "model.pt"
+    ckpt.write_bytes(b"weights-v1")
+    cfg = {"hls4ml": {"compile_cache": {"dir": str(tmp_path / "cache"), "max_entries": 2}}}
+
+    first = _FakeModel(tmp_path / "prj")
+    assert hls_cache.compile_from_config(first, cfg, [ckpt]) is False
+    again = _FakeModel(tmp_path / "prj2")
+    assert hls_cache.compile_from_config(again, cfg, [ckpt]) is True
+    assert again.compiles == 0 and again.loaded.read_bytes() == b"libap_fixed<16,6>"
+
+    # New weights or precision miss the cache
+    ckpt.write_bytes(b"weights-v2")
+    assert hls_cache.compile_from_config(_FakeModel(tmp_path / "p3"), cfg, [ckpt]) is False
+    assert hls_cache.compile_from_config(_FakeModel(tmp_path / "p4", "ap_fixed<8,3>"), cfg, [ckpt]) is False
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    # Disabled cache always compiles
+    cfg["hls4ml"]["compile_cache"]["enabled"] = False
+    plain = _FakeModel(tmp_path / "p5")
+    assert hls_cache.compile_from_config(plain, cfg, [ckpt]) is None
+    assert plain.compiles == 1
+
+
+def test_compile_without_library_handle_bypasses_cache(tmp_path: Path):
+    model = _FakeModel(tmp_path / "prj")
+    del model._top_function_lib
+    cfg = {"hls4ml": {"compile_cache": {"dir": str(tmp_path / "cache")}}}
+    with pytest.warns(UserWarning, match="_top_function_lib"):
+        assert hls_cache.compile_from_config(model, cfg, []) is False
+    assert model.compiles == 1
+    assert not (tmp_path / "cache").exists()
+
+
+def test_supported_versions_match_major_minor(tmp_path: Path, monkeypatch):
+    model = _FakeModel(tmp_path / "prj")
+    for version, ok in [("1.2.0", True), ("1.1.3", True), ("1.10.0", False), ("1.21", False), ("", True)]:
+        monkeypatch.setattr(hls_cache, "_hls4ml_version", lambda: version)
+        assert hls_cache._can_load_library(model) is ok, version
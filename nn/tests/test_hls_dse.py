@@ -0,0 +1,73 @@
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_stub_runner():
+    spec = importlib.util.spec_from_file_location("hls_stub_runner", ROOT / "nn" / "scripts" / "hls_stub_runner.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _base_config(tmp_path: Path, dropout: float) -> dict:
+    info = tmp_path / "model_info.json"
+    info.write_text(json.dumps({"input_dim": 8, "hidden": [8, 4]}))
+    return {
+        "model": {
+            "source": "pytorch",
+            "output_dir": str(tmp_path / "hls4ml"),
+            "pytorch": {"model_info": str(info), "input_dim": 8, "hidden": [64, 64], "dropout": dropout},
+        },
+        "hls4ml": {"precision": "ap_fixed<16,6>", "reuse_factor": 1, "strategy": "Latency", "clock_period": 10.0},
+    }
+
+
+def test_layer_reuse_follows_dropout_indices(tmp_path: Path):
+    stub = _load_stub_runner()
+    from nnfpga import apfixed
+
+    assert stub.apfixed is apfixed  # same import root as mlp_regressor and the host tools
+    h = {"reuse_factor": 1, "layer_reuse": {"model_3": 8}}
+    with_dropout = _base_config(tmp_path, 0.1)
+    assert stub._linear_index(with_dropout, [8, 8, 4, 1]) == [0, 3, 6]
+    assert stub._layer_reuse(h, [0, 3, 6]) == [1, 8, 1]
+    assert stub._layer_reuse(h, [0, 2, 4]) == [1, 1, 1]
+    assert stub._layer_reuse({"layer_reuse": {"model_2": 4}}, [0, 2, 4]) == [1, 4, 1]
+
+
+def test_stub_dse_end_to_end(tmp_path: Path):
+    base = tmp_path / "base.yaml"
+    base.write_text(yaml.safe_dump(_base_config(tmp_path, 0.1)))
+    dse = tmp_path / "dse.yaml"
+    dse.write_text(
+        yaml.safe_dump(
+            {
+                "base": str(base),
+                "runner": "stub",
+                "workers": 2,
+                "compare": False,
+                "output_dir": str(tmp_path / "dse"),
+                "space": {"hls4ml.layer_reuse": [{}, {"model_3": 8}], "hls4ml.precision": ["ap_fixed<16,6>", "ap_fixed<8,3>"]},
+            }
+        )
+    )
+    script = ROOT / "nn" / "scripts" / "run_hls4ml_dse.py"
+    subprocess.run([sys.executable, str(script), "--dse", str(dse)], cwd=ROOT, check=True, capture_output=True)
+
+    summary = json.loads((tmp_path / "dse" / "dse_summary.json").read_text())
+    variants = {(json.dumps(v["params"]["hls4ml.layer_reuse"]), v["params"]["hls4ml.precision"]): v for v in summary["variants"]}
+    assert len(variants) == 4 and not any("error" in v for v in variants.values())
+    flat = variants[("{}", "ap_fixed<16,6>")]
+    reused = variants[('{"model_3": 8}', "ap_fixed<16,6>")]
+    assert flat["IntervalMax"] == 1 and reused["IntervalMax"] == 8
+    assert reused["DSP"] == flat["DSP"] - (8 * 4 - 4)  # second Linear: 32 multipliers -> 4
+    assert variants[("{}", "ap_fixed<8,3>")]["DSP"] == 0
+    assert summary["pareto"]
+    assert (tmp_path / "dse" / "dse_table.csv").exists()
@@ -0,0 +1,63 @@
+import pytest
+
+from nn.utils import build_state, hls_history, hls_report
+
+
+def _project(path, latency, lut):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "project.tcl").write_text('set project_name "myproject"\nset backend "vitis"\n')
+    xml = path / "myproject_prj" / "solution1" / "syn" / "report" / "myproject_csynth.xml"
+    hls_report.write_csynth_xml(
+        xml,
+        {"Part": "xc7a200t", "TargetClockPeriod": 10.0, "EstimatedClockPeriod": 7.1, "WorstLatency": latency,
+         "BestLatency": latency, "IntervalMax": 1, "IntervalMin": 1, "LUT": lut, "FF": 900, "DSP": 12, "BRAM_18K": 0},
+    )
+    return path
+
+
+def test_ingest_dedup_and_compare(tmp_path):
+    conn = hls_history.connect(tmp_path / "h.sqlite")
+    prj = _project(tmp_path / "prj", latency=20, lut=4000)
+    build_state.BuildState(prj).mark("write", "cfgA")
+
+    first, inserted = hls_history.ingest_project(conn, prj, label="calhouse", repo=tmp_path)
+    assert inserted
+    assert hls_history.ingest_project(conn, prj, label="calhouse", repo=tmp_path) == (first, False)
+    assert hls_history.ingest_project(conn, tmp_path / "missing") is None
+
+    _project(prj, latency=26, lut=3900)
+    build_state.BuildState(prj).mark("write", "cfgB")
+    second, _ = hls_history.ingest_project(conn, prj, label="calhouse", repo=tmp_path)
+
+    rows = hls_history.runs(conn, "calhouse")
+    assert [r["id"] for r in rows] == [first, second]
+    assert [r["config_hash"] for r in rows] == ["cfgA", "cfgB"]
+    assert hls_history.get_run(conn, "prev", "calhouse")["id"] == first
+    assert hls_history.get_run(conn, "latest", "calhouse")["WorstLatency"] == 26
+
+    diff = {d["metric"]: d for d in hls_history.compare(rows[0], rows[1], tolerance=0.1)}
+    assert diff["WorstLatency"]["regressed"] and diff["WorstLatency"]["delta"] == 6
+    assert not diff["LUT"]["regressed"] and not diff["DSP"]["regressed"]
+    assert not any(d["regressed"] for d in hls_history.compare(rows[0], rows[1], tolerance=0.5))
+
+    with pytest.raises(LookupError):
+        hls_history.get_run(conn, "999")
+
+
+def test_default_label_is_repo_relative(tmp_path, monkeypatch):
+    conn = hls_history.connect(tmp_path / "h.sqlite")
+    a = _project(tmp_path / "out" / "a" / "hls4ml", latency=20, lut=4000)
+    b = _project(tmp_path / "out" / "b" / "hls4ml", latency=50, lut=9000)
+    monkeypatch.chdir(tmp_path)
+    run_a, _ = hls_history.ingest_project(conn, a.resolve(), repo=tmp_path)  # absolute, like run_hls4ml
+    _project(a, latency=22, lut=4000)
+    run_a2, _ = hls_history.ingest_project(conn, "out/a/hls4ml", repo=tmp_path)  # relative, like ingest --config
+    assert {r["label"] for r in hls_history.runs(conn)} == {"out/a/hls4ml"}
+
+    run_b, _ = hls_history.ingest_project(conn, b, repo=tmp_path)
+    # latest/prev without a label stay within the newest run's project
+    assert hls_history.get_run(conn, "latest")["id"] == run_b
+    with pytest.raises(LookupError):
+        hls_history.get_run(conn, "prev")
+    assert hls_history.get_run(conn, "prev", "out/a/hls4ml")["id"] == run_a
+    assert hls_history.get_run(conn, "latest", "out/a/hls4ml")["id"] == run_a2
@@ -0,0 +1,85 @@
+from nn.utils import hls_report, sweep
+
+_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<profile>
+  <UserAssignments><Part>xc7a200tsbg484-1</Part><TopModelName>myproject</TopModelName><TargetClockPeriod>10.00</TargetClockPeriod></UserAssignments>
+  <PerformanceEstimates>
+    <SummaryOfTimingAnalysis><EstimatedClockPeriod>7.256</EstimatedClockPeriod></SummaryOfTimingAnalysis>
+    <SummaryOfOverallLatency>
+      <Best-caseLatency>14</Best-caseLatency><Worst-caseLatency>15</Worst-caseLatency>
+      <Interval-min>1</Interval-min><Interval-max>2</Interval-max>
+    </SummaryOfOverallLatency>
+  </PerformanceEstimates>
+  <AreaEstimates>
+    <Resources><BRAM_18K>0</BRAM_18K><DSP48E>42</DSP48E><FF>3100</FF><LUT>5200</LUT><URAM>0</URAM></Resources>
+    <AvailableResources><BRAM_18K>730</BRAM_18K><DSP48E>740</DSP48E><FF>267600</FF><LUT>133800</LUT><URAM>0</URAM></AvailableResources>
+  </AreaEstimates>
+</profile>
+"""
+
+
+def _project(tmp_path):
+    (tmp_path / "project.tcl").write_text('set project_name "myproject"\nset backend "vitis"\n')
+    rpt_dir = tmp_path / "myproject_prj" / "solution1" / "syn" / "report"
+    rpt_dir.mkdir(parents=True)
+    (rpt_dir / "myproject_csynth.xml").write_text(_XML)
+    return rpt_dir / "myproject_csynth.xml"
+
+
+def test_find_and_parse_csynth(tmp_path):
+    xml = _project(tmp_path)
+    assert hls_report.find_synth_report(tmp_path, "xml") == xml
+    assert hls_report.find_synth_report(tmp_path / "missing", "xml") is None
+    r = hls_report.parse_csynth_xml(xml)
+    assert (r["BestLatency"], r["WorstLatency"], r["IntervalMax"]) == (14, 15, 2)
+    assert (r["DSP"], r["LUT"], r["AvailableDSP"]) == (42, 5200, 740)
+    assert r["EstimatedClockPeriod"] == 7.256 and r["TopModelName"] == "myproject"
+
+
+def test_write_round_trip(tmp_path):
+    r = hls_report.parse_csynth_xml(_project(tmp_path))
+    out = tmp_path / "copy.xml"
+    hls_report.write_csynth_xml(out, r)
+    assert hls_report.parse_csynth_xml(out) == r
+
+
+def test_pareto_front():
+    recs = [
+        {"n": "a", "lat": 10, "lut": 100},
+        {"n": "b", "lat": 5, "lut": 200},
+        {"n": "c", "lat": 10, "lut": 150},  # dominated by a
+        {"n": "d", "lat": 20, "lut": 50},
+        {"n": "e", "lat": None, "lut": 10},  # incomplete, skipped
+    ]
+    assert [r["n"] for r in sweep.pareto_front(recs, ["lat", "lut"])] == ["a", "b", "d"]
+
+
+def test_stage_output_error(tmp_path):
+    _project(tmp_path)
+    sol = tmp_path / "myproject_prj" / "solution1"
+    assert hls_report.stage_output_error(tmp_path, "synth") == ""
+    assert hls_report.stage_output_error(tmp_path, "csim") == "no csim log"
+    assert hls_report.stage_output_error(tmp_path, "cosim") == "no cosim report"
+    assert hls_report.stage_output_error(tmp_path, "export").startswith("no exported IP")
+
+    log = sol / "csim" / "report" / "myproject_csim.log"
+    log.parent.mkdir(parents=True)
+    log.write_text("INFO: [SIM 211-2] *************** CSIM start ***************\nERROR: [SIM 211-100] 'csim_design' failed: compilation error(s).\n")
+    assert hls_report.stage_output_error(tmp_path, "csim").startswith("csim failed")
+    log.write_text("INFO: [SIM 1] CSim done with 0 errors.\n")
+    (tmp_path / "tb_data").mkdir()
+    (tmp_path / "tb_data" / "tb_input_features.dat").write_text("0 0\n")
+    assert "no results" in hls_report.stage_output_error(tmp_path, "csim")
+    (tmp_path / "tb_data" / "csim_results.log").write_text("0.5\n")
+    assert hls_report.stage_output_error(tmp_path, "csim") == ""
+
+    rpt = sol / "sim" / "report" / "myproject_cosim.rpt"
+    rpt.parent.mkdir(parents=True)
+    rpt.write_text("| RTL     | Status |\n|     VHDL|      NA|\n|  Verilog|    Fail|\n")
+    assert hls_report.stage_output_error(tmp_path, "cosim").startswith("cosim did not pass")
+    rpt.write_text("| RTL     | Status |\n|     VHDL|      NA|\n|  Verilog|    Pass|\n")
+    assert hls_report.stage_output_error(tmp_path, "cosim") == ""
+
+    (sol / "impl" / "ip").mkdir(parents=True)
+    (sol / "impl" / "ip" / "component.xml").write_text("<component/>")
+    assert hls_report.stage_output_error(tmp_path, "export") == ""
@@ -9,3 +9,16 @@ def test_metrics():
     assert regression.mae(y_true, y_pred) == 1.0 / 3.0
     assert regression.rmse(y_true, y_pred) == np.sqrt((0 + 1 + 0) / 3)
     assert regression.r2(y_true, y_pred) < 1.0
+
+
+def test_running_metrics_match_batch():
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(size=1000)
+    y_pred = y_true + rng.normal(scale=0.3, size=1000)
+    running = regression.RunningRegression()
+    for s in range(0, 1000, 137):
+        running.update(y_true[s : s + 137], y_pred[s : s + 137])
+    assert running.n == 1000
+    assert np.isclose(running.mae(), regression.mae(y_true, y_pred))
+    assert np.isclose(running.rmse(), regression.rmse(y_true, y_pred))
+    assert np.isclose(running.r2(), regression.r2(y_true, y_pred))
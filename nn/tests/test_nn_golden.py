@@ -0,0 +1,100 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+import yaml
+
+from nn.datasets import calhouse
+from nn.models import mlp_regressor
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_nn_golden():
+    spec = importlib.util.spec_from_file_location("nn_golden", ROOT / "sim" / "models" / "nn_golden.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_bulk_count_out_roundtrip(tmp_path: Path, monkeypatch):
+    nn_golden = _load_nn_golden()
+    from nnfpga import fixedpoint, fixtures, proto
+
+    rng = np.random.default_rng(0)
+    X_test = rng.uniform(-2, 2, size=(20, 8)).astype(np.float32)
+    split = (X_test, np.zeros(20, np.float32))
+    monkeypatch.setattr(calhouse, "load_dataset", lambda cfg: (*split, *split, *split, None, None))
+
+    cfg = yaml.safe_load((ROOT / "nn" / "configs" / "calhouse.yaml").read_text())
+    cfg["model"].update(hidden=[4], dropout=0.0)
+    (tmp_path / "cfg.yaml").write_text(yaml.safe_dump(cfg))
+    torch.manual_seed(0)
+    model = mlp_regressor.build_mlp(8, [4])
+    torch.save(model.state_dict(), tmp_path / "model.pt")
+
+    out = tmp_path / "set.nnfx"
+    argv = ["nn_golden.py", "--config", str(tmp_path / "cfg.yaml"), "--checkpoint", str(tmp_path / "model.pt")]
+    argv += ["--bulk", "--index", "3", "--count", "7", "--batch", "3", "--out", str(out)]
+    monkeypatch.setattr(sys, "argv", argv)
+    assert nn_golden.main() == 0
+
+    x = X_test[3:10]
+    with torch.no_grad():
+        y = model(torch.from_numpy(x)).numpy()
+    with fixtures.FixtureSet(out) as fx:
+        assert len(fx) == 3  # 3 + 3 + 1 rows
+        reqs = [proto.PacketDecoder().feed(bytes(fx.request(i)))[0] for i in range(len(fx))]
+        rsps = [proto.PacketDecoder().feed(bytes(fx.response(i)))[0] for i in range(len(fx))]
+    assert {p.pkt_type for p in reqs} == {proto.INFER_BATCH_REQ}
+    assert {p.pkt_type for p in rsps} == {proto.INFER_BATCH_RSP}
+    assert b"".join(p.payload for p in reqs) == fixedpoint.pack_array(x)
+    assert b"".join(p.payload for p in rsps) == fixedpoint.pack_array(y.reshape(-1))
+
+
+def test_write_bulk_sizes_follow_word_and_output_dim(tmp_path: Path):
+    nn_golden = _load_nn_golden()
+    from nnfpga import fixtures
+
+    payload_in = bytes(range(5 * 3 * 4))  # 5 rows, 3 inputs, 32-bit words
+    payload_out = bytes(range(5 * 2 * 4))  # 2 outputs
+    path = tmp_path / "wide.nnfx"
+    assert nn_golden._write_bulk(path, payload_in, payload_out, 5, 3, 2, 0, data_width=32) == 5
+    with fixtures.FixtureSet(path) as fx:
+        assert bytes(fx.response(4))[6:] == payload_out[32:40]
+        assert bytes(fx.request(1))[6:] == payload_in[12:24]
+
+
+def test_pruned_checkpoint_uses_model_info(tmp_path: Path, monkeypatch):
+    nn_golden = _load_nn_golden()
+    from nnfpga import fixedpoint, fixtures, proto
+
+    from nn.train import prune
+
+    rng = np.random.default_rng(1)
+    X_test = rng.uniform(-2, 2, size=(6, 8)).astype(np.float32)
+    split = (X_test, np.zeros(6, np.float32))
+    monkeypatch.setattr(calhouse, "load_dataset", lambda cfg: (*split, *split, *split, None, None))
+
+    cfg = yaml.safe_load((ROOT / "nn" / "configs" / "calhouse.yaml").read_text())
+    cfg["model"].update(hidden=[16], dropout=0.1)
+    (tmp_path / "cfg.yaml").write_text(yaml.safe_dump(cfg))
+    torch.manual_seed(0)
+    pruned = prune.shrink(mlp_regressor.build_mlp(8, [16], dropout=0.1), [list(range(0, 16, 2))]).eval()
+    out_dir = tmp_path / "run"
+    out_dir.mkdir()
+    torch.save(pruned.state_dict(), out_dir / "model.pt")
+    (out_dir / "model_info.json").write_text('{"input_dim": 8, "hidden": [8]}')
+
+    out = tmp_path / "set.nnfx"
+    argv = ["nn_golden.py", "--config", str(tmp_path / "cfg.yaml"), "--checkpoint", str(out_dir / "model.pt")]
+    monkeypatch.setattr(sys, "argv", argv + ["--bulk", "--out", str(out)])
+    assert nn_golden.main() == 0
+
+    with torch.no_grad():
+        y = pruned(torch.from_numpy(X_test)).numpy()
+    with fixtures.FixtureSet(out) as fx:
+        rsps = [proto.PacketDecoder().feed(bytes(fx.response(i)))[0] for i in range(len(fx))]
+    assert b"".join(p.payload for p in rsps) == fixedpoint.pack_array(y.reshape(-1))
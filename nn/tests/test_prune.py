@@ -0,0 +1,54 @@
+import numpy as np
+import torch
+
+from nn.models import mlp_regressor
+from nn.train import prune
+
+
+def test_shrink_keeps_selected_neurons_exactly():
+    torch.manual_seed(0)
+    model = mlp_regressor.build_mlp(8, [6, 5])
+    keep = [[0, 2, 5], [1, 4]]
+    small = prune.shrink(model, keep)
+    assert prune.hidden_sizes(small) == [3, 2]
+
+    # Zeroing the dropped neurons' outgoing weights in the big model gives the same function
+    with torch.no_grad():
+        lin = [m for m in model if isinstance(m, torch.nn.Linear)]
+        lin[1].weight[:, [1, 3, 4]] = 0
+        lin[2].weight[:, [0, 2, 3]] = 0
+    x = torch.randn(16, 8)
+    assert torch.allclose(model(x), small(x), atol=1e-6)
+
+
+def test_scores_rank_dead_neurons_last():
+    torch.manual_seed(1)
+    model = mlp_regressor.build_mlp(4, [5])
+    with torch.no_grad():
+        model[2].weight[:, 3] = 0  # neuron 3 feeds nothing
+    assert prune.select_neurons(model, [4]) == [[0, 1, 2, 4]]
+
+
+def test_schedule_and_quantized_shrink():
+    assert prune.schedule([16, 32], 0.5, 2, min_neurons=2) == [[12, 23], [8, 16]]
+    assert prune.schedule([3], 0.9, 1, min_neurons=2) == [[2]]
+    qat = mlp_regressor.build_mlp(8, [16, 32], precision="ap_fixed<10,4>")
+    small = prune.shrink(qat, prune.select_neurons(qat, [8, 16]))
+    assert isinstance(small[0], mlp_regressor.QuantLinear) and str(small[0].fixed) == "ap_fixed<10,4>"
+    assert set(small.state_dict()) == set(mlp_regressor.build_mlp(8, [8, 16]).state_dict())
+
+
+def test_run_pruning_shrinks_and_finetunes():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 8)).astype(np.float32)
+    y = (X @ np.linspace(-1.0, 1.0, 8)).astype(np.float32)
+    cfg = {
+        "training": {"epochs": 3, "batch_size": 32, "lr": 1e-2, "weight_decay": 0.0, "progress": "none"},
+        "pruning": {"enabled": True, "sparsity": 0.5, "rounds": 2, "finetune_epochs": 2},
+    }
+    torch.manual_seed(0)
+    model = mlp_regressor.build_mlp(8, [16, 32])
+    model, tl, vl, history = prune.run_pruning(model, (X[:320], y[:320]), (X[320:], y[320:]), cfg)
+    assert prune.hidden_sizes(model) == [8, 16]
+    assert [h["hidden"] for h in history] == [[12, 23], [8, 16]]
+    assert len(vl) == 4 and history[-1]["macs"] == 8 * 8 + 8 * 16 + 16
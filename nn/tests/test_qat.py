@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from nnfpga.apfixed import FixedType
+from nn.models import mlp_regressor
+from nn.train import train_loop
+
+
+@pytest.mark.parametrize("rounding", ["AP_TRN", "AP_TRN_ZERO", "AP_RND", "AP_RND_ZERO", "AP_RND_INF", "AP_RND_MIN_INF", "AP_RND_CONV"])
+@pytest.mark.parametrize("overflow", ["AP_WRAP", "AP_SAT", "AP_SAT_SYM", "AP_SAT_ZERO"])
+def test_fake_quantize_matches_apfixed(rounding, overflow):
+    t = FixedType(8, 3, True, rounding, overflow)
+    vals = np.arange(-4000, 4000, 7) / 256.0  # ties included
+    got = mlp_regressor.fake_quantize(torch.tensor(vals, dtype=torch.float32), t).numpy()
+    assert np.array_equal(got * (1 << t.frac), t.from_float(vals))
+
+
+def test_straight_through_gradient():
+    t = FixedType.parse("ap_fixed<8,3>")
+    x = torch.linspace(-1, 1, 11, requires_grad=True)
+    mlp_regressor.fake_quantize(x, t).sum().backward()
+    assert torch.all(x.grad == 1)
+
+
+def test_qat_model_state_dict_and_export():
+    torch.manual_seed(0)
+    prec = "ap_fixed<10,4,AP_RND,AP_SAT>"
+    qat = mlp_regressor.build_mlp(8, [16, 8], dropout=0.1, precision=prec)
+    plain = mlp_regressor.build_mlp(8, [16, 8], dropout=0.1)
+    assert list(qat.state_dict()) == list(plain.state_dict())
+    assert type(qat[0].fixed) is FixedType  # one nnfpga.apfixed per process
+
+    qat.eval()
+    x = torch.randn(32, 8)
+    lsb = 2.0**-6
+    y = qat(x)
+    assert torch.equal(torch.round(y / lsb) * lsb, y)
+
+    mlp_regressor.set_quantization(qat, False)
+    plain.load_state_dict(qat.state_dict())
+    plain.eval()
+    assert torch.equal(qat(x), plain(x))
+
+    exported = mlp_regressor.export_float(qat)
+    assert all(type(m) is not mlp_regressor.QuantLinear for m in exported)
+    plain.load_state_dict(exported.state_dict())
+    for m in plain:
+        if isinstance(m, torch.nn.Linear):
+            assert torch.equal(torch.round(m.weight / lsb) * lsb, m.weight)
+
+
+def test_qat_training_reduces_loss():
+    rng = np.random.default_rng(0)
+    w = np.linspace(-1.0, 1.0, 8)
+    X = rng.normal(size=(400, 8)).astype(np.float32)
+    y = (X @ w).astype(np.float32)
+    cfg = {
+        "training": {"epochs": 6, "batch_size": 32, "lr": 1e-2, "weight_decay": 0.0, "progress": "none"},
+        "quantization": {"enabled": True, "precision": "ap_fixed<10,4,AP_RND,AP_SAT>", "start_epoch": 2},
+    }
+    torch.manual_seed(0)
+    model = mlp_regressor.build_mlp(8, [16], precision=cfg["quantization"]["precision"])
+    model, tl, vl, _ = train_loop.run_train(model, (X[:320], y[:320]), (X[320:], y[320:]), cfg)
+    assert vl[-1] < vl[0]
+    assert all(m.quant_enabled for m in model if isinstance(m, mlp_regressor.QuantLinear))
+
+
+def test_float_model_does_not_import_apfixed():
+    code = (
+        "import sys; from nn.models import mlp_regressor; mlp_regressor.build_mlp(8, [4]); "
+        "assert not [m for m in sys.modules if m.endswith('apfixed')]"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[2], check=True)
@@ -0,0 +1,79 @@
+import importlib.util
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load_run_hil():
+    spec = importlib.util.spec_from_file_location("run_hil", ROOT / "nn" / "scripts" / "run_hil.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_stream_eval_against_emulator(tmp_path: Path):
+    pytest.importorskip("serial")
+    run_hil = _load_run_hil()
+    from nnfpga import apfixed, client, emulator, fixedpoint
+
+    assert run_hil.client is client and run_hil.apfixed is emulator.apfixed  # one import root
+
+    rng = np.random.default_rng(1)
+    state = {
+        "0.weight": rng.normal(0, 0.5, (6, 8)),
+        "0.bias": rng.normal(0, 0.1, 6),
+        "2.weight": rng.normal(0, 0.5, (1, 6)),
+        "2.bias": rng.normal(0, 0.1, 1),
+    }
+    np.savez(tmp_path / "model.npz", **state)
+    cfg = {
+        "model": {"source": "pytorch", "pytorch": {"checkpoint": str(tmp_path / "model.npz")}},
+        "hls4ml": {"precision": "ap_fixed<16,6>"},
+    }
+    X = rng.uniform(-2, 2, size=(100, 8))
+    X_q = fixedpoint.unpack_values_array(fixedpoint.pack_array(X), dim=8)
+    golden = run_hil._golden(cfg, "fixed-point", X_q, 0)
+    y_true = golden + rng.normal(0, 0.01, golden.shape)
+
+    # The board runs the same network, except one output is off by 3 LSB
+    mlp = apfixed.ApFixedMLP.from_checkpoint(tmp_path / "model.npz", cfg)
+
+    def _model(x):
+        y = mlp(x)
+        y[np.all(x == X_q[7], axis=1)] += 3 / 1024
+        return y
+
+    emu = emulator.DeviceEmulator(model=_model, in_dim=8)
+    master, slave, name = emulator.open_pty()
+    stop = threading.Event()
+    t = threading.Thread(target=emu.serve_fd, args=(master, stop), daemon=True)
+    t.start()
+    try:
+        with client.NNFpgaClient(name, timeout=1.0, in_dim=8) as dev:
+            report = run_hil.stream_eval(dev, X, y_true, golden, chunk=32, window=4, batch=0)
+            batched = run_hil.stream_eval(dev, X, y_true, golden, chunk=40, batch=16)
+    finally:
+        stop.set()
+        t.join()
+        os.close(master)
+        os.close(slave)
+
+    for r in (report, batched):
+        assert r["samples"] == 100
+        assert r["device"]["infers"] == 100
+        assert r["lsb_diff"]["exact"] == 99
+        assert r["lsb_diff"]["max_abs"] == 3
+        assert r["lsb_diff"]["histogram"] == {"0": 99, "3": 1}
+        assert r["metrics"]["hardware"]["mae"] == pytest.approx(r["metrics"]["golden"]["mae"], abs=1e-3)
+
+
+def test_fixed_point_golden_rejects_onnx_source():
+    run_hil = _load_run_hil()
+    cfg = {"model": {"source": "onnx", "onnx_path": "model.onnx"}, "hls4ml": {}}
+    with pytest.raises(ValueError, match="model.source pytorch"):
+        run_hil._golden(cfg, "fixed-point", np.zeros((1, 8)), 0)
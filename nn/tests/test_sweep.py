@@ -0,0 +1,47 @@
+import pytest
+
+from nn.utils import sweep
+
+
+SPACE = {
+    "model.hidden": [[8, 16], [16, 32]],
+    "training.lr": [0.001, 0.003],
+    "training.seed": [1, 2, 3],
+}
+
+
+def test_grid_is_cartesian_product():
+    points = sweep.expand(SPACE, "grid")
+    assert len(points) == 12
+    assert {tuple(p["model.hidden"]) for p in points} == {(8, 16), (16, 32)}
+    assert len({repr(sorted(p.items())) for p in points}) == 12
+
+
+def test_random_is_seeded_and_in_range():
+    space = dict(SPACE, **{"training.lr": {"low": 1e-4, "high": 1e-2, "log": True}, "training.batch_size": {"low": 32, "high": 256, "int": True}})
+    a = sweep.expand(space, "random", samples=20, seed=7)
+    assert a == sweep.expand(space, "random", samples=20, seed=7)
+    assert all(1e-4 <= p["training.lr"] <= 1e-2 for p in a)
+    assert all(isinstance(p["training.batch_size"], int) and 32 <= p["training.batch_size"] <= 256 for p in a)
+    with pytest.raises(ValueError):
+        sweep.expand(space, "grid")
+
+
+def test_apply_does_not_touch_base():
+    base = {"model": {"hidden": [16, 32]}, "training": {"lr": 0.001}}
+    cfg = sweep.apply(base, {"model.hidden": [4], "training.lr": 0.01})
+    assert cfg["model"]["hidden"] == [4] and cfg["training"]["lr"] == 0.01
+    assert base["model"]["hidden"] == [16, 32]
+
+
+def test_rank_and_macs():
+    recs = [
+        {"params": {}, "metrics": {"rmse": 0.3, "r2": 0.7}},
+        {"params": {}, "error": "boom"},
+        {"params": {}, "metrics": {"rmse": 0.1, "r2": 0.9}},
+    ]
+    ranked = sweep.rank(recs, "rmse")
+    assert [r.get("rank") for r in ranked] == [1, 2, None]
+    assert ranked[0]["metrics"]["rmse"] == 0.1
+    assert sweep.rank(recs, "r2")[0]["metrics"]["r2"] == 0.9
+    assert sweep.mlp_macs(8, [16, 32]) == 8 * 16 + 16 * 32 + 32
@@ -0,0 +1,74 @@
+import numpy as np
+import torch
+
+from nn.models.mlp_regressor import build_mlp
+from nn.train import train_loop
+
+
+W = np.linspace(-1.0, 1.0, 8)
+
+
+def _data(n, rng):
+    X = rng.normal(size=(n, 8)).astype(np.float32)
+    y = (X @ W).astype(np.float32)
+    return X, y
+
+
+def _cfg(fast):
+    return {"training": {"epochs": 5, "batch_size": 32, "lr": 1e-2, "weight_decay": 0.0, "fast_path": fast, "progress": "none"}}
+
+
+def test_fast_path_learns_and_matches_loader():
+    rng = np.random.default_rng(0)
+    train, val = _data(500, rng), _data(100, rng)
+    losses = {}
+    for fast in (True, False):
+        torch.manual_seed(0)
+        _, tl, vl, _ = train_loop.run_train(build_mlp(8, [16, 32]), train, val, _cfg(fast))
+        assert len(tl) == len(vl) == 5
+        assert vl[-1] < vl[0]
+        losses[fast] = vl[-1]
+    assert abs(losses[True] - losses[False]) < 0.5 * max(losses.values())
+
+
+def test_eval_loss_is_full_batch_mse():
+    rng = np.random.default_rng(1)
+    model = build_mlp(8, [4])
+    X, y = train_loop._as_tensors(_data(50, rng), torch.device("cpu"))
+    with torch.no_grad():
+        want = float(torch.mean((model(X) - y) ** 2))
+    assert np.isclose(train_loop.eval_loss(model, X, y, torch.nn.MSELoss()), want)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    rng = np.random.default_rng(2)
+    train, val = _data(300, rng), _data(60, rng)
+    cfg = _cfg(True)
+    cfg["training"]["epochs"] = 6
+
+    torch.manual_seed(0)
+    _, full_tl, full_vl, full_best = train_loop.run_train(build_mlp(8, [16], dropout=0.1), train, val, cfg)
+
+    ck = tmp_path / "ck.pt"
+    cfg["training"].update(epochs=3, checkpoint={"every": 3, "path": str(ck)})
+    torch.manual_seed(0)
+    train_loop.run_train(build_mlp(8, [16], dropout=0.1), train, val, cfg)
+    assert train_loop.load_checkpoint(ck)["epoch"] == 3
+
+    torch.manual_seed(123)  # resume restores the RNG state itself
+    cfg["training"].update(epochs=6, resume=str(ck))
+    _, tl, vl, best = train_loop.run_train(build_mlp(8, [16], dropout=0.1), train, val, cfg)
+    assert tl == full_tl and vl == full_vl and best == full_best
+
+
+def test_early_stopping_restores_best_weights():
+    rng = np.random.default_rng(3)
+    train, val = _data(200, rng), _data(40, rng)
+    cfg = _cfg(True)
+    cfg["training"].update(epochs=50, lr=0.05, early_stopping={"patience": 2, "min_delta": 10.0})
+    torch.manual_seed(0)
+    model, tl, vl, best_epoch = train_loop.run_train(build_mlp(8, [16]), train, val, cfg)
+    # min_delta is larger than any improvement, so only epoch 1 ever counts
+    assert len(vl) == 3 and best_epoch == 1
+    X, y = train_loop._as_tensors(val, next(model.parameters()).device)
+    assert np.isclose(train_loop.eval_loss(model, X, y, torch.nn.MSELoss()), vl[0])
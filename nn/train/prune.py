@@ -0,0 +1,155 @@
+"""Structured (neuron-level) pruning for build_mlp models.
+
+Each round scores every hidden neuron by the L2 norm of its incoming
+weights and bias times the L2 norm of its outgoing weights. It then keeps
+the top scorers of each layer and rebuilds a smaller build_mlp with the
+surviving rows and columns copied over. Finally it fine-tunes with
+``train_loop.run_train``. The per-layer keep ratio follows a geometric
+schedule, so after ``rounds`` rounds ``sparsity`` of the original hidden
+neurons are gone. Pruned neurons are removed rather than masked, so the
+exported model.pt and model_info.json hidden sizes shrink with them.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+
+from nn.models import mlp_regressor
+from nn.train import train_loop
+from nn.utils import sweep
+
+
+def _linears(model: nn.Module) -> List[nn.Linear]:
+    return [m for m in model.modules() if isinstance(m, nn.Linear)]
+
+
+def hidden_sizes(model: nn.Module) -> List[int]:
+    return [m.out_features for m in _linears(model)[:-1]]
+
+
+def neuron_scores(model: nn.Module) -> List[torch.Tensor]:
+    """Importance of each hidden neuron, one tensor per hidden layer."""
+    lin = _linears(model)
+    scores = []
+    with torch.no_grad():
+        for cur, nxt in zip(lin[:-1], lin[1:]):
+            fan_in = torch.sqrt(cur.weight.pow(2).sum(dim=1) + cur.bias.pow(2))
+            fan_out = torch.linalg.vector_norm(nxt.weight, dim=0)
+            scores.append((fan_in * fan_out).cpu())
+    return scores
+
+
+def select_neurons(model: nn.Module, sizes: Sequence[int]) -> List[List[int]]:
+    """Indices of the ``sizes[i]`` best neurons of each hidden layer, in original order."""
+    keep = []
+    for s, n in zip(neuron_scores(model), sizes):
+        idx = torch.argsort(s, descending=True, stable=True)[: int(n)]
+        keep.append(sorted(idx.tolist()))
+    return keep
+
+
+def shrink(model: nn.Module, keep: Sequence[Sequence[int]]) -> nn.Module:
+    """New build_mlp holding only the ``keep`` neurons of each hidden layer."""
+    lin = _linears(model)
+    if len(keep) != len(lin) - 1:
+        raise ValueError(f"expected {len(lin) - 1} keep lists, got {len(keep)}")
+    dropout = next((m.p for m in model.modules() if isinstance(m, nn.Dropout)), 0.0)
+    quant = next((m for m in lin if isinstance(m, mlp_regressor.QuantLinear)), None)
+    out = mlp_regressor.build_mlp(
+        input_dim=lin[0].in_features,
+        hidden=[len(k) for k in keep],
+        dropout=dropout,
+        precision=str(quant.fixed) if quant is not None else None,
+    )
+    rows = [torch.as_tensor(k, dtype=torch.long) for k in keep]
+    with torch.no_grad():
+        for i, (src, dst) in enumerate(zip(lin, _linears(out))):
+            w = src.weight.detach().cpu()
+            b = src.bias.detach().cpu()
+            if i > 0:
+                w = w[:, rows[i - 1]]
+            if i < len(rows):
+                w, b = w[rows[i]], b[rows[i]]
+            dst.weight.copy_(w)
+            dst.bias.copy_(b)
+    return out.to(next(model.parameters()).device)
+
+
+def schedule(hidden: Sequence[int], sparsity: float, rounds: int, min_neurons: int = 1) -> List[List[int]]:
+    """Hidden sizes after each round (geometric decay to ``1 - sparsity``)."""
+    if not 0.0 <= sparsity < 1.0:
+        raise ValueError("pruning.sparsity must be in [0, 1)")
+    out = []
+    for r in range(1, rounds + 1):
+        ratio = (1.0 - sparsity) ** (r / rounds)
+        out.append([max(min(min_neurons, h), int(math.ceil(h * ratio))) for h in hidden])
+    return out
+
+
+def run_pruning(
+    model: nn.Module,
+    train: Tuple[np.ndarray, np.ndarray],
+    val: Tuple[np.ndarray, np.ndarray],
+    cfg: Dict[str, Any],
+) -> Tuple[nn.Module, list[float], list[float], List[Dict[str, Any]]]:
+    """Prune/fine-tune rounds on a trained ``model``.
+
+    Returns the pruned model, the fine-tuning train/val losses and one
+    history entry per round. With ``pruning.tolerance`` > 0, a round whose
+    fine-tuned val loss exceeds the unpruned val loss by more than that
+    fraction is rolled back and pruning stops.
+    """
+    pcfg = cfg.get("pruning", {}) or {}
+    rounds = int(pcfg.get("rounds", 3))
+    tolerance = float(pcfg.get("tolerance", 0.0))
+    sizes = schedule(hidden_sizes(model), float(pcfg.get("sparsity", 0.5)), rounds, int(pcfg.get("min_neurons", 1)))
+
+    # Fine-tuning reuses the training settings but never resumes or
+    # overwrites the dense model's checkpoint (shapes differ).
+    ft_cfg = copy.deepcopy(cfg)
+    ft_cfg["training"]["epochs"] = int(pcfg.get("finetune_epochs", 10))
+    ft_cfg["training"].pop("resume", None)
+    ft_cfg["training"]["checkpoint"] = {"every": 0}
+    if ft_cfg.get("quantization"):
+        ft_cfg["quantization"]["start_epoch"] = 0
+
+    X_val, y_val = train_loop._as_tensors(val, next(model.parameters()).device)
+    loss_fn = nn.MSELoss()
+    base_loss = train_loop.eval_loss(model, X_val, y_val, loss_fn)
+    input_dim = _linears(model)[0].in_features
+    verbose = str(cfg["training"].get("progress", "epoch")).lower() != "none"
+
+    train_losses: list[float] = []
+    val_losses: list[float] = []
+    history: List[Dict[str, Any]] = []
+    for r, target in enumerate(sizes, 1):
+        if target == hidden_sizes(model):
+            continue
+        candidate = shrink(model, select_neurons(model, target))
+        candidate, tl, vl, _ = train_loop.run_train(candidate, train, val, ft_cfg)
+        loss = train_loop.eval_loss(candidate, X_val, y_val, loss_fn)
+        entry = {
+            "round": r,
+            "hidden": hidden_sizes(candidate),
+            "macs": sweep.mlp_macs(input_dim, hidden_sizes(candidate)),
+            "val_loss": loss,
+        }
+        if tolerance > 0 and loss > base_loss * (1.0 + tolerance):
+            entry["rolled_back"] = True
+            history.append(entry)
+            if verbose:
+                print(f"prune round {r}: val_loss={loss:.6f} exceeds tolerance; keeping {hidden_sizes(model)}")
+            break
+        model = candidate
+        train_losses += tl
+        val_losses += vl
+        history.append(entry)
+        if verbose:
+            print(f"prune round {r}: hidden={entry['hidden']} val_loss={loss:.6f}")
+    return model, train_losses, val_losses, history
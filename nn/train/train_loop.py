@@ -1,14 +1,139 @@
-"""Training loop for tabular regression."""
+"""Training loop for tabular regression.
+
+By default the whole training set is kept as two contiguous tensors on the
+device and each epoch shuffles by permuting row indices, so there is no
+per-sample Dataset indexing or collation. Validation is one batched forward
+pass. Set ``training.fast_path: false`` for the DataLoader loop.
+
+``training.progress`` controls output: ``bar`` (tqdm per epoch), ``epoch``
+(one line per epoch, default) or ``none``.
+
+``training.early_stopping`` (``patience`` > 0) stops once val loss has not
+improved by ``min_delta`` for ``patience`` epochs and, with ``restore_best``,
+returns the best weights. ``training.checkpoint`` (``every`` > 0) writes
+model/optimizer/RNG state to ``path`` every N epochs; ``training.resume``
+points at such a file to continue an interrupted run.
+
+With ``quantization.enabled`` the model's fake quantization (see
+nn/models/mlp_regressor.py) is held off until ``quantization.start_epoch``
+so QAT can fine-tune from a float warm-up.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import os
+from pathlib import Path
+from typing import Any, Dict, Tuple
 
 import numpy as np
 import torch
 from torch import nn
 from torch.utils.data import DataLoader, TensorDataset
-from tqdm import tqdm
+
+from nn.models import mlp_regressor
+
+try:
+    from tqdm import tqdm
+except Exception:  # pragma: no cover - optional dependency
+    tqdm = None
+
+
+def _as_tensors(data: Tuple[np.ndarray, np.ndarray], device: torch.device) -> Tuple[torch.Tensor, torch.Tensor]:
+    X, y = data
+    X_t = torch.as_tensor(np.ascontiguousarray(X), dtype=torch.float32, device=device)
+    y_t = torch.as_tensor(np.ascontiguousarray(y), dtype=torch.float32, device=device).reshape(-1, 1)
+    return X_t, y_t
+
+
+def _bar(iterable, progress: str, desc: str, total: int | None = None):
+    if progress == "bar" and tqdm is not None:
+        return tqdm(iterable, desc=desc, total=total)
+    return iterable
+
+
+def _train_epoch_tensor(
+    model: nn.Module,
+    X: torch.Tensor,
+    y: torch.Tensor,
+    batch_size: int,
+    optim: torch.optim.Optimizer,
+    loss_fn: nn.Module,
+    progress: str,
+    desc: str,
+) -> float:
+    n = X.shape[0]
+    perm = torch.randperm(n, device=X.device)
+    total = torch.zeros((), device=X.device)
+    starts = range(0, n, batch_size)
+    for s in _bar(starts, progress, desc, total=len(starts)):
+        idx = perm[s : s + batch_size]
+        xb = X.index_select(0, idx)
+        yb = y.index_select(0, idx)
+        optim.zero_grad(set_to_none=True)
+        loss = loss_fn(model(xb), yb)
+        loss.backward()
+        optim.step()
+        total += loss.detach() * idx.numel()
+    return float(total) / n
+
+
+def _train_epoch_loader(
+    model: nn.Module,
+    loader: DataLoader,
+    device: torch.device,
+    optim: torch.optim.Optimizer,
+    loss_fn: nn.Module,
+    progress: str,
+    desc: str,
+) -> float:
+    total = 0.0
+    for xb, yb in _bar(loader, progress, desc):
+        xb = xb.to(device)
+        yb = yb.to(device)
+        optim.zero_grad()
+        preds = model(xb)
+        loss = loss_fn(preds, yb)
+        loss.backward()
+        optim.step()
+        total += float(loss.item()) * xb.size(0)
+    return total / len(loader.dataset)
+
+
+def eval_loss(model: nn.Module, X: torch.Tensor, y: torch.Tensor, loss_fn: nn.Module) -> float:
+    """Mean loss over the whole set in one forward pass."""
+    model.eval()
+    with torch.no_grad():
+        return float(loss_fn(model(X), y))
+
+
+def save_checkpoint(path: str | Path, state: Dict[str, Any]) -> None:
+    """Write ``state`` atomically so an interrupt never leaves a torn file."""
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f".{p.name}.tmp")
+    torch.save(state, tmp)
+    os.replace(tmp, p)
+
+
+def load_checkpoint(path: str | Path) -> Dict[str, Any]:
+    return torch.load(Path(path), map_location="cpu", weights_only=False)
+
+
+def _rng_state() -> Dict[str, Any]:
+    state = {"torch": torch.get_rng_state()}
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def _set_rng_state(state: Dict[str, Any]) -> None:
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def _snapshot(model: nn.Module) -> Dict[str, torch.Tensor]:
+    return {k: v.detach().clone() for k, v in model.state_dict().items()}
 
 
 def run_train(
@@ -16,60 +141,115 @@ def run_train(
     train: Tuple[np.ndarray, np.ndarray],
     val: Tuple[np.ndarray, np.ndarray],
     cfg: Dict,
-) -> Tuple[nn.Module, list[float], list[float]]:
-    X_train, y_train = train
-    X_val, y_val = val
+) -> Tuple[nn.Module, list[float], list[float], int]:
+    """Train ``model``; return it with the per-epoch losses and the 1-based best epoch (0 if none)."""
+    tcfg = cfg["training"]
+    fast = bool(tcfg.get("fast_path", True))
+    progress = str(tcfg.get("progress", "epoch")).lower()
 
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     model = model.to(device)
 
-    train_ds = TensorDataset(
-        torch.from_numpy(X_train).float(), torch.from_numpy(y_train).float().unsqueeze(1)
-    )
-    val_ds = TensorDataset(
-        torch.from_numpy(X_val).float(), torch.from_numpy(y_val).float().unsqueeze(1)
-    )
+    X_train, y_train = _as_tensors(train, device if fast else torch.device("cpu"))
+    X_val, y_val = _as_tensors(val, device)
 
-    batch_size = cfg["training"]["batch_size"]
-    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_ds, batch_size=batch_size, shuffle=False)
+    batch_size = tcfg["batch_size"]
+    train_loader = None
+    if not fast:
+        train_loader = DataLoader(TensorDataset(X_train, y_train), batch_size=batch_size, shuffle=True)
 
-    optim = torch.optim.Adam(
-        model.parameters(), lr=cfg["training"]["lr"], weight_decay=cfg["training"]["weight_decay"]
-    )
+    optim = torch.optim.Adam(model.parameters(), lr=tcfg["lr"], weight_decay=tcfg["weight_decay"])
     loss_fn = nn.MSELoss()
 
+    es = tcfg.get("early_stopping", {}) or {}
+    patience = int(es.get("patience", 0))
+    min_delta = float(es.get("min_delta", 0.0))
+    restore_best = bool(es.get("restore_best", True))
+    ck = tcfg.get("checkpoint", {}) or {}
+    ck_every = int(ck.get("every", 0))
+    ck_path = ck.get("path") or str(Path(cfg.get("outputs", {}).get("dir", ".")) / "checkpoint.pt")
+
+    qcfg = cfg.get("quantization", {}) or {}
+    qat_start = int(qcfg.get("start_epoch", 0)) if qcfg.get("enabled", False) else None
+
     train_losses: list[float] = []
     val_losses: list[float] = []
+    best_val = float("inf")
+    best_epoch = -1
+    best_state: Dict[str, torch.Tensor] | None = None
+    bad_epochs = 0
+    stopped = False
+    start = 0
+
+    resume = tcfg.get("resume")
+    if resume:
+        state = load_checkpoint(resume)
+        model.load_state_dict(state["model"])
+        optim.load_state_dict(state["optimizer"])
+        _set_rng_state(state["rng"])
+        start = state["epoch"]
+        train_losses, val_losses = list(state["train_losses"]), list(state["val_losses"])
+        best_val, best_epoch, bad_epochs = state["best_val"], state["best_epoch"], state["bad_epochs"]
+        best_state = state.get("best_model")
+        stopped = state.get("stopped", False)
+        if progress != "none":
+            print(f"resumed from {resume} at epoch {start}")
 
-    epochs = cfg["training"]["epochs"]
-    for epoch in range(epochs):
+    def checkpoint(epoch: int) -> None:
+        save_checkpoint(
+            ck_path,
+            {
+                "epoch": epoch,
+                "model": model.state_dict(),
+                "optimizer": optim.state_dict(),
+                "rng": _rng_state(),
+                "train_losses": train_losses,
+                "val_losses": val_losses,
+                "best_val": best_val,
+                "best_epoch": best_epoch,
+                "best_model": best_state,
+                "bad_epochs": bad_epochs,
+                "stopped": stopped,
+            },
+        )
+
+    epochs = tcfg["epochs"]
+    for epoch in range(start, epochs):
+        if stopped:
+            break
+        if qat_start is not None:
+            mlp_regressor.set_quantization(model, epoch >= qat_start)
         model.train()
-        total = 0.0
-        for xb, yb in tqdm(train_loader, desc=f"epoch {epoch+1}/{epochs} train"):
-            xb = xb.to(device)
-            yb = yb.to(device)
-            optim.zero_grad()
-            preds = model(xb)
-            loss = loss_fn(preds, yb)
-            loss.backward()
-            optim.step()
-            total += float(loss.item()) * xb.size(0)
-        train_loss = total / len(train_ds)
+        desc = f"epoch {epoch+1}/{epochs} train"
+        if fast:
+            train_loss = _train_epoch_tensor(model, X_train, y_train, batch_size, optim, loss_fn, progress, desc)
+        else:
+            train_loss = _train_epoch_loader(model, train_loader, device, optim, loss_fn, progress, desc)
         train_losses.append(train_loss)
 
-        model.eval()
-        total = 0.0
-        with torch.no_grad():
-            for xb, yb in tqdm(val_loader, desc=f"epoch {epoch+1}/{epochs} val"):
-                xb = xb.to(device)
-                yb = yb.to(device)
-                preds = model(xb)
-                loss = loss_fn(preds, yb)
-                total += float(loss.item()) * xb.size(0)
-        val_loss = total / len(val_ds)
+        val_loss = eval_loss(model, X_val, y_val, loss_fn)
         val_losses.append(val_loss)
 
-        print(f"epoch {epoch+1}/{epochs} train_loss={train_loss:.6f} val_loss={val_loss:.6f}")
+        if progress != "none":
+            print(f"epoch {epoch+1}/{epochs} train_loss={train_loss:.6f} val_loss={val_loss:.6f}")
+
+        if val_loss < best_val - min_delta:
+            best_val, best_epoch, bad_epochs = val_loss, epoch, 0
+            if restore_best and patience > 0:
+                best_state = _snapshot(model)
+        else:
+            bad_epochs += 1
+        if patience > 0 and bad_epochs >= patience:
+            stopped = True
+            if progress != "none":
+                print(f"early stop at epoch {epoch+1}: best val_loss={best_val:.6f} at epoch {best_epoch+1}")
+
+        if ck_every > 0 and ((epoch + 1) % ck_every == 0 or stopped or epoch + 1 == epochs):
+            checkpoint(epoch + 1)
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    if qat_start is not None:
+        mlp_regressor.set_quantization(model, True)
 
-    return model, train_losses, val_losses
+    return model, train_losses, val_losses, best_epoch + 1
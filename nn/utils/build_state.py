@@ -0,0 +1,93 @@
+"""Per-stage input hashes for incremental hls4ml project builds.
+
+run_hls4ml.py records, in ``<output_dir>/.hls4ml_build.json``, the hash of
+the inputs each stage last completed with. The write hash covers the model
+bytes (checkpoint/model_info or ONNX), the resolved hls_config, the
+converter kwargs and the hls4ml version. csim and synth hashes add their
+own build flags to it, and cosim/export/bitfile chain off synth. A stage
+whose recorded hash matches (and whose outputs still exist) is skipped.
+Rewriting the project drops everything downstream.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from nn.utils import hls_cache
+
+STATE_NAME = ".hls4ml_build.json"
+BUILD_STAGES = ("csim", "synth", "cosim", "export", "bitfile")
+_AFTER_SYNTH = ("cosim", "export", "bitfile")
+
+
+def stage_keys(
+    files: Iterable[str | Path],
+    hls_config: Dict[str, Any],
+    hls_kwargs: Dict[str, Any],
+    build: Dict[str, Any],
+) -> Dict[str, str]:
+    """Input hash per stage (``write`` plus BUILD_STAGES)."""
+    write = hls_cache.cache_key(
+        files, {"hls_config": hls_config, "kwargs": hls_kwargs, "hls4ml": hls_cache._hls4ml_version()}
+    )
+    keys = {"write": write}
+    keys["csim"] = hls_cache.cache_key([], {"write": write, "stage": "csim"})
+    keys["synth"] = hls_cache.cache_key([], {"write": write, "stage": "synth", "build": build})
+    for stage in _AFTER_SYNTH:
+        keys[stage] = hls_cache.cache_key([], {"synth": keys["synth"], "stage": stage})
+    return keys
+
+
+class BuildState:
+    """Stage -> input hash record stored in the project directory."""
+
+    def __init__(self, out_dir: str | Path) -> None:
+        self.path = Path(out_dir) / STATE_NAME
+        try:
+            self.stages: Dict[str, str] = json.loads(self.path.read_text()).get("stages", {})
+        except (OSError, ValueError):
+            self.stages = {}
+
+    def fresh(self, stage: str, key: str) -> bool:
+        return self.stages.get(stage) == key
+
+    def mark(self, stage: str, key: str) -> None:
+        self.stages[stage] = key
+        self._save()
+
+    def invalidate(self, stages: Iterable[str]) -> None:
+        for s in stages:
+            self.stages.pop(s, None)
+        self._save()
+
+    def clear(self) -> None:
+        self.stages = {}
+        if self.path.exists():
+            self.path.unlink()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"stages": self.stages}, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def plan(state: BuildState, keys: Dict[str, str], requested: Dict[str, bool], synth_present: bool) -> List[str]:
+    """Requested build stages whose inputs changed (or whose synth outputs are gone)."""
+    todo = []
+    for stage in BUILD_STAGES:
+        if not requested.get(stage, False):
+            continue
+        stale = not state.fresh(stage, keys[stage])
+        if stage == "synth" or stage in _AFTER_SYNTH:
+            stale = stale or not synth_present
+        if stale:
+            todo.append(stage)
+    # Stages after synth need a current synthesis to build on
+    if any(s in todo for s in _AFTER_SYNTH) and not (state.fresh("synth", keys["synth"]) and synth_present):
+        if "synth" not in todo:
+            todo.insert(1 if "csim" in todo else 0, "synth")
+    return todo
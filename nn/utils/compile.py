@@ -17,6 +17,7 @@ from nn.datasets import calhouse
 from nn.metrics import regression
 from nn.models import mlp_regressor
 from nn.utils import config as config_mod
+from nn.utils import hls_cache
 from nn.utils import io
 
 
@@ -45,6 +46,14 @@ def _load_pytorch_model(model_cfg: Dict[str, Any]) -> torch.nn.Module:
     return model
 
 
+def _model_files(model_cfg: Dict[str, Any]) -> list:
+    """Files whose bytes define the converted model (compile cache key)."""
+    if model_cfg.get("source", "pytorch") == "onnx":
+        return [model_cfg.get("onnx_path", "")]
+    pt_cfg = model_cfg.get("pytorch", {}) or {}
+    return [pt_cfg.get("checkpoint", ""), pt_cfg.get("model_info", "")]
+
+
 def _predict_pytorch(model: torch.nn.Module, X_test: np.ndarray) -> np.ndarray:
     with torch.no_grad():
         preds = model(torch.from_numpy(X_test).float()).numpy().squeeze()
@@ -178,8 +187,10 @@ def compile_and_compare(hls_model: Any, cfg: Dict[str, Any]) -> Dict[str, Dict[s
     out_dir: Path = io.ensure_dir(Path(cfg["model"]["output_dir"]) / "plots")
     X_test, y_test = _load_test_data(training_config)
 
-    # hls4ml recommended flow for inference
-    hls_model.compile()
+    # hls4ml recommended flow for inference; the bridge library is reused
+    # from the compile cache when the model and settings are unchanged
+    if hls_cache.compile_from_config(hls_model, cfg, _model_files(cfg["model"])):
+        print("Using cached hls4ml library")
     X_test = np.ascontiguousarray(X_test)
     y_hls = np.asarray(hls_model.predict(X_test)).squeeze()
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Any, Dict
 
@@ -18,3 +19,23 @@ def load_config(path: str | Path) -> Dict[str, Any]:
         if key not in cfg:
             raise ValueError(f"missing config section: {key}")
     return cfg
+
+
+def apply_trained_precision(hls_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Use the QAT precision from model_info.json when ``quantization.enabled``.
+
+    Quantization-aware training records its ap_fixed type in model_info.json;
+    with ``quantization: enabled: true`` in an hls4ml config, that type
+    replaces ``hls4ml.precision`` so synthesis and goldens match training.
+    """
+    if not (hls_cfg.get("quantization", {}) or {}).get("enabled", False):
+        return hls_cfg
+    info_path = Path(hls_cfg["model"]["pytorch"]["model_info"])
+    if not info_path.exists():
+        raise FileNotFoundError(f"quantization.enabled needs model_info: {info_path}")
+    with info_path.open("r", encoding="utf-8") as f:
+        precision = json.load(f).get("precision")
+    if not precision:
+        raise ValueError(f"{info_path} has no precision; train with quantization.enabled")
+    hls_cfg.setdefault("hls4ml", {})["precision"] = precision
+    return hls_cfg
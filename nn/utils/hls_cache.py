@@ -0,0 +1,165 @@
+"""Content-addressed cache of compiled hls4ml bridge libraries.
+
+``hls_model.compile()`` writes the project and builds the C++ bridge library
+(``firmware/<project>-<stamp>.so``) that ``hls_model.predict`` calls through
+ctypes. The build dominates golden-fixture and comparison runs, so the
+library is cached under a key derived from the model bytes (checkpoint,
+model_info, ONNX file) and the hls4ml settings that affect the generated
+C++. On a hit the cached library is loaded into the converted model instead
+of rebuilding. Old entries are evicted least-recently-used.
+
+Cache settings come from the ``hls4ml.compile_cache`` section of the hls4ml
+config (``enabled``, ``dir``, ``max_entries``).
+
+Loading a cached library relies on a private hls4ml detail: ``ModelGraph``
+keeps the ctypes handle that ``predict`` calls in ``_top_function_lib``
+(checked against the versions in ``SUPPORTED_HLS4ML``). On any other version,
+or a model without that attribute, the cache is bypassed with a warning and
+``compile()`` runs as usual.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_DIR = "nn/outputs/hls4ml_cache"
+DEFAULT_MAX_ENTRIES = 8
+_LIB_NAME = "bridge.so"
+_META_NAME = "meta.json"
+# hls4ml releases whose ModelGraph.predict goes through _top_function_lib
+SUPPORTED_HLS4ML = ("0.8", "1.0", "1.1", "1.2")
+
+
+def cache_key(files: Iterable[str | Path], settings: Dict[str, Any]) -> str:
+    """Hash the contents of ``files`` (missing/empty paths skipped) and the JSON-able ``settings``."""
+    h = hashlib.sha256()
+    for f in files:
+        if not f:
+            continue
+        p = Path(f)
+        h.update(p.name.encode())
+        if p.exists():
+            with p.open("rb") as fh:
+                for block in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(block)
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:32]
+
+
+def _hls4ml_version() -> str:
+    try:
+        import hls4ml  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return ""
+    return str(getattr(hls4ml, "__version__", ""))
+
+
+def model_settings(hls_model: Any, hls_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Settings that change the generated C++: the converted HLSConfig plus backend/part/io_type."""
+    config = getattr(hls_model.config, "config", {}) or {}
+    return {
+        "hls_config": config.get("HLSConfig", {}),
+        "project": hls_model.config.get_project_name(),
+        "backend": hls_cfg.get("backend", "Vitis"),
+        "part": hls_cfg.get("part", "xc7a200tsbg484-1"),
+        "clock_period": float(hls_cfg.get("clock_period", 10.0)),
+        "io_type": hls_cfg.get("io_type", "io_stream"),
+        "strategy": hls_cfg.get("strategy", "Resource"),
+        "hls4ml": _hls4ml_version(),
+    }
+
+
+def _find_library(hls_model: Any) -> Path:
+    out_dir = Path(hls_model.config.get_output_dir())
+    libs = sorted((out_dir / "firmware").glob("*.so"), key=lambda p: p.stat().st_mtime)
+    if not libs:
+        raise FileNotFoundError(f"no compiled library under {out_dir / 'firmware'}")
+    return libs[-1]
+
+
+def _major_minor(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+
+def _can_load_library(hls_model: Any) -> bool:
+    """True when a cached library can be swapped into ``hls_model`` (see module docstring)."""
+    version = _hls4ml_version()
+    if version and _major_minor(version) not in SUPPORTED_HLS4ML:
+        return False
+    return hasattr(hls_model, "_top_function_lib")
+
+
+def _load_library(hls_model: Any, lib: Path) -> None:
+    import ctypes
+
+    hls_model._top_function_lib = ctypes.cdll.LoadLibrary(str(lib))
+
+
+def _evict(cache_dir: Path, max_entries: int) -> None:
+    entries = [p for p in cache_dir.iterdir() if (p / _META_NAME).exists()]
+    entries.sort(key=lambda p: (p / _META_NAME).stat().st_mtime)
+    for stale in entries[: max(0, len(entries) - max_entries)]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def compile_cached(
+    hls_model: Any,
+    key: str,
+    cache_dir: str | Path = DEFAULT_DIR,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> bool:
+    """Make ``hls_model`` ready for ``predict``; return True on a cache hit."""
+    if not _can_load_library(hls_model):
+        warnings.warn(
+            f"hls4ml {_hls4ml_version() or '(unknown version)'} does not expose _top_function_lib as expected; "
+            "compiling without the cache"
+        )
+        hls_model.compile()
+        return False
+    cache_dir = Path(cache_dir)
+    entry = cache_dir / key
+    lib = entry / _LIB_NAME
+    meta = entry / _META_NAME
+    if lib.exists() and meta.exists():
+        _load_library(hls_model, lib)
+        os.utime(meta)  # mark most recently used
+        return True
+
+    hls_model.compile()
+    entry.mkdir(parents=True, exist_ok=True)
+    tmp = entry / f".{_LIB_NAME}.{os.getpid()}"
+    shutil.copy2(_find_library(hls_model), tmp)
+    os.replace(tmp, lib)
+    meta.write_text(json.dumps({"key": key, "created": time.time()}, indent=2))
+    _evict(cache_dir, max_entries)
+    return False
+
+
+def compile_from_config(
+    hls_model: Any,
+    cfg: Dict[str, Any],
+    files: Iterable[str | Path],
+) -> Optional[bool]:
+    """Compile through the cache configured in ``cfg['hls4ml']['compile_cache']``.
+
+    Returns None when the cache is disabled (plain ``compile()``), else the hit flag.
+    """
+    h = cfg.get("hls4ml", {}) or {}
+    cache_cfg = h.get("compile_cache", {}) or {}
+    if not cache_cfg.get("enabled", True):
+        hls_model.compile()
+        return None
+    key = cache_key(files, model_settings(hls_model, h))
+    return compile_cached(
+        hls_model,
+        key,
+        cache_dir=cache_cfg.get("dir", DEFAULT_DIR),
+        max_entries=int(cache_cfg.get("max_entries", DEFAULT_MAX_ENTRIES)),
+    )
@@ -0,0 +1,229 @@
+"""SQLite history of csynth reports across hls4ml runs.
+
+Each ingested run stores the parsed csynth XML (``hls_report`` keys), the
+hash of the report file, the config hash, the git commit and a label
+(by default the project directory relative to the repo root, so absolute
+and relative paths to one project share a label). The config hash is the ``write`` key
+that run_hls4ml.py records in ``.hls4ml_build.json``, which covers the
+model bytes and the resolved hls_config. Without it, the hls4ml config
+dict itself is hashed. Re-ingesting an identical report under the same
+config is a no-op, so it is safe to ingest after every build.
+
+``trend`` lists a metric over time and ``compare`` diffs two runs;
+``latest``/``prev`` without a label refer to the newest run's label. For
+every stored metric lower is better, so an increase beyond the tolerance
+is a regression.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from nn.utils import build_state, hls_cache, hls_report
+
+DEFAULT_DB = "nn/outputs/hls_history.sqlite"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+METRICS = (
+    "WorstLatency",
+    "BestLatency",
+    "IntervalMax",
+    "IntervalMin",
+    "EstimatedClockPeriod",
+    "LUT",
+    "FF",
+    "DSP",
+    "BRAM_18K",
+    "URAM",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    label TEXT NOT NULL,
+    project_dir TEXT,
+    report_path TEXT,
+    report_sha TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    part TEXT,
+    target_clock REAL,
+    {", ".join(f"{m} REAL" for m in METRICS)},
+    report_json TEXT,
+    UNIQUE (report_sha, config_hash, label)
+);
+CREATE INDEX IF NOT EXISTS runs_label_ts ON runs (label, ts);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (git_commit);
+"""
+
+
+def connect(db_path: str | Path = DEFAULT_DB) -> sqlite3.Connection:
+    """Open (and create) the history database; concurrent DSE writers wait on the lock."""
+    p = Path(db_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def git_commit(cwd: str | Path = ".") -> tuple[str, bool]:
+    """(HEAD commit, worktree dirty); ("", False) outside a git checkout."""
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=str(cwd), capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=str(cwd),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "", False
+    return head, bool(status.strip())
+
+
+def config_hash(project_dir: str | Path, hls_cfg: Optional[Dict[str, Any]] = None) -> str:
+    """Recorded write-stage hash of the project, else a hash of ``hls_cfg``."""
+    key = build_state.BuildState(project_dir).stages.get("write")
+    if key:
+        return key
+    return hls_cache.cache_key([], hls_cfg or {}) if hls_cfg is not None else ""
+
+
+def default_label(project_dir: str | Path, repo: str | Path = REPO_ROOT) -> str:
+    """``project_dir`` relative to ``repo`` (absolute when outside it), in POSIX form."""
+    p = Path(project_dir).resolve()
+    try:
+        return p.relative_to(Path(repo).resolve()).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+
+def ingest(
+    conn: sqlite3.Connection,
+    xml_path: str | Path,
+    cfg_hash: str = "",
+    label: str = "",
+    commit: str = "",
+    dirty: bool = False,
+    project_dir: str | Path = "",
+    ts: Optional[float] = None,
+    repo: str | Path = REPO_ROOT,
+) -> tuple[int, bool]:
+    """Store one csynth XML; returns (run id, inserted). Duplicates return the existing id."""
+    xml_path = Path(xml_path)
+    sha = hashlib.sha256(xml_path.read_bytes()).hexdigest()[:32]
+    label = label or default_label(project_dir or xml_path.parent, repo)
+    row = conn.execute(
+        "SELECT id FROM runs WHERE report_sha = ? AND config_hash = ? AND label = ?", (sha, cfg_hash, label)
+    ).fetchone()
+    if row is not None:
+        return int(row["id"]), False
+
+    report = hls_report.parse_csynth_xml(xml_path)
+    values = {m: report.get(m) if isinstance(report.get(m), (int, float)) else None for m in METRICS}
+    cols = ["ts", "label", "project_dir", "report_path", "report_sha", "config_hash", "git_commit", "git_dirty"]
+    cols += ["part", "target_clock", *METRICS, "report_json"]
+    row_values = [
+        time.time() if ts is None else ts,
+        label,
+        str(project_dir),
+        str(xml_path),
+        sha,
+        cfg_hash,
+        commit,
+        int(dirty),
+        report.get("Part", ""),
+        report.get("TargetClockPeriod"),
+        *values.values(),
+        json.dumps(report, sort_keys=True),
+    ]
+    with conn:
+        cur = conn.execute(
+            f"INSERT INTO runs ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", row_values
+        )
+    return int(cur.lastrowid), True
+
+
+def ingest_project(
+    conn: sqlite3.Connection,
+    project_dir: str | Path,
+    hls_cfg: Optional[Dict[str, Any]] = None,
+    label: str = "",
+    repo: str | Path = ".",
+) -> tuple[int, bool] | None:
+    """Ingest the csynth XML of an hls4ml project directory (None if it has no report)."""
+    xml = hls_report.find_synth_report(project_dir, "xml")
+    if xml is None:
+        return None
+    commit, dirty = git_commit(repo)
+    return ingest(
+        conn,
+        xml,
+        cfg_hash=config_hash(project_dir, hls_cfg),
+        label=label,
+        commit=commit,
+        dirty=dirty,
+        project_dir=project_dir,
+        repo=repo,
+    )
+
+
+def runs(conn: sqlite3.Connection, label: str = "", limit: int = 0) -> List[sqlite3.Row]:
+    """Runs oldest-first, optionally for one label and only the newest ``limit``."""
+    sql = "SELECT * FROM runs" + (" WHERE label = ?" if label else "") + " ORDER BY ts DESC, id DESC"
+    params: List[Any] = [label] if label else []
+    if limit > 0:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return list(reversed(conn.execute(sql, params).fetchall()))
+
+
+def get_run(conn: sqlite3.Connection, ref: str, label: str = "") -> sqlite3.Row:
+    """Run by id, ``latest``, ``prev`` or git commit prefix (newest match).
+
+    Without ``label``, ``latest``/``prev`` use the label of the newest run so
+    they never pair runs of different projects.
+    """
+    if ref in ("latest", "prev"):
+        if not label:
+            newest = runs(conn, limit=1)
+            label = newest[0]["label"] if newest else ""
+        rows = runs(conn, label, limit=2)
+        idx = -1 if ref == "latest" else -2
+        if len(rows) < -idx:
+            raise LookupError(f"no {ref} run" + (f" for label {label}" if label else ""))
+        return rows[idx]
+    if ref.isdigit():
+        row = conn.execute("SELECT * FROM runs WHERE id = ?", (int(ref),)).fetchone()
+    else:
+        sql = "SELECT * FROM runs WHERE git_commit LIKE ?" + (" AND label = ?" if label else "")
+        params: List[Any] = [ref + "%"] + ([label] if label else [])
+        row = conn.execute(sql + " ORDER BY ts DESC, id DESC LIMIT 1", params).fetchone()
+    if row is None:
+        raise LookupError(f"no run matches {ref!r}")
+    return row
+
+
+def compare(base: sqlite3.Row, new: sqlite3.Row, tolerance: float = 0.0) -> List[Dict[str, Any]]:
+    """Per-metric change from ``base`` to ``new``; ``regressed`` when it grew by more than ``tolerance`` (fraction)."""
+    out = []
+    for m in METRICS:
+        a, b = base[m], new[m]
+        if a is None or b is None:
+            continue
+        delta = b - a
+        pct = delta / a if a else (0.0 if delta == 0 else float("inf"))
+        out.append({"metric": m, "base": a, "new": b, "delta": delta, "pct": pct, "regressed": delta > 0 and pct > tolerance})
+    return out
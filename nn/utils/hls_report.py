@@ -0,0 +1,185 @@
+"""Locate and parse Vivado/Vitis HLS csynth reports without hls4ml.
+
+``parse_csynth_xml`` returns the same keys as the ``CSynthesisReport``
+section of ``hls4ml.report.parse_vivado_report`` (``BestLatency``,
+``IntervalMax``, ``LUT``, ``DSP``, ...), with numbers converted to int or
+float where possible. ``stage_output_error`` checks that a build stage
+really produced its outputs, since ``hls_model.build()`` does not raise
+when csim, cosim or export fail.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_PERF = {
+    "TargetClockPeriod": "UserAssignments/TargetClockPeriod",
+    "EstimatedClockPeriod": "PerformanceEstimates/SummaryOfTimingAnalysis/EstimatedClockPeriod",
+    "BestLatency": "PerformanceEstimates/SummaryOfOverallLatency/Best-caseLatency",
+    "WorstLatency": "PerformanceEstimates/SummaryOfOverallLatency/Worst-caseLatency",
+    "IntervalMin": "PerformanceEstimates/SummaryOfOverallLatency/Interval-min",
+    "IntervalMax": "PerformanceEstimates/SummaryOfOverallLatency/Interval-max",
+}
+_RESOURCES = ("BRAM_18K", "DSP", "FF", "LUT", "URAM")
+
+
+def _num(text: Optional[str]) -> Any:
+    if text is None:
+        return None
+    t = text.strip()
+    for conv in (int, float):
+        try:
+            return conv(t)
+        except ValueError:
+            pass
+    return t
+
+
+def _solutions(hls_dir: Path) -> Tuple[List[Path], Optional[str]]:
+    """Solution directories of the HLS project in ``hls_dir`` and its top function name."""
+    project_tcl = hls_dir / "project.tcl"
+    if not project_tcl.exists():
+        return [], None
+    project_name = None
+    backend_name = None
+    top_name = None
+    for line in project_tcl.read_text().splitlines():
+        if "set project_name" in line:
+            project_name = line.split('"')[-2]
+        if "set backend" in line:
+            backend_name = line.split('"')[-2]
+        if "set_top" in line:
+            parts = line.strip().split()
+            if len(parts) >= 2:
+                top_name = parts[-1]
+    if project_name is None:
+        return [], None
+    if top_name is None:
+        top_name = project_name
+    if backend_name and "accelerator" in backend_name:
+        project_name = f"{project_name}_axi"
+    prj_dir = hls_dir / f"{project_name}_prj"
+    if not prj_dir.exists():
+        return [], top_name
+    return sorted(p for p in prj_dir.iterdir() if p.is_dir()), top_name
+
+
+def find_synth_report(hls_dir: str | Path, suffix: str = "xml") -> Path | None:
+    """Top-level csynth report (``rpt`` or ``xml``) of an hls4ml project directory."""
+    solutions, top_name = _solutions(Path(hls_dir))
+    for sol_dir in solutions:
+        report_dir = sol_dir / "syn" / "report"
+        if not report_dir.exists():
+            continue
+        if top_name:
+            candidate = report_dir / f"{top_name}_csynth.{suffix}"
+            if candidate.exists():
+                return candidate
+        candidate = report_dir / f"csynth.{suffix}"
+        if candidate.exists():
+            return candidate
+        # Fallback: first csynth report in solution
+        for rpt in report_dir.glob(f"*_csynth.{suffix}"):
+            return rpt
+    return None
+
+
+def stage_output_error(hls_dir: str | Path, stage: str) -> str:
+    """Why ``stage`` (csim, synth, cosim, export, bitfile) left no valid output; "" when it did."""
+    hls_dir = Path(hls_dir)
+    solutions, _ = _solutions(hls_dir)
+    if stage == "synth":
+        return "" if find_synth_report(hls_dir, "xml") else "no csynth report"
+    if stage == "csim":
+        logs = [p for s in solutions for p in (s / "csim" / "report").glob("*_csim.log")]
+        if not logs:
+            return "no csim log"
+        text = logs[0].read_text(errors="replace")
+        if re.search(r"CSim failed|'csim_design' failed|^ERROR:", text, re.MULTILINE):
+            return f"csim failed (see {logs[0]})"
+        tb_input = hls_dir / "tb_data" / "tb_input_features.dat"
+        results = hls_dir / "tb_data" / "csim_results.log"
+        if tb_input.exists() and not (results.exists() and results.stat().st_size):
+            return f"csim wrote no results to {results}"
+        return ""
+    if stage == "cosim":
+        rpts = [p for s in solutions for p in (s / "sim" / "report").glob("*_cosim.rpt")]
+        if not rpts:
+            return "no cosim report"
+        statuses = re.findall(r"\|\s*(?:Verilog|VHDL)\s*\|\s*(\w+)\s*\|", rpts[0].read_text(errors="replace"))
+        if "Pass" not in statuses or any(s not in ("Pass", "NA") for s in statuses):
+            return f"cosim did not pass (see {rpts[0]})"
+        return ""
+    if stage == "export":
+        for s in solutions:
+            impl = s / "impl"
+            if (impl / "ip" / "component.xml").exists() or any(impl.glob("**/*.zip")):
+                return ""
+        return "no exported IP under <solution>/impl"
+    if stage == "bitfile":
+        return "" if any(hls_dir.rglob("*.bit")) else "no bitstream"
+    raise ValueError(f"unknown build stage: {stage}")
+
+
+def parse_csynth_xml(path: str | Path) -> Dict[str, Any]:
+    root = ET.parse(str(path)).getroot()
+    report: Dict[str, Any] = {}
+    for key, xpath in _PERF.items():
+        node = root.find(xpath)
+        if node is not None:
+            report[key] = _num(node.text)
+    res = root.find("AreaEstimates/Resources")
+    avail = root.find("AreaEstimates/AvailableResources")
+    for name in _RESOURCES:
+        for section, prefix in ((res, ""), (avail, "Available")):
+            if section is None:
+                continue
+            # Older Vivado HLS reports call the DSP column DSP48E
+            node = section.find(name)
+            if node is None and name == "DSP":
+                node = section.find("DSP48E")
+            if node is not None:
+                report[prefix + name] = _num(node.text)
+    part = root.find("UserAssignments/Part")
+    if part is not None:
+        report["Part"] = part.text.strip() if part.text else ""
+    top = root.find("UserAssignments/TopModelName")
+    if top is not None:
+        report["TopModelName"] = top.text.strip() if top.text else ""
+    return report
+
+
+def write_csynth_xml(path: str | Path, report: Dict[str, Any]) -> None:
+    """Write ``report`` (parse_csynth_xml keys) in the csynth XML layout."""
+    root = ET.Element("profile")
+    ua = ET.SubElement(root, "UserAssignments")
+    for key, tag in (("Part", "Part"), ("TopModelName", "TopModelName"), ("TargetClockPeriod", "TargetClockPeriod")):
+        if key in report:
+            ET.SubElement(ua, tag).text = str(report[key])
+    perf = ET.SubElement(root, "PerformanceEstimates")
+    timing = ET.SubElement(perf, "SummaryOfTimingAnalysis")
+    if "EstimatedClockPeriod" in report:
+        ET.SubElement(timing, "EstimatedClockPeriod").text = str(report["EstimatedClockPeriod"])
+    lat = ET.SubElement(perf, "SummaryOfOverallLatency")
+    for key, tag in (
+        ("BestLatency", "Best-caseLatency"),
+        ("WorstLatency", "Worst-caseLatency"),
+        ("IntervalMin", "Interval-min"),
+        ("IntervalMax", "Interval-max"),
+    ):
+        if key in report:
+            ET.SubElement(lat, tag).text = str(report[key])
+    area = ET.SubElement(root, "AreaEstimates")
+    res = ET.SubElement(area, "Resources")
+    avail = ET.SubElement(area, "AvailableResources")
+    for name in _RESOURCES:
+        if name in report:
+            ET.SubElement(res, name).text = str(report[name])
+        if "Available" + name in report:
+            ET.SubElement(avail, name).text = str(report["Available" + name])
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(str(p), encoding="utf-8", xml_declaration=True)
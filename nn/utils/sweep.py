@@ -0,0 +1,93 @@
+"""Hyperparameter sweep expansion, ranking and Pareto fronts.
+
+A sweep spec maps dotted config keys (``model.hidden``, ``training.lr``, ...)
+to either a list of values or, for random search, a range
+``{low: 1e-4, high: 1e-2, log: true}`` (add ``int: true`` for integers).
+Grid mode takes the cartesian product of the lists; random mode draws
+``samples`` points with a fixed sampler seed.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import math
+import random
+from typing import Any, Dict, List, Sequence
+
+# Lower is better for error metrics, higher for r2.
+_MAXIMIZE = {"r2"}
+
+
+def set_key(cfg: Dict[str, Any], dotted: str, value: Any) -> None:
+    node = cfg
+    *parents, leaf = dotted.split(".")
+    for p in parents:
+        node = node.setdefault(p, {})
+    node[leaf] = value
+
+
+def apply(base: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep copy of ``base`` with ``params`` written at their dotted keys."""
+    cfg = copy.deepcopy(base)
+    for k, v in params.items():
+        set_key(cfg, k, v)
+    return cfg
+
+
+def _sample(spec: Any, rng: random.Random) -> Any:
+    if isinstance(spec, list):
+        return copy.deepcopy(rng.choice(spec))
+    if isinstance(spec, dict) and "low" in spec and "high" in spec:
+        lo, hi = float(spec["low"]), float(spec["high"])
+        if spec.get("log", False):
+            v = math.exp(rng.uniform(math.log(lo), math.log(hi)))
+        else:
+            v = rng.uniform(lo, hi)
+        return int(round(v)) if spec.get("int", False) else v
+    raise ValueError(f"unsupported sweep value: {spec!r}")
+
+
+def expand(space: Dict[str, Any], mode: str = "grid", samples: int = 0, seed: int = 0) -> List[Dict[str, Any]]:
+    """List of parameter dicts for ``space``."""
+    keys = sorted(space)
+    if mode == "grid":
+        for k in keys:
+            if not isinstance(space[k], list):
+                raise ValueError(f"grid mode needs a list of values for {k}")
+        return [dict(zip(keys, copy.deepcopy(combo))) for combo in itertools.product(*(space[k] for k in keys))]
+    if mode == "random":
+        if samples <= 0:
+            raise ValueError("random mode needs samples > 0")
+        rng = random.Random(seed)
+        return [{k: _sample(space[k], rng) for k in keys} for _ in range(samples)]
+    raise ValueError(f"unknown sweep mode: {mode}")
+
+
+def mlp_macs(input_dim: int, hidden: Sequence[int]) -> int:
+    """Multiply-accumulates per inference for build_mlp (proxy for FPGA cost)."""
+    dims = [int(input_dim), *map(int, hidden), 1]
+    return sum(a * b for a, b in zip(dims, dims[1:]))
+
+
+def rank(records: List[Dict[str, Any]], metric: str) -> List[Dict[str, Any]]:
+    """Successful runs sorted best-first by ``metric`` (failed runs last)."""
+    ok = [r for r in records if metric in r.get("metrics", {})]
+    failed = [r for r in records if metric not in r.get("metrics", {})]
+    ok.sort(key=lambda r: r["metrics"][metric], reverse=metric in _MAXIMIZE)
+    for i, r in enumerate(ok, 1):
+        r["rank"] = i
+    return ok + failed
+
+
+def pareto_front(records: List[Dict[str, Any]], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """Records not dominated on ``keys`` (all minimized); records missing a key are skipped."""
+    pts = [r for r in records if all(r.get(k) is not None for k in keys)]
+    front = []
+    for r in pts:
+        dominated = any(
+            all(o[k] <= r[k] for k in keys) and any(o[k] < r[k] for k in keys) for o in pts if o is not r
+        )
+        if not dominated:
+            front.append(r)
+    return front
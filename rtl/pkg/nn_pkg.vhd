@@ -6,6 +6,10 @@ package nn_pkg is
   constant NN_DATA_WIDTH : natural := 16;
   -- Match hls4ml precision ap_fixed<16,6> -> 16 total, 6 integer => 10 fractional
   constant NN_FRAC_WIDTH : natural := 10;
+  -- Input features per inference (hls4ml model input_dim)
+  constant NN_IN_DIM     : natural := 8;
+  -- Output words per inference (hls4ml model output_dim; hls4ml_wrap has one)
+  constant NN_OUT_DIM    : natural := 1;
 
   subtype nn_data_t is signed(NN_DATA_WIDTH-1 downto 0);
 end package;
@@ -12,6 +12,9 @@ package pkt_pkg is
   constant STATUS_RSP : pkt_type_t := x"81";
   constant INFER_REQ  : pkt_type_t := x"02";
   constant INFER_RSP  : pkt_type_t := x"82";
+  -- Batched inference: payload is K input vectors back to back, response is K outputs
+  constant INFER_BATCH_REQ : pkt_type_t := x"03";
+  constant INFER_BATCH_RSP : pkt_type_t := x"83";
 end package;
 
 package body pkt_pkg is
@@ -5,6 +5,9 @@ use work.pkt_pkg.all;
 use work.nn_pkg.all;
 
 entity top_nexys_video is
+  generic (
+    G_CLKS_PER_BIT : natural := 868  -- 100MHz/115200; testbenches use fewer
+  );
   port (
     clk_100mhz : in  std_logic;
     reset_btn  : in  std_logic;
@@ -49,6 +52,7 @@ architecture rtl of top_nexys_video is
   signal tx_start : std_logic := '0';
   signal infer_start : std_logic := '0';
   signal status_start : std_logic := '0';
+  signal batch_start : std_logic := '0';
   signal status_mode : std_logic := '0';
 
   signal status_out_valid : std_logic;
@@ -64,6 +68,19 @@ architecture rtl of top_nexys_video is
   signal tx_pkt_type : pkt_type_t;
   signal tx_pkt_len  : std_logic_vector(15 downto 0);
   signal infer_rsp_len : std_logic_vector(15 downto 0);
+  signal batch_rsp_len : std_logic_vector(15 downto 0);
+
+  -- Request length checks. hls4ml_wrap emits NN_OUT_DIM words of
+  -- NN_DATA_WIDTH per NN_IN_DIM input words.
+  constant WORD_BYTES : natural := NN_DATA_WIDTH / 8;
+  constant ROW_BYTES  : natural := NN_IN_DIM * WORD_BYTES;
+  signal infer_len_ok : std_logic;
+  signal batch_len_ok : std_logic;
+  signal frame_bad    : std_logic;
+  signal drop_mode    : std_logic := '0';
+  signal drop         : std_logic;
+  signal t_in_valid   : std_logic;
+  signal t_in_ready   : std_logic;
 
   -- Tensor path
   signal t_valid : std_logic;
@@ -116,7 +133,7 @@ begin
   led <= led_i;
 
   u_uart: entity work.uart_byte_stream
-    generic map (G_CLKS_PER_BIT => 868)
+    generic map (G_CLKS_PER_BIT => G_CLKS_PER_BIT)
     port map (
       clk => clk_100mhz,
       rst => rst,
@@ -182,8 +199,8 @@ begin
     port map (
       clk => clk_100mhz,
       rst => rst,
-      in_valid => p_rx_valid,
-      in_ready => p_rx_ready,
+      in_valid => t_in_valid,
+      in_ready => t_in_ready,
       in_data => p_rx_data,
       in_last => p_rx_last,
       tensor_valid => t_valid,
@@ -201,7 +218,7 @@ begin
     );
 
   u_nn: entity work.hls4ml_wrap
-    generic map (G_DATA_WIDTH => 16, G_IN_DIM => 8, G_STUB => false)
+    generic map (G_DATA_WIDTH => 16, G_IN_DIM => NN_IN_DIM, G_STUB => false)
     port map (
       clk => clk_100mhz,
       rst => rst,
@@ -215,7 +232,7 @@ begin
       out_last => t_out_last
     );
 
-  -- respond to INFER_REQ and STATUS_REQ
+  -- respond to INFER_REQ, INFER_BATCH_REQ and STATUS_REQ
   process (clk_100mhz)
   begin
     if rising_edge(clk_100mhz) then
@@ -223,19 +240,27 @@ begin
         tx_start <= '0';
         infer_start <= '0';
         status_start <= '0';
+        batch_start <= '0';
         status_mode <= '0';
       else
         tx_start <= '0';
         infer_start <= '0';
         status_start <= '0';
+        batch_start <= '0';
 
         if pkt_valid = '1' and pkt_error = '0' then
           if pkt_type = STATUS_REQ then
             status_start <= '1';
             tx_start <= '1';
             status_mode <= '1';
-          elsif pkt_type = INFER_REQ then
+          elsif pkt_type = INFER_REQ and infer_len_ok = '1' then
+            infer_start <= '1';
+            tx_start <= '1';
+          elsif pkt_type = INFER_BATCH_REQ and batch_len_ok = '1' then
+            -- hls4ml_wrap repacks every NN_IN_DIM elements, so K vectors stream
+            -- through the same path and produce K outputs in one response frame
             infer_start <= '1';
+            batch_start <= '1';
             tx_start <= '1';
           end if;
         end if;
@@ -247,9 +272,50 @@ begin
     end if;
   end process;
 
-  infer_rsp_len <= std_logic_vector(to_unsigned(NN_DATA_WIDTH / 8, 16));
-  tx_pkt_type <= STATUS_RSP when status_start = '1' else INFER_RSP;
-  tx_pkt_len  <= status_len when status_start = '1' else infer_rsp_len;
+  infer_len_ok <= '1' when unsigned(pkt_len) = ROW_BYTES else '0';
+  batch_len_ok <= '1' when unsigned(pkt_len) /= 0 and unsigned(pkt_len) mod ROW_BYTES = 0 else '0';
+
+  -- A frame that cannot be answered (INFER with the wrong length, a batch
+  -- that is not whole rows, or payload on any other type) gets no response
+  -- and its payload is drained here instead of reaching the core, where a
+  -- partial row would swallow the next frame's bytes.
+  frame_bad <= '1' when pkt_valid = '1' and pkt_error = '0' and unsigned(pkt_len) /= 0 and
+                        ((pkt_type = INFER_REQ and infer_len_ok = '0') or
+                         (pkt_type = INFER_BATCH_REQ and batch_len_ok = '0') or
+                         (pkt_type /= INFER_REQ and pkt_type /= INFER_BATCH_REQ))
+               else '0';
+  drop <= drop_mode or frame_bad;
+  t_in_valid <= p_rx_valid and not drop;
+  p_rx_ready <= '1' when drop = '1' else t_in_ready;
+
+  process (clk_100mhz)
+  begin
+    if rising_edge(clk_100mhz) then
+      if rst = '1' then
+        drop_mode <= '0';
+      elsif p_rx_valid = '1' and p_rx_ready = '1' and p_rx_last = '1' then
+        drop_mode <= '0';
+      elsif frame_bad = '1' then
+        drop_mode <= '1';
+      end if;
+      -- synthesis translate_off
+      assert frame_bad = '0'
+        report "dropping request type " & integer'image(to_integer(unsigned(pkt_type))) & " with payload length " &
+               integer'image(to_integer(unsigned(pkt_len)))
+        severity warning;
+      -- synthesis translate_on
+    end if;
+  end process;
+
+  infer_rsp_len <= std_logic_vector(to_unsigned(NN_OUT_DIM * WORD_BYTES, 16));
+  -- K = pkt_len / ROW_BYTES rows in -> K * NN_OUT_DIM words out
+  batch_rsp_len <= std_logic_vector(resize(unsigned(pkt_len) / ROW_BYTES * (NN_OUT_DIM * WORD_BYTES), 16));
+  tx_pkt_type <= STATUS_RSP when status_start = '1' else
+                 INFER_BATCH_RSP when batch_start = '1' else
+                 INFER_RSP;
+  tx_pkt_len  <= status_len when status_start = '1' else
+                 batch_rsp_len when batch_start = '1' else
+                 infer_rsp_len;
 
   tx_in_valid <= status_out_valid when status_mode = '1' else p_tx_valid;
   tx_in_data  <= status_out_data  when status_mode = '1' else p_tx_data;
@@ -127,3 +127,22 @@ run_tb_mixed tb_top_e2e \
   "$ROOT_DIR/sim/tb/tb_top_e2e.vhd" \
   --verilog \
   "$ROOT_DIR/rtl/nn/generated/myproject"*.v
+
+run_tb_mixed tb_top_batch \
+  "$ROOT_DIR/rtl/pkg/pkt_pkg.vhd" \
+  "$ROOT_DIR/rtl/pkg/nn_pkg.vhd" \
+  "$ROOT_DIR/rtl/top/build_id_pkg.vhd" \
+  "$ROOT_DIR/rtl/io/uart/uart_rx.vhd" \
+  "$ROOT_DIR/rtl/io/uart/uart_tx.vhd" \
+  "$ROOT_DIR/rtl/io/uart/uart_byte_stream.vhd" \
+  "$ROOT_DIR/rtl/protocol/crc16.vhd" \
+  "$ROOT_DIR/rtl/protocol/pkt_rx.vhd" \
+  "$ROOT_DIR/rtl/protocol/pkt_tx.vhd" \
+  "$ROOT_DIR/rtl/ctrl/mmio_status.vhd" \
+  "$ROOT_DIR/rtl/ctrl/perf_counters.vhd" \
+  "$ROOT_DIR/rtl/nn/tensor_adapter.vhd" \
+  "$ROOT_DIR/rtl/nn/hls4ml_wrap.vhd" \
+  "$ROOT_DIR/rtl/top/top_nexys_video.vhd" \
+  "$ROOT_DIR/sim/tb/tb_top_batch.vhd" \
+  --verilog \
+  "$ROOT_DIR/rtl/nn/generated/myproject"*.v
@@ -4,49 +4,153 @@ Writes hex fixtures to sim/fixtures/nn_in.hex and nn_out.hex, which can be sent
 over UART to validate the hardware hls4ml core produces the same results as the \
 golden PyTorch model.
 
+With --bulk, the whole test split (or --count samples from --index) is \
+quantized and predicted in one pass and written as a .nnfx fixture set \
+(see host/python/nnfpga/fixtures.py) for send_uart.py --fixture.
+
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 from pathlib import Path
 import sys
 
 import numpy as np
 
 ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+PKG_ROOT = ROOT / "host" / "python"
+for p in (ROOT, PKG_ROOT):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
 
-from host.python.nnfpga import fixedpoint, proto
+# Same import root as the host tools, so fixtures.py and this script share one nnfpga.proto
+from nnfpga import apfixed, fixedpoint, fixtures, proto
 from nn.datasets import calhouse
 from nn.models import mlp_regressor
 from nn.utils import config as config_mod
+from nn.utils import hls_cache
+
+# Word format of the UART payload (NN_DATA_WIDTH / NN_FRAC_WIDTH in rtl/pkg/nn_pkg.vhd)
+DATA_WIDTH = 16
+FRAC_WIDTH = 10
+
+
+def _hls4ml_predict(model, x_q: np.ndarray, hls_config_path: str, checkpoint: str) -> np.ndarray:
+    try:
+        import hls4ml  # type: ignore
+    except Exception as exc:
+        raise RuntimeError("hls4ml is required for --use-hls4ml") from exc
+
+    import yaml
+
+    hls_cfg = config_mod.apply_trained_precision(yaml.safe_load(Path(hls_config_path).read_text()))
+    h = hls_cfg["hls4ml"]
+    hls_config = hls4ml.utils.config_from_pytorch_model(
+        model,
+        input_shape=(x_q.shape[1],),
+        granularity="model",
+        backend=h.get("backend", "Vitis"),
+        default_reuse_factor=int(h.get("reuse_factor", 1)),
+        default_precision=h.get("precision", "ap_fixed<16,6>"),
+    )
 
-
-def _write_hex_bytes(path: Path, data: bytes) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for b in data:
-            f.write(f"{b:02X}\n")
+    hls_model = hls4ml.converters.convert_from_pytorch_model(
+        model,
+        hls_config=hls_config,
+        output_dir=str(Path("sim/fixtures/hls4ml_tmp").resolve()),
+        part=h.get("part", "xc7a200tsbg484-1"),
+        clock_period=float(h.get("clock_period", 10.0)),
+        io_type=h.get("io_type", "io_stream"),
+    )
+    if hls_cache.compile_from_config(hls_model, hls_cfg, [checkpoint]):
+        print("Using cached hls4ml library")
+    return hls_model.predict(np.ascontiguousarray(x_q, dtype=np.float32))
+
+
+def _write_bulk(
+    path: Path,
+    payload_in: bytes,
+    payload_out: bytes,
+    count: int,
+    in_dim: int,
+    out_dim: int,
+    batch: int,
+    data_width: int = DATA_WIDTH,
+) -> int:
+    """Split the packed inputs/outputs into request/response frames; return the pair count."""
+    step = max(1, batch)
+    if batch:
+        req_type, rsp_type = proto.INFER_BATCH_REQ, proto.INFER_BATCH_RSP
+    else:
+        req_type, rsp_type = proto.INFER_REQ, proto.INFER_RSP
+    word = data_width // 8
+    row_in, row_out = in_dim * word, out_dim * word
+    if len(payload_in) != count * row_in or len(payload_out) != count * row_out:
+        raise ValueError(
+            f"payload sizes {len(payload_in)}/{len(payload_out)} do not match {count} rows of "
+            f"{in_dim} inputs and {out_dim} outputs at {data_width} bits"
+        )
+    reqs, rsps = [], []
+    for s in range(0, count, step):
+        e = min(s + step, count)
+        reqs.append(proto.pack_packet(req_type, payload_in[s * row_in : e * row_in], crc=False))
+        rsps.append(proto.pack_packet(rsp_type, payload_out[s * row_out : e * row_out], crc=False))
+    fixtures.write_fixture(path, reqs, rsps)
+    return len(reqs)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", required=True, help="Training config (dataset/model)")
     ap.add_argument("--checkpoint", required=True, help="Path to model.pt")
+    ap.add_argument(
+        "--model-info",
+        default="",
+        help="model_info.json with the trained (e.g. pruned) hidden sizes (default: next to --checkpoint)",
+    )
     ap.add_argument("--out-dir", default="sim/fixtures", help="Output directory for hex fixtures")
     ap.add_argument("--index", type=int, default=0, help="Test sample index")
-    ap.add_argument("--use-hls4ml", action="store_true", help="Use hls4ml model for golden output")
-    ap.add_argument("--hls-config", default="nn/hls4ml_config.yaml", help="hls4ml config (for --use-hls4ml)")
+    ap.add_argument(
+        "--batch",
+        type=int,
+        default=0,
+        help="Emit an INFER_BATCH_REQ/RSP pair for this many samples starting at --index",
+    )
+    ap.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Write every sample from --index on (or --count of them) to one .nnfx fixture set",
+    )
+    ap.add_argument("--count", type=int, default=0, help="With --bulk: samples to include (0 = rest of the split)")
+    ap.add_argument("--out", default="", help="With --bulk: output path (default <out-dir>/nn_test.nnfx)")
+    golden = ap.add_mutually_exclusive_group()
+    golden.add_argument("--use-hls4ml", action="store_true", help="Use hls4ml model for golden output")
+    golden.add_argument(
+        "--fixed-point",
+        action="store_true",
+        help="Use the bit-exact ap_fixed NumPy emulator (precision from --hls-config; no hls4ml needed)",
+    )
+    ap.add_argument(
+        "--hls-config", default="nn/hls4ml_config.yaml", help="hls4ml config (for --use-hls4ml/--fixed-point)"
+    )
     args = ap.parse_args()
 
     cfg = config_mod.load_config(args.config)
     X_train, y_train, X_val, y_val, X_test, y_test, _, _ = calhouse.load_dataset(cfg)
 
+    # Pruning shrinks the hidden layers, so model_info.json (like model.pytorch.model_info
+    # in run_hls4ml.py) takes precedence over the training config's sizes.
+    hidden = cfg["model"]["hidden"]
+    info_path = Path(args.model_info or Path(args.checkpoint).with_name("model_info.json"))
+    if info_path.exists():
+        hidden = json.loads(info_path.read_text()).get("hidden", hidden)
+    elif args.model_info:
+        raise FileNotFoundError(f"--model-info not found: {info_path}")
     model = mlp_regressor.build_mlp(
         input_dim=X_train.shape[1],
-        hidden=cfg["model"]["hidden"],
+        hidden=hidden,
         dropout=cfg["model"]["dropout"],
     )
     import torch
@@ -55,59 +159,63 @@ def main() -> int:
     model.eval()
 
     idx = int(args.index)
-    if idx < 0 or idx >= X_test.shape[0]:
-        raise ValueError(f"index out of range: {idx}")
+    if args.bulk:
+        count = int(args.count) or X_test.shape[0] - idx
+    else:
+        count = max(1, int(args.batch))
+    if idx < 0 or idx + count > X_test.shape[0]:
+        raise ValueError(f"index out of range: {idx} (+{count})")
+    if args.batch and args.batch > proto.max_batch(X_test.shape[1]):
+        raise ValueError(f"--batch {args.batch} exceeds one frame ({proto.max_batch(X_test.shape[1])} samples)")
 
-    x_vec = X_test[idx]
+    x_vec = X_test[idx : idx + count]
     # Quantize to the exact fixed-point values that will be sent over UART.
-    x_vec_q = fixedpoint.unpack_values(fixedpoint.pack_values(x_vec.tolist()))
+    payload_in = fixedpoint.pack_array(x_vec, data_width=DATA_WIDTH, frac_width=FRAC_WIDTH)
+    x_vec_q = fixedpoint.unpack_values_array(
+        payload_in, data_width=DATA_WIDTH, frac_width=FRAC_WIDTH, dim=x_vec.shape[1]
+    )
     if args.use_hls4ml:
-        try:
-            import hls4ml  # type: ignore
-        except Exception as exc:
-            raise RuntimeError("hls4ml is required for --use-hls4ml") from exc
-
-        import yaml
-
-        hls_cfg = yaml.safe_load(Path(args.hls_config).read_text())
-        h = hls_cfg["hls4ml"]
-        hls_config = hls4ml.utils.config_from_pytorch_model(
-            model,
-            input_shape=(X_train.shape[1],),
-            granularity="model",
-            backend=h.get("backend", "Vitis"),
-            default_reuse_factor=int(h.get("reuse_factor", 1)),
-            default_precision=h.get("precision", "ap_fixed<16,6>"),
-        )
-
-        hls_model = hls4ml.converters.convert_from_pytorch_model(
-            model,
-            hls_config=hls_config,
-            output_dir=str(Path("sim/fixtures/hls4ml_tmp").resolve()),
-            part=h.get("part", "xc7a200tsbg484-1"),
-            clock_period=float(h.get("clock_period", 10.0)),
-            io_type=h.get("io_type", "io_stream"),
-        )
-        hls_model.compile()
-        y_pred = hls_model.predict(np.ascontiguousarray(np.array(x_vec_q, dtype=np.float32).reshape(1, -1))).squeeze()
+        y_pred = _hls4ml_predict(model, x_vec_q, args.hls_config, args.checkpoint)
         print("Using hls4ml model for golden output")
+    elif args.fixed_point:
+        state = {k: v.detach().cpu().numpy() for k, v in model.state_dict().items()}
+        layers, layer_index = apfixed.layers_from_state_dict(state)
+        hls_cfg = config_mod.apply_trained_precision(apfixed.load_hls_config(args.hls_config))
+        mlp = apfixed.ApFixedMLP.from_config(layers, hls_cfg, layer_index=layer_index)
+        y_pred = mlp(x_vec_q)
+        print("Using ap_fixed emulator for golden output")
     else:
         with torch.no_grad():
-            y_pred = model(torch.from_numpy(x_vec).float().unsqueeze(0)).numpy().squeeze()
+            y_pred = model(torch.from_numpy(x_vec).float()).numpy()
         print("Using PyTorch model for golden output")
 
-    payload_in = fixedpoint.pack_values(x_vec.tolist())
-    payload_out = fixedpoint.pack_values([float(y_pred)])
+    y_pred = np.asarray(y_pred, dtype=np.float64).reshape(count, -1)
+    out_dim = y_pred.shape[1]
+    payload_out = fixedpoint.pack_array(y_pred, data_width=DATA_WIDTH, frac_width=FRAC_WIDTH)
+    y_pred = y_pred.reshape(-1)
+
+    if args.bulk:
+        out_path = Path(args.out) if args.out else Path(args.out_dir) / "nn_test.nnfx"
+        pairs = _write_bulk(out_path, payload_in, payload_out, count, x_vec.shape[1], out_dim, int(args.batch))
+        print(f"Wrote {pairs} packet pairs ({count} samples from index {idx}) to {out_path}")
+        return 0
 
-    req_pkt = proto.pack_packet(proto.INFER_REQ, payload_in, crc=False)
-    rsp_pkt = proto.pack_packet(proto.INFER_RSP, payload_out, crc=False)
+    if args.batch:
+        req_type, rsp_type, stem = proto.INFER_BATCH_REQ, proto.INFER_BATCH_RSP, "nn_batch"
+    else:
+        req_type, rsp_type, stem = proto.INFER_REQ, proto.INFER_RSP, "nn"
+    req_pkt = proto.pack_packet(req_type, payload_in, crc=False)
+    rsp_pkt = proto.pack_packet(rsp_type, payload_out, crc=False)
 
     out_dir = Path(args.out_dir)
-    _write_hex_bytes(out_dir / "nn_in.hex", req_pkt)
-    _write_hex_bytes(out_dir / "nn_out.hex", rsp_pkt)
-    print(f"y_pred={float(y_pred):.9f}")
-    print(f"payload_out bytes: {[f'{b:02X}' for b in payload_out]}")
-    print(f"Wrote {out_dir}/nn_in.hex and {out_dir}/nn_out.hex")
+    fixtures.save_hex_bytes(out_dir / f"{stem}_in.hex", req_pkt)
+    fixtures.save_hex_bytes(out_dir / f"{stem}_out.hex", rsp_pkt)
+    if args.batch:
+        print(f"y_pred[0:{min(count, 8)}]={[round(float(v), 9) for v in y_pred[:8]]}")
+    else:
+        print(f"y_pred={float(y_pred[0]):.9f}")
+        print(f"payload_out bytes: {[f'{b:02X}' for b in payload_out]}")
+    print(f"Wrote {out_dir}/{stem}_in.hex and {out_dir}/{stem}_out.hex")
     return 0
 
 
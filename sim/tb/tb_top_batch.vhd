@@ -0,0 +1,185 @@
+library ieee;
+library std;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use std.env.all;
+use std.textio.all;
+use ieee.std_logic_textio.all;
+use work.nn_pkg.all;
+
+-- tb_top_batch.vhd: Full top_nexys_video over its UART pins (real hls4ml core).
+-- 1) An INFER_BATCH_REQ whose payload is not whole rows must get no response
+--    and must not disturb later frames.
+-- 2) A K-row INFER_BATCH_REQ (nn_batch_in.hex) must return nn_batch_out.hex.
+-- 3) A single INFER_REQ (nn_in.hex) must still return nn_out.hex.
+-- 4) STATUS must count K + 1 inferences.
+-- Fixtures come from nn_golden.py (--batch K for the batch pair).
+
+entity tb_top_batch is
+end entity;
+
+architecture tb of tb_top_batch is
+  constant CLK_PERIOD   : time := 10 ns;
+  constant CLKS_PER_BIT : natural := 16;
+  constant BIT_TIME     : time := CLKS_PER_BIT * CLK_PERIOD;
+  constant TIMEOUT      : time := 50 ms;
+
+  signal clk      : std_logic := '0';
+  signal rst_btn  : std_logic := '1';
+  signal uart_rx  : std_logic := '1';  -- into the DUT
+  signal uart_tx  : std_logic;         -- out of the DUT
+  signal led      : std_logic_vector(7 downto 0);
+
+  type byte_arr_t is array (natural range <>) of std_logic_vector(7 downto 0);
+  constant MAX_BYTES : natural := 4096;
+
+  -- Batch header announcing 5 payload bytes (not a multiple of a row), and STATUS_REQ
+  constant BAD_BATCH_HDR : byte_arr_t(0 to 5) := (x"A5", x"5A", x"01", x"03", x"00", x"05");
+  constant STATUS_PKT    : byte_arr_t(0 to 5) := (x"A5", x"5A", x"01", x"01", x"00", x"00");
+
+  signal rx_buf   : byte_arr_t(0 to MAX_BYTES-1);
+  signal rx_count : natural := 0;
+
+  constant BATCH_REQ_PATH : string := "../../../sim/fixtures/nn_batch_in.hex";
+  constant BATCH_RSP_PATH : string := "../../../sim/fixtures/nn_batch_out.hex";
+  constant REQ_PATH       : string := "../../../sim/fixtures/nn_in.hex";
+  constant RSP_PATH       : string := "../../../sim/fixtures/nn_out.hex";
+
+  procedure load_hex(path : string; variable arr : inout byte_arr_t; variable len : out natural) is
+    file f : text;
+    variable l : line;
+    variable b : std_logic_vector(7 downto 0);
+    variable n : natural := 0;
+  begin
+    file_open(f, path, read_mode);
+    while not endfile(f) loop
+      readline(f, l);
+      hread(l, b);
+      assert n < arr'length report "fixture too long: " & path severity failure;
+      arr(n) := b;
+      n := n + 1;
+    end loop;
+    file_close(f);
+    assert n > 0 report "fixture empty or missing: " & path severity failure;
+    len := n;
+  end procedure;
+
+  procedure uart_send(signal line_o : out std_logic; b : std_logic_vector(7 downto 0)) is
+  begin
+    line_o <= '0';
+    wait for BIT_TIME;
+    for i in 0 to 7 loop
+      line_o <= b(i);
+      wait for BIT_TIME;
+    end loop;
+    line_o <= '1';
+    wait for BIT_TIME;
+  end procedure;
+
+begin
+  clk <= not clk after CLK_PERIOD/2;
+
+  watchdog: process
+  begin
+    wait for TIMEOUT;
+    assert false report "tb_top_batch timeout" severity failure;
+  end process;
+
+  dut: entity work.top_nexys_video
+    generic map (G_CLKS_PER_BIT => CLKS_PER_BIT)
+    port map (
+      clk_100mhz => clk,
+      reset_btn  => rst_btn,
+      uart_rx    => uart_rx,
+      uart_tx    => uart_tx,
+      led        => led
+    );
+
+  -- Deserialize everything the DUT transmits
+  uart_mon: process
+    variable b : std_logic_vector(7 downto 0);
+  begin
+    wait until uart_tx = '0';
+    wait for BIT_TIME / 2;
+    assert uart_tx = '0' report "glitch on uart_tx start bit" severity failure;
+    for i in 0 to 7 loop
+      wait for BIT_TIME;
+      b(i) := uart_tx;
+    end loop;
+    wait for BIT_TIME;
+    assert uart_tx = '1' report "missing stop bit on uart_tx" severity failure;
+    rx_buf(rx_count) <= b;
+    rx_count <= rx_count + 1;
+  end process;
+
+  stim: process
+    variable breq, brsp, req, rsp : byte_arr_t(0 to MAX_BYTES-1);
+    variable breq_len, brsp_len, req_len, rsp_len : natural;
+    variable k, base, infers : natural;
+
+    procedure send_all(variable arr : in byte_arr_t; len : natural) is
+    begin
+      for i in 0 to len-1 loop
+        uart_send(uart_rx, arr(i));
+      end loop;
+    end procedure;
+
+    procedure expect(variable arr : in byte_arr_t; len : natural; offset : natural; what : string) is
+    begin
+      while rx_count < offset + len loop
+        wait until rising_edge(clk);
+      end loop;
+      for i in 0 to len-1 loop
+        assert rx_buf(offset + i) = arr(i)
+          report what & " byte " & integer'image(i) & " mismatch" severity failure;
+      end loop;
+    end procedure;
+  begin
+    load_hex(BATCH_REQ_PATH, breq, breq_len);
+    load_hex(BATCH_RSP_PATH, brsp, brsp_len);
+    load_hex(REQ_PATH, req, req_len);
+    load_hex(RSP_PATH, rsp, rsp_len);
+    k := (brsp_len - 6) / (NN_OUT_DIM * NN_DATA_WIDTH / 8);
+    assert breq(3) = x"03" report "nn_batch_in.hex is not an INFER_BATCH_REQ" severity failure;
+
+    wait for 10 * CLK_PERIOD;
+    rst_btn <= '0';
+    wait for 10 * CLK_PERIOD;
+
+    -- 1) Batch payload of 5 bytes: not a whole row, must be dropped silently
+    for i in BAD_BATCH_HDR'range loop
+      uart_send(uart_rx, BAD_BATCH_HDR(i));
+    end loop;
+    for i in 0 to 4 loop
+      uart_send(uart_rx, std_logic_vector(to_unsigned(16#10# + i, 8)));
+    end loop;
+    wait for 40 * BIT_TIME;
+    assert rx_count = 0 report "bad-length batch frame was answered" severity failure;
+
+    -- 2) K-row batch
+    send_all(breq, breq_len);
+    expect(brsp, brsp_len, 0, "INFER_BATCH_RSP");
+    base := brsp_len;
+
+    -- 3) Single inference after the batch
+    send_all(req, req_len);
+    expect(rsp, rsp_len, base, "INFER_RSP");
+    base := base + rsp_len;
+
+    -- 4) STATUS: infers (payload bytes 12..15, little-endian) = K + 1
+    for i in STATUS_PKT'range loop
+      uart_send(uart_rx, STATUS_PKT(i));
+    end loop;
+    while rx_count < base + 6 + 20 loop
+      wait until rising_edge(clk);
+    end loop;
+    assert rx_buf(base + 3) = x"81" report "expected STATUS_RSP" severity failure;
+    infers := to_integer(unsigned(rx_buf(base + 6 + 13) & rx_buf(base + 6 + 12)));
+    assert infers = k + 1
+      report "STATUS infers " & integer'image(infers) & ", expected " & integer'image(k + 1) severity failure;
+
+    report "tb_top_batch completed (K=" & integer'image(k) & ")" severity note;
+    stop;
+    wait;
+  end process;
+end architecture;